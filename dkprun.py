@@ -10,6 +10,9 @@ import re
 import time
 import zipfile
 import logging
+import logging.handlers
+import collections
+import threading
 from datetime import datetime
 import psutil
 import socket
@@ -25,6 +28,12 @@ try:
 except ImportError:
     COLOR_SUPPORT = False
 
+    class _NoColor:
+        def __getattr__(self, name):
+            return ""
+
+    Fore = Style = _NoColor()
+
 EXT_TO_COMMAND = {
     "-py": "python",
     "-js": "node",
@@ -50,23 +59,121 @@ REPO_PRESETS = {
     "discord_modif_2": ("discord_modif_2", "https://github.com/MJVhack/discord_modif_2"),
 }
 
+_LOGGER = logging.getLogger("dkprun")
+_LOG_QUEUE = None
+_LOG_LISTENER = None
+_LOG_CONFIG = None
+# Console écrite directement (ordre conservé avec print) ; par le thread d'écriture en mode serveur
+_ASYNC_CONSOLE = False
+
+class _ConsoleFormatter(logging.Formatter):
+    """
+    Message brut, coloré au moment de l'écriture (dans le thread du QueueListener).
+    """
+
+    def format(self, record):
+        msg = record.getMessage()
+        color = getattr(record, "color", None)
+        return color + msg + Style.RESET_ALL if COLOR_SUPPORT and color else msg
+
+class _JsonFormatter(logging.Formatter):
+    """
+    Une ligne JSON par message pour le fichier de log.
+    """
+
+    def format(self, record):
+        import json
+
+        return json.dumps({
+            "time": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "message": record.getMessage(),
+            "pid": record.process,
+            "thread": record.threadName,
+        }, ensure_ascii=False)
+
+class _LazyQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler qui ne formate pas le message dans le thread appelant : le formatage
+    (msg % args, couleurs, JSON) est fait par le thread du QueueListener.
+    """
+
+    def prepare(self, record):
+        return record
+
+def flush_logs():
+    """
+    Attend que tous les messages en file soient écrits (avant de céder le terminal à un enfant).
+    """
+    if _LOG_QUEUE is not None and _LOG_LISTENER is not None:
+        _LOG_QUEUE.join()
+
+def set_async_console(enabled=True):
+    """
+    Fait passer l'affichage console par la file (modes serveur/batch) ou l'écrit directement.
+    """
+    global _ASYNC_CONSOLE
+    if enabled != _ASYNC_CONSOLE:
+        _ASYNC_CONSOLE = enabled
+        config = _LOG_CONFIG
+        _reset_logging()
+        setup_logging(*(config or (None, False)))
+
+def _reset_logging():
+    global _LOG_LISTENER, _LOG_QUEUE, _LOG_CONFIG
+    if _LOG_LISTENER is not None:
+        _LOG_LISTENER.stop()
+    for handler in list(_LOGGER.handlers):
+        _LOGGER.removeHandler(handler)
+    _LOG_LISTENER = _LOG_QUEUE = _LOG_CONFIG = None
+
 def setup_logging(logfile=None, verbose=False):
-    log_level = logging.DEBUG if verbose else logging.INFO
-    log_format = '%(asctime)s - %(levelname)s: %(message)s'
+    """
+    Configure la journalisation asynchrone (QueueHandler + QueueListener).
+
+    Les appels imbriqués (run_url, mode interactif) sans nouvelle option conservent la
+    configuration existante ; un fichier de log est ouvert en ajout, en JSON lines, avec rotation.
+    """
+    import atexit
+    import queue
+
+    global _LOG_QUEUE, _LOG_LISTENER, _LOG_CONFIG
+    if _LOG_LISTENER is not None and (_LOG_CONFIG == (logfile, verbose) or (logfile is None and not verbose)):
+        return
+    _reset_logging()
+    handlers = []
+    if _ASYNC_CONSOLE:
+        console = logging.StreamHandler(sys.stdout)
+        console.setFormatter(_ConsoleFormatter())
+        handlers.append(console)
     if logfile:
-        logging.basicConfig(filename=logfile, level=log_level, filemode='w', format=log_format)
-    else:
-        logging.basicConfig(stream=sys.stdout, level=log_level, format=log_format)
+        file_handler = logging.handlers.RotatingFileHandler(logfile, maxBytes=10 * 1024 * 1024, backupCount=3, encoding="utf-8")
+        file_handler.setFormatter(_JsonFormatter())
+        handlers.append(file_handler)
+    _LOG_QUEUE = queue.Queue()
+    _LOGGER.setLevel(logging.DEBUG if verbose else logging.INFO)
+    _LOGGER.propagate = False
+    _LOGGER.addHandler(_LazyQueueHandler(_LOG_QUEUE))
+    _LOG_LISTENER = logging.handlers.QueueListener(_LOG_QUEUE, *handlers)
+    _LOG_LISTENER.start()
+    _LOG_CONFIG = (logfile, verbose)
+    if not getattr(setup_logging, "_atexit", False):
+        atexit.register(_reset_logging)
+        setup_logging._atexit = True
 
-def log(msg, level='info', color=None):
-    if COLOR_SUPPORT and color:
-        print(color + msg + Style.RESET_ALL)
-    else:
-        print(msg)
-    if hasattr(logging, level):
-        getattr(logging, level)(msg)
-    else:
-        logging.info(msg)
+def log(msg, level='info', color=None, *args):
+    """
+    Affiche et journalise un message ; `args` sont appliqués paresseusement (msg % args).
+    """
+    if _LOG_LISTENER is None:
+        setup_logging()
+    levelno = logging.getLevelName(level.upper())
+    if not isinstance(levelno, int):
+        levelno = logging.INFO
+    if not _ASYNC_CONSOLE and levelno >= _LOGGER.getEffectiveLevel():
+        text = msg % args if args else msg
+        print(color + text + Style.RESET_ALL if COLOR_SUPPORT and color else text)
+    _LOGGER.log(levelno, msg, *args, extra={"color": color})
 
 def detect_os():
     system = platform.system().lower()
@@ -104,7 +211,7 @@ Exécute, teste, analyse et prépare tes projets en Python, JavaScript, Java, C,
 ────────────────────────────────────────────
 
 🔧 Syntaxe de base :
-  dkprun -r -<ext> <fichier>                 Exécute un fichier selon son extension
+  dkprun -r -<ext> <fichier> [-- args]       Exécute un fichier selon son extension
   dkprun -<commande> [options]               Lance une commande utilitaire
 
 ────────────────────────────────────────────
@@ -133,13 +240,30 @@ Exécute, teste, analyse et prépare tes projets en Python, JavaScript, Java, C,
 
   -r                          → Exécuter le fichier
   -noerror                    → Ignore les erreurs d’exécution
-  -checkinterpreters          → Vérifie les outils nécessaires
+  -timeout <s> -maxmem <Mo> -maxcpu <s> → Limites appliquées à l'exécution -r
+  -capture [dossier]          → Journalise la sortie de -r (horodatée, par exécution) [-ringkb N]
+  -r -c|-cpp <dossier> [-project] → Build incrémental parallèle d'un projet C/C++ puis exécution
+                                 [-j N] [-o <exécutable>] (objets et .d dans .dkprun/build)
+  -r -java <f> -cds           → Classes en cache + archive AppCDS (démarrage JVM à chaud)
+                                 [-javasource] lance le source directement (Java 11+), sans javac
+  -r -html <f> -serve         → Sert le dossier en HTTP local (ETag/304, gzip, rechargement auto)
+                                 [-port N] [-nobrowser]
+  -matrix py3.9,py3.12 -r -py <f> → Exécute le script sous plusieurs Python en parallèle (venvs en cache)
+                                 [-requirements <f>] ; compare codes, durées et sorties (diff)
+  -prefork [-preload m1,m2]   → -r -py via un serveur résident qui précharge les modules
+  -preforkstop [-preload ...] → Arrête le serveur prefork
+  -pyprofile [sample|cprofile] → Profile un script -r -py (flamegraph .folded + top)
+                                 [-top N] [-interval <ms>]
+  -checkinterpreters [-refresh] → Vérifie les outils nécessaires (versions en cache)
   -installdependencies <f>    → Installe les dépendances du fichier
   -autoinstalldependencies    → Analyse et installe auto. (JS / Python)
   -automakelib <ext> <f>      → Génère un squelette de bibliothèque
-  -install <pkg>              → Installe un paquet système
+  -install <pkg> [pkg ...]    → Installe des paquets système (une transaction, cache local)
+                                 [-offline] n'utilise que le cache des paquets
   -install -preconfigure <r>  → Clone & configure un repo Git
   -anasyntax <ext> <f>        → Analyse la syntaxe d’un script
+  -lint [dossier]             → flake8 / pylint / eslint en parallèle, cache par fichier, rapport JSON
+                                 [-linters flake8,eslint] [-jobs N] [-report <f>]
 
 ────────────────────────────────────────────
 
@@ -149,17 +273,34 @@ Exécute, teste, analyse et prépare tes projets en Python, JavaScript, Java, C,
   -clean                      → Supprime les fichiers temporaires
   -zip <cible>                → Crée une archive zip du projet
   -unzip <fichier.zip> [dest] → Dézippe une archive
-  -gitstatus / -gitcommit     → Git rapide
-  -gendoc                     → Génère la documentation (Sphinx)
-  -test                       → Lance les tests (pytest, npm test…)
+  -gitstatus / -gitcommit "m" → Git rapide sur tous les dépôts sous -root (défaut: .)
+                                 [-root <dossier>] [-jobs N]
+  -gendoc [-full]             → Génère la documentation (Sphinx, incrémentale, -j auto)
+  -test                       → Lance toutes les suites de tests en parallèle
+                                 (pytest, npm, bundle, go, cargo) [-jobs N] [-shards N] [-junit <f>]
+  -test -changed [ref]        → Ne lance que les tests impactés par les fichiers modifiés depuis ref
   -updatedependencies         → Met à jour les dépendances
-  -interactive                → Mode terminal interactif
+  -pipeline [cible]           → Exécute les étapes de dkprun.toml (DAG parallèle, cache des entrées)
+                                 [-file <toml>] [-jobs N] [-force]
+  -interactive                → Mode terminal interactif (:py / :js / :rb = noyaux persistants)
+  -runurl <url>               → Télécharge (cache + revalidation) et exécute un script
+                                 [-sha256 <empreinte>] [-refresh]
   -profile                    → Affiche temps + RAM d’exécution
+  -benchmatrix <dossier>      → Compare une tâche écrite en plusieurs langages
+                                 [-stdin <f>] [-args "<args>"] [-runs N]
   -osinfo / -getip            → Infos système et IP
-  -wifiips                    → IPs du réseau local
+  -wifiips                    → IPs du réseau local (table ARP)
+  -wifiips -scan              → Balaye le sous-réseau et repère les serveurs dkprun
+                                 [-subnet <cidr>] [-port N] [-ttl <s>] [-refresh]
   -startserver                → Lance un serveur de transfert
+                                 [-allowrun] accepte aussi l'exécution de scripts (RUN)
+  -r -<ext> <f> -remoterun <ip[:port]> → Exécute le script sur un serveur dkprun distant
+  -runbatch <f1> [f2 ...] -nodes ip1[:port],ip2[:port] → Répartit les scripts sur le nœud le moins chargé
+  -metrics <port>             → Expose les métriques Prometheus sur 127.0.0.1:<port>/metrics
+                                 (connexions, octets, durées, exécutions -r) + sauvegarde à la sortie
   -sendserver <f> -ip <ip>    → Envoie un fichier
   -takeserver <f> -ip <ip>    → Récupère un fichier
+                                 [-comp zlib|lzma|bz2|zstd (liste possible : lzma,zlib)] compression à la volée
 
 ────────────────────────────────────────────
 
@@ -177,28 +318,182 @@ Tape simplement `dkprun` ou `dkprun -help` pour réafficher ce guide.
 """
     print(help_txt)
 
-def check_and_install_interpreters():
-    interpreters = {
-        "node": "Node.js (node) : https://nodejs.org/",
-        "npm": "NPM (npm) : inclus avec Node.js",
-        "composer": "Composer (php) : https://getcomposer.org/",
-        "php": "PHP (php) : https://www.php.net/",
-        "ruby": "Ruby (ruby) : https://www.ruby-lang.org/fr/",
-        "bundle": "Bundler (bundle) : gem install bundler",
-        "bash": "Bash (bash) : généralement présent sur Linux/Mac",
-        "cmd": "Batch (cmd) : présent sur Windows",
-        "powershell": "PowerShell : présent sur Windows",
-        "gcc": "GCC (C) : https://gcc.gnu.org/",
-        "g++": "G++ (C++) : https://gcc.gnu.org/",
-        "go": "Go : https://golang.org/",
-        "rustc": "Rust : https://www.rust-lang.org/",
-        "swift": "Swift : https://swift.org/",
-        "kotlinc": "Kotlin : https://kotl.in/"
-    }
+INTERPRETERS = {
+    "python": "Python (python) : https://www.python.org/",
+    "node": "Node.js (node) : https://nodejs.org/",
+    "npm": "NPM (npm) : inclus avec Node.js",
+    "composer": "Composer (php) : https://getcomposer.org/",
+    "php": "PHP (php) : https://www.php.net/",
+    "ruby": "Ruby (ruby) : https://www.ruby-lang.org/fr/",
+    "bundle": "Bundler (bundle) : gem install bundler",
+    "bash": "Bash (bash) : généralement présent sur Linux/Mac",
+    "cmd": "Batch (cmd) : présent sur Windows",
+    "powershell": "PowerShell : présent sur Windows",
+    "gcc": "GCC (C) : https://gcc.gnu.org/",
+    "g++": "G++ (C++) : https://gcc.gnu.org/",
+    "javac": "JDK Java (javac) : https://adoptium.net/",
+    "java": "Java (java) : https://adoptium.net/",
+    "go": "Go : https://golang.org/",
+    "rustc": "Rust : https://www.rust-lang.org/",
+    "swift": "Swift : https://swift.org/",
+    "kotlinc": "Kotlin : https://kotl.in/"
+}
+
+# Outils utilitaires découverts en plus des interpréteurs (git, docker, gestionnaires de paquets…)
+EXTRA_TOOLS = [
+    "git", "docker", "dotnet", "csc", "xdg-open", "open", "cargo", "pytest",
+    "apt", "apt-get", "dnf", "yum", "brew", "choco", "wget", "curl", "sphinx-build", "sphinx-quickstart",
+    "flake8", "pylint", "eslint",
+]
+
+# Arguments donnant la version d'un outil (défaut: --version)
+TOOL_VERSION_ARGS = {
+    "java": ["-version"],
+    "javac": ["-version"],
+    "kotlinc": ["-version"],
+    "go": ["version"],
+    "cmd": None,
+    "open": None,
+    "xdg-open": ["--version"],
+    "powershell": ["-NoProfile", "-Command", "$PSVersionTable.PSVersion.ToString()"],
+}
+
+_TOOLCHAINS = None
+
+def get_cache_dir(*parts):
+    """
+    Retourne (et crée) un sous-dossier du cache utilisateur de dkprun.
+    """
+    if os.name == "nt":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    path = os.path.join(base, "dkprun", *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+def _path_fingerprint():
+    """
+    Empreinte du PATH courant : contenu de la variable et date de modification de chaque dossier.
+    """
+    import hashlib
+
+    h = hashlib.sha256(os.environ.get("PATH", "").encode())
+    for d in os.environ.get("PATH", "").split(os.pathsep):
+        try:
+            h.update(f"{d}:{os.stat(d).st_mtime_ns}".encode())
+        except OSError:
+            h.update(f"{d}:-".encode())
+    return h.hexdigest()
+
+def _probe_tool(name):
+    path = shutil.which(name)
+    if path is None:
+        return name, None
+    info = {"path": path, "version": None, "mtime": os.stat(path).st_mtime_ns}
+    version_args = TOOL_VERSION_ARGS.get(name, ["--version"])
+    if version_args is not None:
+        try:
+            result = subprocess.run([path] + version_args, capture_output=True, text=True, timeout=10, stdin=subprocess.DEVNULL)
+            lines = [l.strip() for l in (result.stdout + "\n" + result.stderr).splitlines() if l.strip()]
+            info["version"] = lines[0][:120] if lines else None
+        except Exception:
+            pass
+    return name, info
+
+def discover_toolchains(refresh=False):
+    """
+    Découvre en parallèle les interpréteurs/compilateurs installés et leurs versions.
+
+    Le résultat est conservé dans le cache utilisateur et réutilisé tant que le PATH et
+    les dates de modification de ses dossiers (et des exécutables trouvés) n'ont pas changé.
+
+    Args:
+        refresh (bool): Force une nouvelle découverte.
+
+    Returns:
+        dict: nom -> {"path", "version", "mtime"} ou None si l'outil est absent.
+    """
+    import json
+    from concurrent.futures import ThreadPoolExecutor
+
+    global _TOOLCHAINS
+    if _TOOLCHAINS is not None and not refresh:
+        return _TOOLCHAINS
+    cache_file = os.path.join(get_cache_dir(), "toolchains.json")
+    names = list(INTERPRETERS) + [t for t in EXTRA_TOOLS if t not in INTERPRETERS]
+    key = _path_fingerprint()
+    if not refresh and os.path.exists(cache_file):
+        try:
+            with open(cache_file, encoding="utf-8") as f:
+                cached = json.load(f)
+            tools = cached.get("tools", {})
+            valid = cached.get("key") == key and all(n in tools for n in names)
+            for info in tools.values():
+                if valid and info and os.stat(info["path"]).st_mtime_ns != info["mtime"]:
+                    valid = False
+            if valid:
+                _TOOLCHAINS = tools
+                return tools
+        except Exception:
+            pass
+    with ThreadPoolExecutor(max_workers=min(32, len(names))) as pool:
+        tools = dict(pool.map(_probe_tool, names))
+    try:
+        tmp = f"{cache_file}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"key": key, "tools": tools}, f, indent=1)
+        os.replace(tmp, cache_file)
+    except OSError:
+        pass
+    _TOOLCHAINS = tools
+    return tools
+
+def find_tool(name):
+    """
+    Équivalent de shutil.which s'appuyant sur le registre des outils (cache).
+    """
+    tools = discover_toolchains()
+    if name not in tools:
+        path = shutil.which(name)
+        tools[name] = {"path": path, "version": None, "mtime": None} if path else None
+    info = tools[name]
+    return info["path"] if info else None
+
+def tool_fingerprint(name):
+    """
+    Identifiant stable d'un outil (chemin + version) à inclure dans les clés de cache de compilation.
+    """
+    find_tool(name)
+    info = discover_toolchains().get(name)
+    if not info:
+        return f"{name}@absent"
+    return f"{name}@{info['path']}@{info['version']}"
+
+def check_and_install_interpreters(verbose=True, refresh=False):
+    """
+    Vérifie la présence des interpréteurs/compilateurs et retourne ceux qui sont installés.
+
+    Args:
+        verbose (bool): Affiche les versions trouvées et les outils manquants.
+        refresh (bool): Ignore le cache du registre des outils.
+
+    Returns:
+        set: Noms des exécutables trouvés dans le PATH.
+    """
+    tools = discover_toolchains(refresh)
     missing = []
-    for exe, help_txt in interpreters.items():
-        if shutil.which(exe) is None:
+    available = set()
+    for exe, help_txt in INTERPRETERS.items():
+        if tools.get(exe) is None:
             missing.append(help_txt)
+        else:
+            available.add(exe)
+    if not verbose:
+        return available
+    for exe in sorted(available):
+        version = tools[exe]["version"] or "version inconnue"
+        log(f"  ✔ {exe:<11} {version}", "info", Fore.GREEN)
     if missing:
         log("⚠️ Interpréteurs/managers manquants :", "warning", Fore.YELLOW)
         for m in missing:
@@ -206,13 +501,14 @@ def check_and_install_interpreters():
         print("\nInstalle-les manuellement avant de continuer.")
     else:
         log("✅ Tous les interpréteurs principaux sont installés.", "info", Fore.GREEN)
+    return available
 
 def clean_project():
     patterns = [
         "__pycache__", ".pytest_cache", ".mypy_cache",
         "*.class", "*.o", "*.exe", "*.out", "node_modules", "venv", ".env", ".DS_Store"
     ]
-    nb_cleaned = 0
+    nb_cleaned = nb_failed = 0
     for root, dirs, files in os.walk(".", topdown=False):
         for d in dirs:
             if d in patterns or d.startswith("build"):
@@ -220,8 +516,9 @@ def clean_project():
                     shutil.rmtree(os.path.join(root, d))
                     nb_cleaned += 1
                     log(f"🧹 Dossier supprimé: {os.path.join(root, d)}", "info", Fore.CYAN)
-                except Exception:
-                    pass
+                except Exception as e:
+                    nb_failed += 1
+                    log(f"⚠️ Suppression impossible : {os.path.join(root, d)} ({e})", "warning", Fore.YELLOW)
         for f in files:
             for pat in patterns:
                 if re.fullmatch(pat.replace("*", ".*"), f):
@@ -229,9 +526,11 @@ def clean_project():
                         os.remove(os.path.join(root, f))
                         nb_cleaned += 1
                         log(f"🧹 Fichier supprimé: {os.path.join(root, f)}", "info", Fore.CYAN)
-                    except Exception:
-                        pass
+                    except Exception as e:
+                        nb_failed += 1
+                        log(f"⚠️ Suppression impossible : {os.path.join(root, f)} ({e})", "warning", Fore.YELLOW)
     log(f"✅ Nettoyage terminé. Eléments nettoyés: {nb_cleaned}", "info", Fore.GREEN)
+    return 1 if nb_failed else 0
 
 def os_info():
     import platform
@@ -265,15 +564,413 @@ def os_info():
     except Exception as e:
         log(f"Erreur d'affichage des infos OS : {e}", "error", Fore.RED)
 
-def start_file_server(port=5001, dest_dir=None):
+_METRIC_DEFS = {
+    "dkprun_server_connections_total": ("counter", "Connexions acceptées par le serveur de fichiers."),
+    "dkprun_server_active_connections": ("gauge", "Connexions en cours de traitement."),
+    "dkprun_server_requests_total": ("counter", "Requêtes du serveur de fichiers par commande et statut."),
+    "dkprun_server_bytes_received_total": ("counter", "Octets reçus par le serveur de fichiers."),
+    "dkprun_server_bytes_sent_total": ("counter", "Octets envoyés par le serveur de fichiers."),
+    "dkprun_server_transfer_seconds": ("histogram", "Durée des transferts du serveur de fichiers."),
+    "dkprun_runs_total": ("counter", "Exécutions -r par langage et statut."),
+    "dkprun_run_seconds": ("histogram", "Durée des exécutions -r par langage."),
+}
+METRIC_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300)
+
+_METRICS_LOCK = threading.Lock()
+_METRICS = {}
+_METRICS_SERVER = None
+
+def metric_inc(name, value=1, **labels):
+    """
+    Incrémente un compteur (ou une jauge si `value` est négatif) pour les labels donnés.
+    """
+    key = tuple(sorted(labels.items()))
+    with _METRICS_LOCK:
+        series = _METRICS.setdefault(name, {})
+        series[key] = series.get(key, 0) + value
+
+def metric_observe(name, value, **labels):
+    """
+    Ajoute une observation à un histogramme (seaux cumulés METRIC_BUCKETS, somme, nombre).
+    """
+    key = tuple(sorted(labels.items()))
+    with _METRICS_LOCK:
+        series = _METRICS.setdefault(name, {})
+        hist = series.get(key)
+        if hist is None:
+            hist = series[key] = {"buckets": [0] * len(METRIC_BUCKETS), "sum": 0.0, "count": 0}
+        for i, bound in enumerate(METRIC_BUCKETS):
+            if value <= bound:
+                hist["buckets"][i] += 1
+        hist["sum"] += value
+        hist["count"] += 1
+
+def _format_labels(key, extra=()):
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in pairs)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+def render_metrics():
+    """
+    Retourne toutes les métriques au format texte Prometheus (version 0.0.4).
+    """
+    lines = []
+    with _METRICS_LOCK:
+        snapshot = {name: {k: (dict(v, buckets=list(v["buckets"])) if isinstance(v, dict) else v)
+                           for k, v in series.items()} for name, series in _METRICS.items()}
+    for name, (kind, help_text) in _METRIC_DEFS.items():
+        series = snapshot.get(name)
+        if not series:
+            continue
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for key, value in sorted(series.items()):
+            if kind != "histogram":
+                lines.append(f"{name}{_format_labels(key)} {value:g}")
+                continue
+            for bound, count in zip(METRIC_BUCKETS, value["buckets"]):
+                lines.append(f"{name}_bucket{_format_labels(key, [('le', f'{bound:g}')])} {count}")
+            lines.append(f"{name}_bucket{_format_labels(key, [('le', '+Inf')])} {value['count']}")
+            lines.append(f"{name}_sum{_format_labels(key)} {value['sum']:.6f}")
+            lines.append(f"{name}_count{_format_labels(key)} {value['count']}")
+    return "\n".join(lines) + "\n"
+
+def dump_metrics(path=None):
+    """
+    Écrit l'état des métriques dans un fichier .prom (défaut: cache dkprun/metrics).
+
+    Returns:
+        str | None: Chemin du fichier écrit, ou None si aucune métrique n'a été collectée.
+    """
+    with _METRICS_LOCK:
+        if not _METRICS:
+            return None
+    path = path or os.path.join(get_cache_dir("metrics"), f"{datetime.now():%Y%m%d_%H%M%S}_{os.getpid()}.prom")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(render_metrics())
+    log("📊 Métriques enregistrées : %s", "info", Fore.CYAN, path)
+    return path
+
+def start_metrics_server(port, host="127.0.0.1"):
+    """
+    Expose les métriques sur http://host:port/metrics (thread démon) et les sauvegarde à la sortie.
+
+    Args:
+        port (int): Port HTTP local.
+        host (str): Adresse d'écoute (locale par défaut).
+
+    Returns:
+        ThreadingHTTPServer | None: Le serveur, ou None si le port est indisponible.
+    """
+    import atexit
+    import signal
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    global _METRICS_SERVER
+    if _METRICS_SERVER is not None:
+        return _METRICS_SERVER
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] not in ("/", "/metrics"):
+                self.send_error(404)
+                return
+            body = render_metrics().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    try:
+        server = ThreadingHTTPServer((host, port), MetricsHandler)
+    except OSError as e:
+        log("❌ Impossible d'ouvrir le port des métriques %s : %s", "error", Fore.RED, port, e)
+        return None
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    atexit.register(dump_metrics)
+    # Un arrêt par SIGTERM (systemd, kill) doit aussi passer par atexit pour sauvegarder les métriques
+    if threading.current_thread() is threading.main_thread() and signal.getsignal(signal.SIGTERM) == signal.SIG_DFL:
+        signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(128 + signum))
+    _METRICS_SERVER = server
+    log("📊 Métriques Prometheus : http://%s:%s/metrics", "info", Fore.CYAN, host, server.server_address[1])
+    return server
+
+_RUN_STATE = {"running": 0}
+_RUN_LOCK = threading.Lock()
+
+def _send_frame(conn, kind, data=b""):
+    """
+    Envoie une trame (type sur 1 octet, longueur sur 4 octets, données) du protocole RUN.
+    """
+    import struct
+
+    conn.sendall(struct.pack(">cI", kind, len(data)) + data)
+
+def _recv_exact(conn, size):
+    data = b""
+    while len(data) < size:
+        chunk = conn.recv(size - len(data))
+        if not chunk:
+            return None
+        data += chunk
+    return data
+
+def _recv_frame(conn, max_size=None):
+    """
+    Lit une trame envoyée par _send_frame ; retourne (type, données) ou (None, b"") en fin de flux
+    (ou si la trame dépasse `max_size` octets).
+    """
+    import struct
+
+    header = _recv_exact(conn, 5)
+    if header is None:
+        return None, b""
+    kind, size = struct.unpack(">cI", header)
+    if max_size is not None and size > max_size:
+        return None, b""
+    data = _recv_exact(conn, size) if size else b""
+    return (kind, data) if data is not None else (None, b"")
+
+def _zstd_codec():
+    import io
+
+    try:
+        import zstandard
+    except ImportError:
+        return None
+
+    def decompress(data, max_length):
+        # Lecture en flux : la taille annoncée dans l'en-tête zstd n'est pas allouée d'avance
+        out = b""
+        with zstandard.ZstdDecompressor().stream_reader(io.BytesIO(data)) as reader:
+            while len(out) < max_length:
+                chunk = reader.read(max_length - len(out))
+                if not chunk:
+                    break
+                out += chunk
+        return out
+
+    return lambda data: zstandard.ZstdCompressor(level=3).compress(data), decompress
+
+# Algorithmes de compression des transferts : nom -> (compresse, décompresse), par ordre de préférence
+COMPRESSORS = collections.OrderedDict()
+TRANSFER_CHUNK = 256 * 1024
+
+def register_compressor(name, compress, decompress):
+    """
+    Ajoute (ou remplace) un algorithme utilisable avec -comp pour SEND/TAKE.
+
+    Args:
+        name (str): Nom négocié dans l'en-tête (comp=...).
+        compress (callable): data -> données compressées.
+        decompress (callable): (data, max_length) -> au plus max_length octets décompressés.
+    """
+    COMPRESSORS[name] = (compress, decompress)
+
+def _register_default_compressors():
+    import bz2
+    import lzma
+    import zlib
+
+    zstd = _zstd_codec()
+    if zstd:
+        register_compressor("zstd", *zstd)
+    register_compressor("zlib", lambda data: zlib.compress(data, 6),
+                        lambda data, max_length: zlib.decompressobj().decompress(data, max_length))
+    register_compressor("lzma", lambda data: lzma.compress(data, preset=2),
+                        lambda data, max_length: lzma.LZMADecompressor().decompress(data, max_length))
+    register_compressor("bz2", lambda data: bz2.compress(data, 6),
+                        lambda data, max_length: bz2.BZ2Decompressor().decompress(data, max_length))
+
+_register_default_compressors()
+
+def _parse_header_options(command):
+    # "TAKE:nom\tcomp=zlib,lzma" -> ("TAKE:nom", {"comp": "zlib,lzma"})
+    command, *fields = command.split("\t")
+    return command, dict(f.split("=", 1) for f in fields if "=" in f)
+
+def _choose_compressor(requested):
+    return next((c for c in requested.split(",") if c in COMPRESSORS), "none")
+
+def _local_compressors(requested):
+    """
+    Ne garde des algorithmes demandés avec -comp que ceux disponibles localement (ex: zstd sans zstandard).
+    """
+    names = [c for c in requested.split(",") if c]
+    usable = [c for c in names if c in COMPRESSORS]
+    if len(usable) < len(names):
+        log(f"⚠️ Compression indisponible ici : {', '.join(c for c in names if c not in COMPRESSORS)}"
+            f" (connues : {', '.join(COMPRESSORS)})", "warning", Fore.YELLOW)
+    return ",".join(usable) or None
+
+def _send_stream(conn, f, codec):
+    """
+    Envoie un fichier en trames : b"Z" (bloc compressé), b"R" (bloc brut), puis b"E" (fin).
+
+    Un bloc qui ne gagne pas au moins 10 % est envoyé brut ; après 4 blocs incompressibles de suite
+    (données déjà compressées), la compression est suspendue pendant 16 blocs avant un nouvel essai.
+
+    Returns:
+        dict: {"raw", "wire", "chunks", "compressed"} (octets utiles, octets transmis, blocs).
+    """
+    compress = COMPRESSORS[codec][0] if codec in COMPRESSORS else None
+    stats = {"raw": 0, "wire": 0, "chunks": 0, "compressed": 0}
+    misses = skip = 0
+    while True:
+        data = f.read(TRANSFER_CHUNK)
+        if not data:
+            break
+        kind, payload = b"R", data
+        if compress and skip:
+            skip -= 1
+        elif compress:
+            packed = compress(data)
+            if len(packed) < len(data) * 0.9:
+                kind, payload = b"Z", packed
+                misses = 0
+            else:
+                misses += 1
+                if misses >= 4:
+                    skip, misses = 16, 0
+        _send_frame(conn, kind, payload)
+        stats["raw"] += len(data)
+        stats["wire"] += len(payload) + 5
+        stats["chunks"] += 1
+        stats["compressed"] += kind == b"Z"
+    _send_frame(conn, b"E")
+    stats["wire"] += 5
+    return stats
+
+def _recv_stream(conn, f, codec):
+    """
+    Reçoit un flux envoyé par _send_stream et l'écrit dans `f`.
+
+    Aucun bloc ne peut dépasser TRANSFER_CHUNK, ni sur le réseau ni une fois décompressé :
+    une « bombe » de décompression est rejetée sans être développée en mémoire.
+
+    Returns:
+        dict | None: Statistiques du transfert, ou None si le flux est incomplet ou invalide.
+    """
+    decompress = COMPRESSORS[codec][1] if codec in COMPRESSORS else None
+    stats = {"raw": 0, "wire": 0, "chunks": 0, "compressed": 0}
+    while True:
+        kind, payload = _recv_frame(conn, TRANSFER_CHUNK)
+        if kind == b"E":
+            stats["wire"] += 5
+            return stats
+        if kind not in (b"R", b"Z") or (kind == b"Z" and decompress is None):
+            return None
+        if kind == b"Z":
+            try:
+                data = decompress(payload, TRANSFER_CHUNK + 1)
+            except Exception:
+                return None
+            if len(data) > TRANSFER_CHUNK:
+                return None
+        else:
+            data = payload
+        f.write(data)
+        stats["raw"] += len(data)
+        stats["wire"] += len(payload) + 5
+        stats["chunks"] += 1
+        stats["compressed"] += kind == b"Z"
+
+def _transfer_summary(stats, seconds, codec):
+    seconds = max(seconds, 1e-6)
+    ratio = stats["raw"] / stats["wire"] if stats["wire"] else 1.0
+    return (f"{_format_size(stats['raw'])} → {_format_size(stats['wire'])} ({codec}, ratio {ratio:.2f}x, "
+            f"{stats['compressed']}/{stats['chunks']} blocs compressés) — {_format_size(stats['raw'] / seconds)}/s effectif, "
+            f"{_format_size(stats['wire'] / seconds)}/s sur le réseau")
+
+# Délai de réponse à un en-tête -comp : un serveur trop ancien ne répond jamais
+REPLY_TIMEOUT = 10
+
+def _read_reply_line(conn, timeout=REPLY_TIMEOUT):
+    line = b""
+    conn.settimeout(timeout)
+    try:
+        while not line.endswith(b"\n"):
+            byte = conn.recv(1)
+            if not byte:
+                return None
+            line += byte
+    except socket.timeout:
+        return None
+    finally:
+        conn.settimeout(None)
+    return line.strip().decode(errors="replace")
+
+def _server_load():
+    with _RUN_LOCK:
+        running = _RUN_STATE["running"]
+    load1 = os.getloadavg()[0] if hasattr(os, "getloadavg") else psutil.cpu_percent(interval=0.1) / 100 * (os.cpu_count() or 1)
+    return {"running": running, "load1": round(load1, 2), "cpus": os.cpu_count() or 1}
+
+def _serve_run(conn, header, script_path, run_args=None):
+    """
+    Exécute un script reçu par RUN via le dispatch -r de dkprun et renvoie sa sortie en trames.
+
+    Trames envoyées : b"O" (sortie, stdout+stderr mêlés) puis b"X" (code de sortie en texte).
+    """
+    import shlex
+
+    ext_flag = header[0]
+    cmd = [sys.executable, os.path.abspath(__file__), "-r", ext_flag, script_path]
+    run_args = run_args or []
+    if run_args:
+        cmd += ["--"] + run_args
+    log("▶️ RUN %s %s", "info", Fore.CYAN, ext_flag, shlex.join([os.path.basename(script_path)] + run_args))
+    with _RUN_LOCK:
+        _RUN_STATE["running"] += 1
+    start = time.time()
+    returncode = 1
+    proc = None
+    try:
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, stdin=subprocess.DEVNULL,
+                                cwd=os.path.dirname(script_path), env=dict(os.environ, PYTHONUNBUFFERED="1"))
+        while True:
+            chunk = os.read(proc.stdout.fileno(), 65536)
+            if not chunk:
+                break
+            _send_frame(conn, b"O", chunk)
+        returncode = proc.wait()
+        _send_frame(conn, b"X", str(returncode).encode())
+    except OSError as e:
+        # Client parti : inutile de laisser tourner le script
+        if proc is not None and proc.poll() is None:
+            proc.kill()
+            proc.wait()
+        log("❌ RUN interrompu : %s", "error", Fore.RED, e)
+    finally:
+        with _RUN_LOCK:
+            _RUN_STATE["running"] -= 1
+    log("⏹️ RUN %s terminé (code %s, %.2fs)", "info", Fore.GREEN if returncode == 0 else Fore.RED,
+        os.path.basename(script_path), returncode, time.time() - start)
+    return returncode == 0
+
+def start_file_server(port=5001, dest_dir=None, allow_run=False):
     """
     Démarre un serveur TCP qui reçoit ou envoie un fichier selon la requête du client.
+
+    Avec `allow_run`, le serveur accepte aussi RUN (exécution à distance d'un script reçu).
+    LOAD retourne toujours sa charge courante (JSON) pour la répartition -runbatch.
     """
     import socket
     import threading
 
     dest_dir = dest_dir or os.getcwd()
-    print(f"📦 [Serveur] Prêt sur le port {port}... (Ctrl+C pour arrêter)")
+    # Mode serveur : les connexions ne doivent jamais attendre l'écriture des logs
+    set_async_console(True)
+    log("📦 [Serveur] Prêt sur le port %s... (Ctrl+C pour arrêter)", "info", None, port)
+    if allow_run:
+        log("⚠️ RUN activé : tout client peut exécuter du code sur cette machine.", "warning", Fore.YELLOW)
     with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
         s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         s.bind(('', port))
@@ -282,41 +979,19 @@ def start_file_server(port=5001, dest_dir=None):
             try:
                 conn, addr = s.accept()
             except KeyboardInterrupt:
-                print("\nArrêt du serveur.")
+                log("\nArrêt du serveur.")
                 break
-            print(f"🔔 Connexion de {addr}")
-            t = threading.Thread(target=handle_file_server_request, args=(conn, dest_dir))
+            log("🔔 Connexion de %s", "info", None, addr)
+            t = threading.Thread(target=handle_file_server_request, args=(conn, dest_dir, allow_run))
             t.daemon = True
             t.start()
 
-def get_wifi_ips():
-    """
-    Affiche toutes les IPs de machines connectées au même réseau local (table ARP).
-    Fonctionne sur Windows, Linux, Mac.
-    """
-
-    log("🔎 IPs détectées sur le réseau local :", "info", Fore.CYAN)
-    try:
-        if platform.system() == "Windows":
-            output = subprocess.check_output("arp -a", shell=True, encoding="utf-8")
-            # Les lignes contenant une IP (xxx.xxx.xxx.xxx)
-            pattern = re.compile(r"(\d+\.\d+\.\d+\.\d+)")
-            ips = set()
-            for line in output.splitlines():
-                match = pattern.search(line)
-                if match:
-                    ips.add(match.group(1))
-        else:
-            output = subprocess.check_output(["arp", "-a"], encoding="utf-8")
-            pattern = re.compile(r"\((\d+\.\d+\.\d+\.\d+)\)")
-            ips = set(pattern.findall(output))
-        # Affichage
-        for ip in sorted(ips):
-            print(f" - {ip}")
-    except Exception as e:
-        log(f"❌ Impossible de récupérer la liste des IPs : {e}", "error", Fore.RED)
-
-def handle_file_server_request(conn, dest_dir):
+def handle_file_server_request(conn, dest_dir, allow_run=False):
+    metric_inc("dkprun_server_connections_total")
+    metric_inc("dkprun_server_active_connections")
+    command_name, status = "unknown", "error"
+    received = sent = 0
+    start = time.time()
     with conn:
         try:
             # Reçoit la commande (première ligne)
@@ -326,9 +1001,44 @@ def handle_file_server_request(conn, dest_dir):
                 if not byte:
                     return
                 command_line += byte
+            received += len(command_line)
             command = command_line.strip().decode(errors='replace')
-            if command.startswith("SEND:"):
+            options = {}
+            if command.startswith(("SEND:", "TAKE:", "RUN:")):
+                command, options = _parse_header_options(command)
+            if command.startswith("SEND:") and "comp" in options:
+                # Réception compressée : accord sur l'algorithme puis flux en trames
+                command_name = "SEND"
+                codec = _choose_compressor(options["comp"])
+                dest_path = os.path.join(dest_dir, os.path.basename(command[5:]))
+                conn.sendall(f"OK\tcomp={codec}\n".encode())
+                with open(dest_path, "wb") as f:
+                    stats = _recv_stream(conn, f, codec)
+                if stats is None:
+                    os.remove(dest_path)
+                    log("❌ Transfert incomplet : %s", "error", Fore.RED, dest_path)
+                else:
+                    received += stats["wire"]
+                    status = "ok"
+                    log("✅ Fichier reçu : %s — %s", "info", Fore.GREEN, dest_path, _transfer_summary(stats, time.time() - start, codec))
+            elif command.startswith("TAKE:") and "comp" in options:
+                command_name = "TAKE"
+                codec = _choose_compressor(options["comp"])
+                file_path = os.path.join(dest_dir, os.path.basename(command[5:]))
+                if os.path.isfile(file_path):
+                    conn.sendall(f"OK\tcomp={codec}\n".encode())
+                    with open(file_path, "rb") as f:
+                        stats = _send_stream(conn, f, codec)
+                    sent += stats["wire"]
+                    status = "ok"
+                    log("✅ Fichier envoyé : %s — %s", "info", Fore.GREEN, file_path, _transfer_summary(stats, time.time() - start, codec))
+                else:
+                    conn.sendall(b"ERR\terror=not_found\n")
+                    status = "not_found"
+                    log("❌ Fichier demandé non trouvé : %s", "error", Fore.RED, file_path)
+            elif command.startswith("SEND:"):
                 # Reception d'un fichier
+                command_name = "SEND"
                 filename = command[5:]
                 dest_path = os.path.join(dest_dir, os.path.basename(filename))
                 with open(dest_path, "wb") as f:
@@ -336,10 +1046,13 @@ def handle_file_server_request(conn, dest_dir):
                         data = conn.recv(4096)
                         if not data:
                             break
+                        received += len(data)
                         f.write(data)
-                print(f"✅ Fichier reçu : {dest_path}")
+                status = "ok"
+                log("✅ Fichier reçu : %s", "info", Fore.GREEN, dest_path)
             elif command.startswith("TAKE:"):
                 # Envoi d'un fichier
+                command_name = "TAKE"
                 filename = command[5:]
                 file_path = os.path.join(dest_dir, os.path.basename(filename))
                 if os.path.exists(file_path):
@@ -349,14 +1062,68 @@ def handle_file_server_request(conn, dest_dir):
                             if not data:
                                 break
                             conn.sendall(data)
-                    print(f"✅ Fichier envoyé : {file_path}")
+                            sent += len(data)
+                    status = "ok"
+                    log("✅ Fichier envoyé : %s", "info", Fore.GREEN, file_path)
                 else:
                     conn.sendall(b"")
-                    print(f"❌ Fichier demandé non trouvé : {file_path}")
+                    status = "not_found"
+                    log("❌ Fichier demandé non trouvé : %s", "error", Fore.RED, file_path)
+            elif command == "LOAD":
+                import json
+
+                command_name = "LOAD"
+                payload = (json.dumps(_server_load()) + "\n").encode()
+                conn.sendall(payload)
+                sent += len(payload)
+                status = "ok"
+            elif command.startswith("RUN:"):
+                # Exécution à distance : RUN:<ext>:<nom>[\targs=<liste JSON>], puis le contenu jusqu'à SHUT_WR
+                import json
+                import tempfile
+
+                command_name = "RUN"
+                header = command[4:].partition(":")
+                name = os.path.basename(header[2])
+                try:
+                    run_args = json.loads(options.get("args", "[]"))
+                except ValueError:
+                    run_args = None
+                if not allow_run:
+                    _send_frame(conn, b"O", "❌ RUN désactivé sur ce serveur (démarrer avec -startserver -allowrun).\n".encode())
+                    _send_frame(conn, b"X", b"126")
+                    status = "denied"
+                    log("⛔ RUN refusé (serveur sans -allowrun)", "warning", Fore.YELLOW)
+                elif header[0] not in EXT_TO_COMMAND or not name:
+                    _send_frame(conn, b"O", f"❌ Extension ou nom invalide : {header[0]}:{name}\n".encode())
+                    _send_frame(conn, b"X", b"2")
+                elif not isinstance(run_args, list) or not all(isinstance(a, str) for a in run_args):
+                    _send_frame(conn, b"O", "❌ Arguments invalides (liste JSON de chaînes attendue).\n".encode())
+                    _send_frame(conn, b"X", b"2")
+                else:
+                    run_dir = tempfile.mkdtemp(prefix="run-", dir=get_cache_dir("remote-runs"))
+                    script_path = os.path.join(run_dir, name)
+                    try:
+                        with open(script_path, "wb") as f:
+                            while True:
+                                data = conn.recv(65536)
+                                if not data:
+                                    break
+                                received += len(data)
+                                f.write(data)
+                        status = "ok" if _serve_run(conn, header, script_path, run_args) else "error"
+                    finally:
+                        shutil.rmtree(run_dir, ignore_errors=True)
         except Exception as e:
-            print(f"❌ Erreur serveur : {e}")
+            log("❌ Erreur serveur : %s", "error", Fore.RED, e)
+        finally:
+            metric_inc("dkprun_server_active_connections", -1)
+            metric_inc("dkprun_server_requests_total", command=command_name, status=status)
+            metric_inc("dkprun_server_bytes_received_total", received)
+            metric_inc("dkprun_server_bytes_sent_total", sent)
+            metric_observe("dkprun_server_transfer_seconds", time.time() - start, command=command_name)
 
-def take_file_from_server(file_name, ip, port=5001, save_as=None):
+def take_file_from_server(file_name, ip, port=5001, save_as=None, compression=None):
     """
     Demande à un serveur dkprun le fichier `file_name` et le récupère.
 
@@ -365,13 +1132,33 @@ def take_file_from_server(file_name, ip, port=5001, save_as=None):
         ip (str): Adresse IP du serveur.
         port (int): Port du serveur.
         save_as (str): Chemin local de sauvegarde (défaut: même nom).
+        compression (str, optional): Algorithmes proposés par ordre de préférence ("zlib", "lzma,zlib", ...).
     """
     import socket
 
     save_as = save_as or os.path.basename(file_name)
+    if compression:
+        compression = _local_compressors(compression)
     try:
         with socket.socket() as s:
             s.connect((ip, port))
+            if compression:
+                start = time.time()
+                s.sendall(f"TAKE:{file_name}\tcomp={compression}\n".encode())
+                reply, options = _parse_header_options(_read_reply_line(s) or "")
+                if reply != "OK":
+                    log(f"❌ Fichier '{file_name}' non disponible sur {ip}:{port} ({options.get('error', reply or 'pas de réponse')})", "error", Fore.RED)
+                    return
+                codec = options.get("comp", "none")
+                with open(save_as, 'wb') as f:
+                    stats = _recv_stream(s, f, codec)
+                if stats is None:
+                    os.remove(save_as)
+                    log(f"❌ Transfert incomplet depuis {ip}:{port}", "error", Fore.RED)
+                    return
+                log(f"✅ Fichier '{file_name}' récupéré depuis {ip}:{port} vers '{save_as}' — "
+                    f"{_transfer_summary(stats, time.time() - start, codec)}", "info", Fore.GREEN)
+                return
             s.sendall(f"TAKE:{file_name}\n".encode())
             with open(save_as, 'wb') as f:
                 while True:
@@ -383,23 +1170,47 @@ def take_file_from_server(file_name, ip, port=5001, save_as=None):
     except Exception as e:
         log(f"❌ Erreur lors de la récupération du fichier : {e}", "error", Fore.RED)
 
-def send_file_to_server(file_path, ip, port=5001):
+def send_file_to_server(file_path, ip, port=5001, compression=None):
     """
     Envoie un fichier à un serveur dkprun (startserver) sur l'IP et port donnés.
 
+    Avec `compression`, l'algorithme est négocié dans l'en-tête (le serveur retient le premier
+    qu'il connaît) et les blocs incompressibles partent bruts.
+
     Args:
         file_path (str): Chemin du fichier à envoyer.
         ip (str): Adresse IP du serveur.
         port (int): Port du serveur (défaut 5001).
+        compression (str, optional): Algorithmes proposés par ordre de préférence ("zlib", "lzma,zlib", ...).
+
+    Returns:
+        int: 0 si le fichier est envoyé, 1 sinon.
     """
     import socket
 
     if not os.path.exists(file_path):
         log(f"❌ Fichier à envoyer introuvable : {file_path}", "error", Fore.RED)
-        return
+        return 1
+    if compression:
+        compression = _local_compressors(compression)
     try:
         with socket.socket() as s:
             s.connect((ip, port))
+            if compression:
+                start = time.time()
+                s.sendall(f"SEND:{os.path.basename(file_path)}\tcomp={compression}\n".encode())
+                reply, options = _parse_header_options(_read_reply_line(s) or "")
+                if reply != "OK":
+                    log(f"❌ Le serveur {ip}:{port} ne gère pas la compression (mettre dkprun à jour).", "error", Fore.RED)
+                    return 1
+                codec = options.get("comp", "none")
+                with open(file_path, 'rb') as f:
+                    stats = _send_stream(s, f, codec)
+                s.shutdown(socket.SHUT_WR)
+                s.recv(1)
+                log(f"✅ Fichier '{file_path}' envoyé à {ip}:{port} — {_transfer_summary(stats, time.time() - start, codec)}",
+                    "info", Fore.GREEN)
+                return 0
             # Envoie de la commande et du nom du fichier
             s.sendall(f"SEND:{os.path.basename(file_path)}\n".encode())
             # Puis envoie du contenu
@@ -410,8 +1221,176 @@ def send_file_to_server(file_path, ip, port=5001):
                         break
                     s.sendall(data)
         log(f"✅ Fichier '{file_path}' envoyé à {ip}:{port}", "info", Fore.GREEN)
+        return 0
     except Exception as e:
         log(f"❌ Erreur lors de l'envoi du fichier : {e}", "error", Fore.RED)
+        return 1
+
+def _parse_node(node, default_port=5001):
+    host, _, port = node.strip().rpartition(":")
+    if not host or not port.isdigit():
+        return node.strip(), default_port
+    return host, int(port)
+
+def ext_flag_for(filename):
+    """
+    Retourne l'option d'extension dkprun (-py, -c#, ...) correspondant à un nom de fichier.
+    """
+    ext = os.path.splitext(filename)[1].lower()
+    return "-c#" if ext == ".cs" else ("-" + ext[1:] if "-" + ext[1:] in EXT_TO_COMMAND else None)
+
+def node_load(ip, port=5001, timeout=2.0):
+    """
+    Interroge la charge d'un serveur dkprun (commande LOAD).
+
+    Returns:
+        dict | None: {"running", "load1", "cpus"} ou None si le nœud ne répond pas.
+    """
+    import json
+
+    try:
+        with socket.create_connection((ip, port), timeout=timeout) as s:
+            s.sendall(b"LOAD\n")
+            data = b""
+            while not data.endswith(b"\n"):
+                chunk = s.recv(4096)
+                if not chunk:
+                    break
+                data += chunk
+        return json.loads(data)
+    except (OSError, ValueError):
+        return None
+
+def remote_run(filename, ext_flag, ip, port=5001, script_args=None, output=None):
+    """
+    Envoie un script à un serveur dkprun (-startserver -allowrun), l'exécute là-bas et relaie sa sortie.
+
+    Args:
+        filename (str): Script local.
+        ext_flag (str): Extension dkprun (-py, -js, ...).
+        ip (str): Adresse du nœud.
+        port (int): Port du nœud.
+        script_args (list, optional): Arguments transmis au script.
+        output (file, optional): Flux binaire recevant la sortie (défaut: stdout).
+
+    Returns:
+        int: Code de sortie distant (255 si la connexion échoue).
+    """
+    import json
+
+    output = output or sys.stdout.buffer
+    # Arguments encodés en JSON : ni tabulation ni saut de ligne brut dans l'en-tête
+    header = f"RUN:{ext_flag}:{os.path.basename(filename)}"
+    if script_args:
+        header += "\targs=" + json.dumps(list(script_args))
+    try:
+        with socket.create_connection((ip, port), timeout=10) as s:
+            s.settimeout(None)
+            s.sendall(header.encode() + b"\n")
+            with open(filename, "rb") as f:
+                while True:
+                    data = f.read(65536)
+                    if not data:
+                        break
+                    s.sendall(data)
+            # Fin du script : le serveur lit jusqu'à EOF puis lance l'exécution
+            s.shutdown(socket.SHUT_WR)
+            while True:
+                kind, data = _recv_frame(s)
+                if kind == b"O":
+                    output.write(data)
+                    output.flush()
+                elif kind == b"X":
+                    return int(data)
+                else:
+                    log(f"❌ Connexion perdue avec {ip}:{port} avant la fin de l'exécution.", "error", Fore.RED)
+                    return 255
+    except OSError as e:
+        log(f"❌ Impossible d'exécuter sur {ip}:{port} : {e}", "error", Fore.RED)
+        return 255
+
+def run_batch(files, nodes, script_args=None):
+    """
+    Répartit l'exécution de plusieurs scripts sur des serveurs dkprun, vers le nœud le moins chargé.
+
+    Avant chaque envoi, la charge des nœuds est relue (LOAD) : le score est
+    (max(exécutions en cours, nos envois en cours) + load1) / nombre de CPU.
+
+    Args:
+        files (list): Scripts à exécuter (extension déduite du nom).
+        nodes (list): Nœuds "ip[:port]".
+        script_args (list, optional): Arguments transmis à chaque script.
+
+    Returns:
+        int: 0 si toutes les exécutions ont réussi, 1 sinon.
+    """
+    import io
+    from concurrent.futures import ThreadPoolExecutor
+
+    nodes = [_parse_node(n) for n in nodes]
+    jobs = []
+    for path in files:
+        flag = ext_flag_for(path)
+        if flag is None or not os.path.isfile(path):
+            log(f"❌ Fichier ignoré (introuvable ou extension inconnue) : {path}", "error", Fore.RED)
+        else:
+            jobs.append((path, flag))
+    with ThreadPoolExecutor(max_workers=len(nodes)) as pool:
+        loads = dict(zip(nodes, pool.map(lambda n: node_load(*n), nodes)))
+    alive = {n: l for n, l in loads.items() if l}
+    for node in nodes:
+        if node not in alive:
+            log(f"⚠️ Nœud injoignable ignoré : {node[0]}:{node[1]}", "warning", Fore.YELLOW)
+    if not alive or not jobs:
+        log("❌ Aucun nœud disponible ou aucun script à exécuter.", "error", Fore.RED)
+        return 1
+
+    inflight = {n: 0 for n in alive}
+    pick_lock = threading.Lock()
+
+    def pick_node():
+        with pick_lock:
+            with ThreadPoolExecutor(max_workers=len(alive)) as pool:
+                fresh = dict(zip(alive, pool.map(lambda n: node_load(*n, timeout=1.0), alive)))
+            for n, l in fresh.items():
+                alive[n] = l or alive[n]
+            node = min(alive, key=lambda n: (max(alive[n]["running"], inflight[n]) + alive[n]["load1"]) / alive[n]["cpus"])
+            inflight[node] += 1
+            alive[node] = dict(alive[node], running=alive[node]["running"] + 1)
+            return node
+
+    def run_job(job):
+        path, flag = job
+        node = pick_node()
+        buffer = io.BytesIO()
+        start = time.time()
+        try:
+            code = remote_run(path, flag, node[0], node[1], script_args, output=buffer)
+        finally:
+            with pick_lock:
+                inflight[node] -= 1
+        duration = time.time() - start
+        color = Fore.GREEN if code == 0 else Fore.RED
+        log(f"── {path} @ {node[0]}:{node[1]} (code {code}, {duration:.2f}s)", "info", color)
+        text = buffer.getvalue().decode(errors="replace")
+        if text:
+            log(text.rstrip("\n"), "info")
+        return path, node, code, duration
+
+    log(f"🛰️ {len(jobs)} exécution(s) réparties sur {len(alive)} nœud(s)...", "info", Fore.CYAN)
+    start = time.time()
+    workers = sum(l["cpus"] for l in alive.values())
+    with ThreadPoolExecutor(max_workers=min(len(jobs), workers)) as pool:
+        results = list(pool.map(run_job, jobs))
+
+    log(f"\n{'Script':<30} {'Nœud':<22} {'Code':>5} {'Durée':>9}", "info", Fore.CYAN)
+    for path, node, code, duration in results:
+        log(f"{os.path.basename(path):<30} {node[0] + ':' + str(node[1]):<22} {code:>5} {duration:>8.2f}s", "info",
+            Fore.GREEN if code == 0 else Fore.RED)
+    failed = sum(1 for r in results if r[2] != 0)
+    log(f"Total : {time.time() - start:.2f}s, {len(results) - failed}/{len(results)} réussie(s).", "info",
+        Fore.GREEN if not failed else Fore.RED)
+    return 1 if failed else 0
 
 def run_in_docker(target):
     """
@@ -440,6 +1419,10 @@ def run_in_docker(target):
         log(f"❌ Extension non supportée pour Docker: {ext}", "error", Fore.RED)
         return
 
+    if find_tool("docker") is None:
+        log("❌ Docker n'est pas installé ou pas dans le PATH.", "error", Fore.RED)
+        return
+
     abs_target = os.path.abspath(target)
     workdir = os.path.dirname(abs_target)
     filename = os.path.basename(abs_target)
@@ -463,198 +1446,3005 @@ def run_in_docker(target):
     else:
         docker_args += [docker_cmd, filename]
 
-    try:
-        subprocess.run(docker_args)
-    except Exception as e:
-        log(f"❌ Erreur d'exécution Docker : {e}", "error", Fore.RED)
+    try:
+        subprocess.run(docker_args)
+    except Exception as e:
+        log(f"❌ Erreur d'exécution Docker : {e}", "error", Fore.RED)
+
+
+def _local_ipv4():
+    """
+    IP locale de l'interface utilisée pour sortir sur le réseau (aucun paquet n'est envoyé).
+    """
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+            s.connect(("10.255.255.255", 1))
+            return s.getsockname()[0]
+    except OSError:
+        return socket.gethostbyname(socket.gethostname())
+
+async def _probe_host(ip, port, timeout):
+    import asyncio
+
+    try:
+        _, writer = await asyncio.wait_for(asyncio.open_connection(ip, port), timeout)
+    except ConnectionRefusedError:
+        return ip, "actif"
+    except (asyncio.TimeoutError, OSError):
+        return ip, None
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except OSError:
+        pass
+    return ip, "ouvert"
+
+def sweep_subnet(subnet=None, port=5001, concurrency=256, timeout=0.5, ttl=300, refresh=False):
+    """
+    Balaye un sous-réseau par connexions TCP concurrentes (asyncio) sur un port donné.
+
+    Un hôte qui accepte la connexion a le port ouvert (ex: serveur dkprun), un hôte qui la
+    refuse est actif. Les résultats sont mis en cache `ttl` secondes.
+
+    Args:
+        subnet (str, optional): Réseau CIDR (défaut: /24 de l'IP locale), au plus /16.
+        port (int): Port sondé (défaut: port du serveur de fichiers dkprun).
+        concurrency (int): Nombre maximal de connexions simultanées.
+        timeout (float): Délai par connexion en secondes.
+        ttl (int): Durée de validité du cache en secondes.
+        refresh (bool): Ignore le cache.
+
+    Returns:
+        dict: ip -> "ouvert" ou "actif" (vide si le réseau est trop grand).
+    """
+    import asyncio
+    import ipaddress
+    import json
+
+    network = ipaddress.ip_network(subnet or f"{_local_ipv4()}/24", strict=False)
+    if network.num_addresses > 65536:
+        log(f"❌ Réseau trop grand pour un balayage : {network} (au plus /16).", "error", Fore.RED)
+        return {}
+    subnet = str(network)
+    key = f"{subnet}:{port}"
+    cache_file = os.path.join(get_cache_dir(), "wifiips.json")
+    try:
+        with open(cache_file, encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        cache = {}
+    entry = cache.get(key)
+    if entry and not refresh and time.time() - entry["time"] < ttl:
+        log(f"🗂️ Résultat en cache pour {key} ({int(time.time() - entry['time'])}s)", "info", Fore.CYAN)
+        return entry["hosts"]
+
+    async def sweep():
+        # `concurrency` sondeurs se partagent un itérateur : pas une coroutine par hôte en mémoire
+        hosts = iter(network.hosts())
+        results = []
+
+        async def worker():
+            for ip in hosts:
+                results.append(await _probe_host(str(ip), port, timeout))
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return results
+
+    start = time.time()
+    found = {ip: state for ip, state in asyncio.run(sweep()) if state}
+    log(f"📡 Balayage de {subnet} (port {port}) en {time.time() - start:.2f}s", "info", Fore.CYAN)
+    cache[key] = {"time": time.time(), "hosts": found}
+    try:
+        with open(cache_file, "w", encoding="utf-8") as f:
+            json.dump(cache, f)
+    except OSError:
+        pass
+    return found
+
+def get_wifi_ips(scan=False, subnet=None, port=5001, ttl=300, refresh=False):
+    """
+    Affiche toutes les IPs de machines connectées au même réseau local (table ARP).
+    Fonctionne sur Windows, Linux, Mac.
+
+    Avec `scan`, le sous-réseau est aussi balayé (voir sweep_subnet) pour trouver les hôtes
+    absents de la table ARP et les serveurs dkprun à l'écoute sur `port`.
+    """
+    import subprocess
+    import platform
+    import re
+
+    log("🔎 IPs détectées sur le réseau local :", "info", Fore.CYAN)
+    ips = set()
+    try:
+        if platform.system() == "Windows":
+            output = subprocess.check_output("arp -a", shell=True, encoding="latin1")
+            # Les lignes contenant une IP (xxx.xxx.xxx.xxx)
+            pattern = re.compile(r"(\d+\.\d+\.\d+\.\d+)")
+            for line in output.splitlines():
+                match = pattern.search(line)
+                if match:
+                    ips.add(match.group(1))
+        else:
+            output = subprocess.check_output(["arp", "-a"], encoding="utf-8")
+            pattern = re.compile(r"\((\d+\.\d+\.\d+\.\d+)\)")
+            ips = set(pattern.findall(output))
+    except Exception as e:
+        log(f"❌ Impossible de récupérer la liste des IPs : {e}", "error", Fore.RED)
+    hosts = {}
+    if scan:
+        try:
+            hosts = sweep_subnet(subnet, port, ttl=ttl, refresh=refresh)
+        except Exception as e:
+            log(f"❌ Balayage du réseau impossible : {e}", "error", Fore.RED)
+    # Affichage
+    for ip in sorted(ips | set(hosts), key=lambda ip: tuple(int(p) for p in ip.split("."))):
+        if hosts.get(ip) == "ouvert":
+            print(f" - {ip}  [serveur dkprun :{port}]")
+        else:
+            print(f" - {ip}")
+
+def unzip_project(zip_path, extract_to=None):
+    """
+    Décompresse un fichier zip dans le dossier courant ou un dossier donné.
+
+    Args:
+        zip_path (str): Chemin du fichier zip à décompresser.
+        extract_to (str, optional): Dossier cible. Si None, extrait dans le dossier courant.
+    """
+    if not os.path.exists(zip_path):
+        log(f"❌ Fichier zip introuvable : {zip_path}", "error", Fore.RED)
+        return
+    if extract_to is None:
+        extract_to = os.getcwd()
+    try:
+        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+            zip_ref.extractall(extract_to)
+        log(f"✅ Fichier décompressé dans : {extract_to}", "info", Fore.GREEN)
+    except Exception as e:
+        log(f"❌ Erreur lors de la décompression : {e}", "error", Fore.RED)
+
+TEST_SKIP_DIRS = {
+    ".git", ".hg", "node_modules", "venv", ".venv", "__pycache__", ".tox", ".nox",
+    ".pytest_cache", "target", "vendor", "dist", "_build", ".dkprun",
+}
+
+def _is_test_file(name):
+    return name.endswith(".py") and (name.startswith("test_") or name.endswith("_test.py"))
+
+def detect_test_suites(root="."):
+    """
+    Détecte tous les systèmes de test d'une arborescence (pytest, npm, bundle, go test, cargo test).
+
+    Returns:
+        tuple: (liste de suites {"name", "kind", "cwd", "cmd"}, fichiers de test pytest)
+    """
+    import json
+
+    suites = []
+    pytest_files = []
+    pytest_config = any(os.path.exists(os.path.join(root, f)) for f in ("pytest.ini", "conftest.py"))
+    if os.path.exists(os.path.join(root, "pyproject.toml")):
+        with open(os.path.join(root, "pyproject.toml"), encoding="utf-8", errors="replace") as f:
+            pytest_config = pytest_config or "[tool.pytest" in f.read()
+    cargo_roots = []
+    for dirpath, dirs, files in os.walk(root):
+        dirs[:] = sorted(d for d in dirs if d not in TEST_SKIP_DIRS and not d.startswith("build"))
+        rel = os.path.relpath(dirpath, root)
+        label = "." if rel == "." else rel.replace(os.sep, "/")
+        if "package.json" in files:
+            try:
+                with open(os.path.join(dirpath, "package.json"), encoding="utf-8") as f:
+                    test_script = json.load(f).get("scripts", {}).get("test", "")
+            except Exception:
+                test_script = ""
+            if test_script and "no test specified" not in test_script:
+                suites.append({"name": f"npm:{label}", "kind": "npm", "cwd": dirpath, "cmd": ["npm", "test"]})
+        if "Gemfile" in files and "Rakefile" in files:
+            suites.append({"name": f"bundle:{label}", "kind": "bundle", "cwd": dirpath, "cmd": ["bundle", "exec", "rake", "test"]})
+        if "go.mod" in files:
+            suites.append({"name": f"go:{label}", "kind": "go", "cwd": dirpath, "cmd": ["go", "test", "./..."]})
+        if "Cargo.toml" in files and not any(dirpath.startswith(c + os.sep) for c in cargo_roots):
+            cargo_roots.append(dirpath)
+            suites.append({"name": f"cargo:{label}", "kind": "cargo", "cwd": dirpath, "cmd": ["cargo", "test"]})
+        pytest_files.extend(os.path.join(dirpath, f) for f in sorted(files) if _is_test_file(f))
+    if pytest_files or pytest_config:
+        suites.insert(0, {"name": "pytest", "kind": "pytest", "cwd": root, "cmd": None})
+    return suites, pytest_files
+
+def _shard_files(files, shards):
+    """
+    Répartit des fichiers en `shards` groupes de taille (octets) équilibrée.
+    """
+    groups = [[] for _ in range(max(1, min(shards, len(files))))]
+    weights = [0] * len(groups)
+    for path in sorted(files, key=lambda p: os.path.getsize(p), reverse=True):
+        i = weights.index(min(weights))
+        groups[i].append(path)
+        weights[i] += os.path.getsize(path)
+    return groups
+
+def _run_test_job(job):
+    start = time.time()
+    try:
+        result = subprocess.run(job["cmd"], cwd=job["cwd"], stdout=subprocess.PIPE, stderr=subprocess.STDOUT, stdin=subprocess.DEVNULL)
+        job["returncode"] = result.returncode
+        job["output"] = result.stdout.decode(errors="replace")
+    except FileNotFoundError as e:
+        job["returncode"] = 127
+        job["output"] = str(e)
+    job["duration"] = time.time() - start
+    return job
+
+def _merge_junit(jobs, junit_file):
+    """
+    Fusionne les résultats des suites dans un unique rapport JUnit XML.
+    """
+    import xml.etree.ElementTree as ET
+
+    root = ET.Element("testsuites")
+    totals = {"tests": 0, "failures": 0, "errors": 0, "skipped": 0}
+    for job in jobs:
+        suites = []
+        if job.get("junit") and os.path.exists(job["junit"]):
+            try:
+                parsed = ET.parse(job["junit"]).getroot()
+                suites = [parsed] if parsed.tag == "testsuite" else list(parsed.iter("testsuite"))
+            except ET.ParseError:
+                suites = []
+            os.remove(job["junit"])
+        if not suites:
+            suite = ET.Element("testsuite", tests="1", failures="0" if job["returncode"] == 0 else "1", errors="0", skipped="0")
+            case = ET.SubElement(suite, "testcase", classname=job["kind"], name=job["name"], time=f"{job['duration']:.3f}")
+            if job["returncode"] != 0:
+                failure = ET.SubElement(case, "failure", message=f"code de sortie {job['returncode']}")
+                failure.text = job["output"][-20000:]
+            ET.SubElement(suite, "system-out").text = job["output"][-20000:]
+            suites = [suite]
+        for suite in suites:
+            suite.set("name", job["name"])
+            suite.set("time", f"{job['duration']:.3f}")
+            for k in totals:
+                totals[k] += int(suite.get(k, 0))
+            root.append(suite)
+    for k, v in totals.items():
+        root.set(k, str(v))
+    ET.ElementTree(root).write(junit_file, encoding="utf-8", xml_declaration=True)
+
+def run_tests(jobs=None, shards=1, junit_file=None, root=".", pytest_files=None, suite_names=None):
+    """
+    Lance en parallèle toutes les suites de tests détectées dans l'arborescence.
+
+    Args:
+        jobs (int, optional): Nombre maximal de suites exécutées simultanément (défaut: nb de CPU).
+        shards (int): Nombre de processus pytest entre lesquels répartir les fichiers de test.
+        junit_file (str, optional): Rapport JUnit XML fusionné (aucun rapport si absent).
+        root (str): Racine du projet.
+        pytest_files (list, optional): Restreint pytest à ces fichiers (sélection par impact).
+        suite_names (set, optional): Restreint l'exécution à ces suites.
+
+    Returns:
+        int: 0 si toutes les suites passent, 1 sinon.
+    """
+    import tempfile
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
+    suites, detected_files = detect_test_suites(root)
+    if pytest_files is not None:
+        detected_files = pytest_files
+    if not suites:
+        log("❌ Aucun système de test détecté.", "error", Fore.RED)
+        return 1
+    if suite_names is not None:
+        suites = [suite for suite in suites if suite["name"] in suite_names]
+        if not suites:
+            log("✅ Aucun test impacté par les modifications.", "info", Fore.GREEN)
+            return 0
+
+    tmp_dir = tempfile.mkdtemp(prefix="dkprun_junit_")
+    pytest_cmd = ["pytest"] if find_tool("pytest") else [sys.executable, "-m", "pytest"]
+    test_jobs = []
+    for suite in suites:
+        if suite["kind"] != "pytest":
+            test_jobs.append(dict(suite))
+            continue
+        groups = _shard_files(detected_files, shards) if detected_files else [[]]
+        for i, group in enumerate(groups):
+            junit = os.path.join(tmp_dir, f"pytest_{i}.xml") if junit_file else None
+            name = "pytest" if len(groups) == 1 else f"pytest[{i + 1}/{len(groups)}]"
+            files = [os.path.abspath(f) for f in group]
+            test_jobs.append({"name": name, "kind": "pytest", "cwd": root, "junit": junit,
+                              "cmd": pytest_cmd + ["-q"] + ([f"--junitxml={junit}"] if junit else []) + files})
+
+    workers = jobs or os.cpu_count() or 1
+    log(f"🧪 Lancement de {len(test_jobs)} suite(s) de tests ({workers} en parallèle)...", "info", Fore.MAGENTA)
+    start = time.time()
+    done = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_run_test_job, job) for job in test_jobs]
+        for future in as_completed(futures):
+            job = future.result()
+            done.append(job)
+            ok = job["returncode"] == 0
+            log(f"{'✅' if ok else '❌'} {job['name']} ({job['duration']:.2f}s)", "info" if ok else "error", Fore.GREEN if ok else Fore.RED)
+            if not ok:
+                print(job["output"][-4000:])
+    if junit_file:
+        _merge_junit(test_jobs, junit_file)
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    print(f"\n{'Suite':<30} {'Durée':>8}  Statut")
+    print("─" * 48)
+    for job in test_jobs:
+        status = "OK" if job["returncode"] == 0 else f"ÉCHEC ({job['returncode']})"
+        print(f"{job['name']:<30} {job['duration']:>7.2f}s  {status}")
+    failed = [j for j in test_jobs if j["returncode"] != 0]
+    report = f" | Rapport JUnit : {junit_file}" if junit_file else ""
+    log(f"⏱️ Temps total : {time.time() - start:.2f}s{report}", "info", Fore.YELLOW)
+    return 1 if failed else 0
+
+def load_pipeline(path="dkprun.toml"):
+    """
+    Lit un fichier de tâches dkprun.toml.
+
+    Format : une table [steps.<nom>] par étape avec `run` (arguments dkprun, chaîne ou liste),
+    `deps` (étapes préalables), `inputs` / `outputs` (motifs glob relatifs au fichier).
+    Une clé `default` au premier niveau désigne la cible par défaut.
+
+    Returns:
+        dict | None: {"root", "default", "steps"} ou None si le fichier est invalide.
+    """
+    import shlex
+
+    try:
+        import tomllib
+    except ImportError:
+        try:
+            import tomli as tomllib
+        except ImportError:
+            log("❌ Lecture TOML impossible : Python 3.11+ ou le paquet tomli est requis (pip install tomli).", "error", Fore.RED)
+            return None
+    try:
+        with open(path, "rb") as f:
+            data = tomllib.load(f)
+    except FileNotFoundError:
+        log(f"❌ Fichier de tâches introuvable : {path}", "error", Fore.RED)
+        return None
+    except tomllib.TOMLDecodeError as e:
+        log(f"❌ {path} invalide : {e}", "error", Fore.RED)
+        return None
+    steps = {}
+    for name, step in data.get("steps", {}).items():
+        run = step.get("run", [])
+        steps[name] = {
+            "run": shlex.split(run) if isinstance(run, str) else [str(a) for a in run],
+            "deps": list(step.get("deps", [])),
+            "inputs": list(step.get("inputs", [])),
+            "outputs": list(step.get("outputs", [])),
+        }
+    for name, step in steps.items():
+        unknown = [d for d in step["deps"] if d not in steps]
+        if unknown:
+            log(f"❌ Étape '{name}' : dépendance(s) inconnue(s) {', '.join(unknown)}", "error", Fore.RED)
+            return None
+    return {"root": os.path.dirname(os.path.abspath(path)), "default": data.get("default"), "steps": steps}
+
+def _pipeline_order(steps, targets):
+    # Étapes nécessaires aux cibles, dans un ordre topologique (détecte les cycles)
+    order, state = [], {}
+
+    def visit(name, chain):
+        if state.get(name) == "done":
+            return
+        if state.get(name) == "visiting":
+            raise ValueError(" → ".join(chain + [name]))
+        state[name] = "visiting"
+        for dep in steps[name]["deps"]:
+            visit(dep, chain + [name])
+        state[name] = "done"
+        order.append(name)
+
+    for target in targets:
+        visit(target, [])
+    return order
+
+def _expand_patterns(root, patterns):
+    import glob
+
+    files = set()
+    for pattern in patterns:
+        for path in glob.glob(os.path.join(root, pattern), recursive=True):
+            if os.path.isdir(path):
+                for dirpath, dirnames, filenames in os.walk(path):
+                    dirnames[:] = [d for d in dirnames if d not in TEST_SKIP_DIRS]
+                    files.update(os.path.join(dirpath, f) for f in filenames)
+            elif os.path.isfile(path):
+                files.add(path)
+    return sorted(files)
+
+def _step_key(root, name, step, dep_keys):
+    import hashlib
+    import json
+
+    digest = hashlib.sha256(json.dumps([name, step, dep_keys], sort_keys=True).encode())
+    for path in _expand_patterns(root, step["inputs"]):
+        digest.update(os.path.relpath(path, root).encode() + b"\0")
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+    return digest.hexdigest()
+
+def run_pipeline(target=None, path="dkprun.toml", jobs=None, force=False):
+    """
+    Exécute une cible du fichier de tâches et ses dépendances, en parallèle quand c'est possible.
+
+    Chaque étape lance `dkprun <run...>` dans un processus séparé. Une étape déclarant des `inputs`
+    est sautée si l'empreinte de ses entrées, de sa définition et de ses dépendances n'a pas changé
+    depuis sa dernière réussite et que ses `outputs` existent (cache .dkprun/pipeline-cache.json).
+    Un échec annule les étapes qui en dépendent ; les branches indépendantes continuent.
+
+    Args:
+        target (str, optional): Étape cible (défaut: `default` du fichier, sinon toutes les étapes).
+        path (str): Fichier de tâches.
+        jobs (int, optional): Étapes simultanées (défaut: nombre de CPU).
+        force (bool): Ignore le cache.
+
+    Returns:
+        int: 0 si toutes les étapes ont réussi, 1 sinon.
+    """
+    import json
+    from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+    pipeline = load_pipeline(path)
+    if pipeline is None:
+        return 1
+    root, steps = pipeline["root"], pipeline["steps"]
+    target = target or pipeline["default"]
+    if target is not None and target not in steps:
+        log(f"❌ Étape inconnue : {target} (disponibles : {', '.join(steps)})", "error", Fore.RED)
+        return 1
+    try:
+        order = _pipeline_order(steps, [target] if target else list(steps))
+    except ValueError as e:
+        log(f"❌ Cycle dans les dépendances : {e}", "error", Fore.RED)
+        return 1
+
+    cache_file = os.path.join(root, ".dkprun", "pipeline-cache.json")
+    try:
+        with open(cache_file) as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        cache = {}
+    keys, results = {}, {}
+    script = os.path.abspath(__file__)
+
+    def run_step(name):
+        step = steps[name]
+        start = time.time()
+        proc = subprocess.run([sys.executable, script] + step["run"], cwd=root, stdout=subprocess.PIPE,
+                              stderr=subprocess.STDOUT, stdin=subprocess.DEVNULL)
+        return name, proc.returncode, proc.stdout.decode(errors="replace"), time.time() - start
+
+    log(f"🧩 Pipeline {target or '(toutes les étapes)'} : {len(order)} étape(s)", "info", Fore.CYAN)
+    start = time.time()
+    pending = list(order)
+    running = {}
+    with ThreadPoolExecutor(max_workers=jobs or os.cpu_count() or 1) as pool:
+        while pending or running:
+            for name in list(pending):
+                deps = steps[name]["deps"]
+                if any(results.get(d, ("",))[0] in ("échec", "annulé") for d in deps):
+                    results[name] = ("annulé", 0.0)
+                    pending.remove(name)
+                    log(f"⏭️ {name} annulé (dépendance en échec)", "warning", Fore.YELLOW)
+                    continue
+                if not all(d in results for d in deps):
+                    continue
+                pending.remove(name)
+                step = steps[name]
+                if step["inputs"]:
+                    keys[name] = _step_key(root, name, step, [keys.get(d) for d in deps])
+                    outputs_ok = all(_expand_patterns(root, [o]) for o in step["outputs"])
+                    if not force and cache.get(name) == keys[name] and outputs_ok:
+                        results[name] = ("cache", 0.0)
+                        log(f"💾 {name} : entrées inchangées, étape sautée", "info", Fore.CYAN)
+                        continue
+                else:
+                    keys[name] = f"run-{time.time()}"
+                log(f"▶️ {name} : dkprun {' '.join(step['run'])}", "info", Fore.CYAN)
+                running[pool.submit(run_step, name)] = name
+            if not running:
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                running.pop(future)
+                name, returncode, output, duration = future.result()
+                ok = returncode == 0
+                results[name] = ("ok" if ok else "échec", duration)
+                log(f"── {name} ({'ok' if ok else f'code {returncode}'}, {duration:.2f}s)", "info", Fore.GREEN if ok else Fore.RED)
+                if output.strip():
+                    log(output.rstrip("\n"), "info")
+                if ok and steps[name]["inputs"]:
+                    cache[name] = keys[name]
+                else:
+                    cache.pop(name, None)
+
+    os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+    with open(cache_file, "w") as f:
+        json.dump(cache, f, indent=1)
+
+    log(f"\n{'Étape':<24} {'Statut':<8} {'Durée':>9}", "info", Fore.CYAN)
+    colors = {"ok": Fore.GREEN, "cache": Fore.CYAN, "échec": Fore.RED, "annulé": Fore.YELLOW}
+    for name in order:
+        status, duration = results[name]
+        log(f"{name:<24} {status:<8} {duration:>8.2f}s", "info", colors[status])
+    failed = sum(1 for status, _ in results.values() if status in ("échec", "annulé"))
+    log(f"Total : {time.time() - start:.2f}s", "info", Fore.GREEN if not failed else Fore.RED)
+    return 1 if failed else 0
+
+def find_git_repos(root=".", max_depth=4):
+    """
+    Liste les dépôts Git sous `root` (sans descendre dans un dépôt trouvé).
+
+    Si `root` est lui-même à l'intérieur d'un dépôt, retourne la racine de ce dépôt.
+    """
+    root = os.path.abspath(root)
+    repos = []
+    base_depth = root.rstrip(os.sep).count(os.sep)
+    for dirpath, dirnames, filenames in os.walk(root):
+        if ".git" in dirnames or ".git" in filenames:
+            repos.append(dirpath)
+            dirnames[:] = []
+            continue
+        if dirpath.count(os.sep) - base_depth >= max_depth:
+            dirnames[:] = []
+            continue
+        dirnames[:] = sorted(d for d in dirnames if d not in TEST_SKIP_DIRS)
+    if not repos:
+        top = subprocess.run(["git", "-C", root, "rev-parse", "--show-toplevel"], capture_output=True, text=True)
+        if top.returncode == 0:
+            repos.append(os.path.abspath(top.stdout.strip()))
+    return repos
+
+def repo_status(path):
+    """
+    Lit l'état d'un dépôt via `git status --porcelain=v2 --branch -z`.
+
+    Returns:
+        dict: {"path", "branch", "upstream", "ahead", "behind", "staged", "modified",
+               "untracked", "conflicts", "changed" (chemins à indexer), "error"}
+    """
+    info = {"path": path, "branch": "?", "upstream": None, "ahead": 0, "behind": 0, "staged": 0,
+            "modified": 0, "untracked": 0, "conflicts": 0, "changed": [], "error": None}
+    proc = subprocess.run(["git", "-C", path, "status", "--porcelain=v2", "--branch", "-z"], capture_output=True)
+    if proc.returncode != 0:
+        info["error"] = proc.stderr.decode(errors="replace").strip() or f"code {proc.returncode}"
+        return info
+    entries = iter(proc.stdout.decode(errors="surrogateescape").split("\0"))
+    for entry in entries:
+        if entry.startswith("# branch.head "):
+            info["branch"] = entry[14:]
+        elif entry.startswith("# branch.upstream "):
+            info["upstream"] = entry[18:]
+        elif entry.startswith("# branch.ab "):
+            ahead, behind = entry[12:].split()
+            info["ahead"], info["behind"] = int(ahead), -int(behind)
+        elif entry.startswith(("1 ", "2 ", "u ")):
+            fields = entry.split(" ", {"1": 8, "2": 9, "u": 10}[entry[0]])
+            xy = fields[1]
+            if entry[0] == "u":
+                info["conflicts"] += 1
+            else:
+                info["staged"] += xy[0] != "."
+                info["modified"] += xy[1] != "."
+            info["changed"].append(fields[-1])
+            if entry[0] == "2":
+                # Renommage (déjà indexé) : le chemin d'origine suit dans l'entrée NUL suivante
+                next(entries, None)
+        elif entry.startswith("? "):
+            info["untracked"] += 1
+            info["changed"].append(entry[2:])
+    return info
+
+def _repo_label(path, root):
+    rel = os.path.relpath(path, root)
+    return os.path.basename(path) if rel.startswith("..") or rel == "." else rel
+
+def git_status(root=".", jobs=None):
+    """
+    Affiche l'état de tous les dépôts Git sous `root`, interrogés en parallèle, dans un tableau.
+
+    Returns:
+        int: 0 si tous les dépôts ont pu être lus, 1 sinon.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    if find_tool("git") is None:
+        log("❌ Git n'est pas installé.", "error", Fore.RED)
+        return 1
+    repos = find_git_repos(root)
+    if not repos:
+        log(f"❌ Aucun dépôt Git trouvé sous {os.path.abspath(root)}", "error", Fore.RED)
+        return 1
+    start = time.time()
+    with ThreadPoolExecutor(max_workers=jobs or min(32, (os.cpu_count() or 1) * 4)) as pool:
+        statuses = list(pool.map(repo_status, repos))
+
+    root = os.path.abspath(root)
+    width = max(12, max(len(_repo_label(st["path"], root)) for st in statuses))
+    log(f"{'Dépôt':<{width}} {'Branche':<20} {'↑':>3} {'↓':>3} {'Indexés':>8} {'Modifiés':>9} {'Non suivis':>11} {'Conflits':>9}", "info", Fore.CYAN)
+    for st in statuses:
+        label = _repo_label(st["path"], root)
+        if st["error"]:
+            log(f"{label:<{width}} ❌ {st['error']}", "error", Fore.RED)
+            continue
+        dirty = st["staged"] or st["modified"] or st["untracked"] or st["conflicts"]
+        color = Fore.RED if st["conflicts"] else (Fore.YELLOW if dirty or st["ahead"] or st["behind"] else Fore.GREEN)
+        log(f"{label:<{width}} {st['branch'][:20]:<20} {st['ahead']:>3} {st['behind']:>3} {st['staged']:>8} "
+            f"{st['modified']:>9} {st['untracked']:>11} {st['conflicts']:>9}", "info", color)
+    clean = sum(1 for st in statuses if not st["error"] and not st["changed"])
+    log(f"{len(statuses)} dépôt(s), {clean} propre(s) — {time.time() - start:.2f}s", "info", Fore.CYAN)
+    return 1 if any(st["error"] for st in statuses) else 0
+
+def _commit_repo(st, msg):
+    # Indexe uniquement les chemins modifiés (liste NUL sur stdin : pas de limite de ligne de commande)
+    add = subprocess.run(["git", "-C", st["path"], "--literal-pathspecs", "add", "-A", "--pathspec-from-file=-", "--pathspec-file-nul"],
+                         input="\0".join(st["changed"]).encode(errors="surrogateescape"), capture_output=True)
+    if add.returncode != 0:
+        return st["path"], add.returncode, add.stderr.decode(errors="replace").strip()
+    commit = subprocess.run(["git", "-C", st["path"], "commit", "-q", "-m", msg], capture_output=True, text=True)
+    return st["path"], commit.returncode, (commit.stderr or commit.stdout).strip()
+
+def git_commit(msg, root=".", jobs=None):
+    """
+    Commite, dans chaque dépôt Git modifié sous `root`, uniquement les chemins signalés par git status.
+
+    Returns:
+        int: 0 si tous les commits ont réussi (ou rien à commiter), 1 sinon.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    if find_tool("git") is None:
+        log("❌ Git n'est pas installé.", "error", Fore.RED)
+        return 1
+    repos = find_git_repos(root)
+    if not repos:
+        log(f"❌ Aucun dépôt Git trouvé sous {os.path.abspath(root)}", "error", Fore.RED)
+        return 1
+    workers = jobs or min(32, (os.cpu_count() or 1) * 4)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        statuses = list(pool.map(repo_status, repos))
+        dirty = [st for st in statuses if st["changed"] and not st["error"]]
+        results = list(pool.map(lambda st: _commit_repo(st, msg), dirty))
+
+    root = os.path.abspath(root)
+    failed = 0
+    for st in statuses:
+        if st["error"]:
+            failed += 1
+            log(f"❌ {_repo_label(st['path'], root)} : {st['error']}", "error", Fore.RED)
+    for path, returncode, output in results:
+        if returncode == 0:
+            log(f"✅ {_repo_label(path, root)} : commit effectué.", "info", Fore.GREEN)
+        else:
+            failed += 1
+            log(f"❌ {_repo_label(path, root)} : échec du commit (code {returncode})\n{output}", "error", Fore.RED)
+    if not dirty:
+        log("Rien à commiter.", "info", Fore.YELLOW)
+    return 1 if failed else 0
+
+def python_imports(filename):
+    """
+    Extrait les imports d'un fichier Python via l'AST.
+
+    Returns:
+        list: Tuples (niveau relatif, module, noms importés). Liste vide si le fichier est invalide.
+    """
+    try:
+        with open(filename, "r", encoding="utf-8") as f:
+            tree = ast.parse(f.read(), filename)
+    except (SyntaxError, UnicodeDecodeError, ValueError):
+        return []
+    imports = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            imports.extend((0, alias.name, []) for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            imports.append((node.level, node.module or "", [alias.name for alias in node.names]))
+    return imports
+
+def list_dependencies(filename):
+    ext_flag = None
+    for k in EXT_TO_COMMAND:
+        if filename.endswith(k.replace("-", ".")):
+            ext_flag = k
+            break
+    deps = set()
+    if ext_flag == "-py":
+        deps.update(module.split(".")[0] for level, module, _ in python_imports(filename) if level == 0 and module)
+    elif ext_flag == "-js":
+        with open(filename, "r", encoding="utf-8") as f:
+            code = f.read()
+        imports = set(re.findall(r'require\([\'"]([\w\-]+)[\'"]\)|import .* from [\'"]([\w\-]+)[\'"]', code))
+        for imp in imports:
+            deps.update([x for x in imp if x])
+    log(f"📦 Dépendances détectées : {', '.join(sorted(deps))}", "info", Fore.MAGENTA)
+
+def _module_names(rel_path):
+    """
+    Noms de modules possibles d'un fichier (a/b/c.py -> a.b.c, b.c, c) pour gérer les layouts src/.
+    """
+    parts = rel_path[:-3].replace(os.sep, "/").split("/")
+    if parts[-1] == "__init__":
+        parts = parts[:-1]
+    return [".".join(parts[i:]) for i in range(len(parts)) if parts[i:]]
+
+def build_import_graph(root="."):
+    """
+    Construit le graphe d'imports des fichiers Python du projet.
+
+    Les imports de chaque fichier sont mis en cache dans `.dkprun/import-graph.json`
+    (clé: date de modification et taille) pour ne réanalyser que les fichiers modifiés.
+
+    Returns:
+        dict: chemin absolu -> ensemble des chemins absolus du projet qu'il importe.
+    """
+    import json
+
+    root = os.path.abspath(root)
+    cache_file = os.path.join(root, ".dkprun", "import-graph.json")
+    try:
+        with open(cache_file, encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        cache = {}
+    new_cache = {}
+    files = []
+    for dirpath, dirs, names in os.walk(root):
+        dirs[:] = [d for d in dirs if d not in TEST_SKIP_DIRS and not d.startswith("build")]
+        files.extend(os.path.join(dirpath, n) for n in names if n.endswith(".py"))
+
+    modules = {}
+    for path in files:
+        for name in _module_names(os.path.relpath(path, root)):
+            modules.setdefault(name, set()).add(path)
+
+    graph = {}
+    for path in files:
+        rel = os.path.relpath(path, root)
+        st = os.stat(path)
+        entry = cache.get(rel)
+        if not entry or entry["mtime"] != st.st_mtime_ns or entry["size"] != st.st_size:
+            entry = {"mtime": st.st_mtime_ns, "size": st.st_size, "imports": python_imports(path)}
+        new_cache[rel] = entry
+        package = os.path.relpath(os.path.dirname(path), root).replace(os.sep, "/").split("/")
+        package = [] if package == ["."] else package
+        targets = set()
+        for level, module, names in entry["imports"]:
+            if level:
+                base = package[:len(package) - level + 1] if level <= len(package) + 1 else []
+                module = ".".join(base + ([module] if module else []))
+            candidates = [module] + [f"{module}.{n}" if module else n for n in names]
+            for candidate in candidates:
+                parts = candidate.split(".")
+                for i in range(1, len(parts) + 1):
+                    targets.update(modules.get(".".join(parts[:i]), ()))
+        targets.discard(path)
+        graph[path] = targets
+
+    try:
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        with open(cache_file, "w", encoding="utf-8") as f:
+            json.dump(new_cache, f)
+    except OSError:
+        pass
+    return graph
+
+def git_changed_files(base="HEAD", root="."):
+    """
+    Fichiers modifiés par rapport à `base` (commits, index, copie de travail et fichiers non suivis).
+
+    Returns:
+        set: Chemins absolus, ou None si git n'est pas utilisable.
+    """
+    if find_tool("git") is None:
+        return None
+    top = subprocess.run(["git", "-C", root, "rev-parse", "--show-toplevel"], capture_output=True, text=True)
+    if top.returncode != 0:
+        return None
+    top = top.stdout.strip()
+    changed = set()
+    for cmd in (["git", "diff", "--name-only", f"{base}...HEAD"],
+                ["git", "diff", "--name-only", "HEAD"],
+                ["git", "ls-files", "--others", "--exclude-standard"]):
+        result = subprocess.run(["git", "-C", top] + cmd[1:], capture_output=True, text=True)
+        if result.returncode != 0:
+            return None
+        changed.update(os.path.abspath(os.path.join(top, line)) for line in result.stdout.splitlines() if line)
+    return changed
+
+# Fichiers modifiés sans effet sur les tests (documentation)
+IMPACT_IGNORED_EXTS = {".md", ".rst", ".txt", ".png", ".jpg", ".svg"}
+
+def select_impacted_tests(base="HEAD", root=".", ignore=()):
+    """
+    Sélectionne les tests dont les imports transitifs touchent un fichier modifié.
+
+    Args:
+        base (str): Référence git de comparaison.
+        root (str): Racine du projet.
+        ignore (tuple): Fichiers générés à ne pas considérer comme modifications (ex: rapport JUnit).
+
+    Returns:
+        tuple: (fichiers pytest, noms des suites à lancer) ou (None, None) s'il faut tout relancer.
+    """
+    root = os.path.abspath(root)
+    changed = git_changed_files(base, root)
+    if changed is None:
+        log("⚠️ git indisponible ou référence invalide : exécution complète.", "warning", Fore.YELLOW)
+        return None, None
+    suites, test_files = detect_test_suites(root)
+    ignore = {os.path.abspath(p) for p in ignore}
+    relevant = set()
+    for path in changed - ignore:
+        rel_parts = os.path.relpath(path, root).split(os.sep)
+        if rel_parts[0] == ".." or any(p in TEST_SKIP_DIRS for p in rel_parts):
+            continue
+        name = os.path.basename(path)
+        ext = os.path.splitext(name)[1].lower()
+        if ext in IMPACT_IGNORED_EXTS and name != "requirements.txt":
+            continue
+        relevant.add(path)
+
+    graph = build_import_graph(root)
+    py_changed = {p for p in relevant if p.endswith(".py")}
+    for path in py_changed:
+        if os.path.basename(path) == "conftest.py" or (path not in graph and not os.path.exists(path)):
+            log(f"⚠️ {os.path.relpath(path, root)} : impact non déterminable, exécution complète.", "warning", Fore.YELLOW)
+            return None, None
+
+    reverse = {}
+    for src, targets in graph.items():
+        for target in targets:
+            reverse.setdefault(target, set()).add(src)
+    impacted = set(py_changed)
+    stack = list(py_changed)
+    while stack:
+        for importer in reverse.get(stack.pop(), ()):
+            if importer not in impacted:
+                impacted.add(importer)
+                stack.append(importer)
+    selected = [f for f in test_files if os.path.abspath(f) in impacted]
+
+    other_changed = relevant - py_changed
+    suite_names = set()
+    for suite in suites:
+        if suite["kind"] == "pytest":
+            if selected:
+                suite_names.add(suite["name"])
+            elif other_changed:
+                log("⚠️ Fichiers non Python modifiés : exécution complète de pytest.", "warning", Fore.YELLOW)
+                selected = test_files
+                suite_names.add(suite["name"])
+            continue
+        cwd = os.path.abspath(suite["cwd"])
+        if any(p == cwd or p.startswith(cwd + os.sep) for p in other_changed):
+            suite_names.add(suite["name"])
+    log(f"🎯 {len(changed)} fichier(s) modifié(s) depuis {base} → {len(selected)} fichier(s) de test pytest, {len(suite_names)} suite(s)", "info", Fore.CYAN)
+    return selected, suite_names
+
+def _path_under(path, target):
+    """
+    Vrai si `path` est `target` ou se trouve dans ce dossier (pas de simple préfixe de chaîne).
+    """
+    path = os.path.normcase(path)
+    return path == target or path.startswith(target.rstrip(os.sep) + os.sep)
+
+def _scan_pid_linux(pid):
+    """
+    Lit directement cwd, exe et les descripteurs ouverts d'un processus dans /proc.
+    """
+    base = f"/proc/{pid}"
+    paths = []
+    for link in ("cwd", "exe"):
+        try:
+            paths.append(os.readlink(f"{base}/{link}"))
+        except OSError:
+            pass
+    try:
+        for fd in os.listdir(f"{base}/fd"):
+            try:
+                target = os.readlink(f"{base}/fd/{fd}")
+            except OSError:
+                continue
+            if target.startswith("/"):
+                paths.append(target)
+    except OSError:
+        pass
+    return pid, paths
+
+def _scan_pid_psutil(pid):
+    paths = []
+    try:
+        proc = psutil.Process(pid)
+        for getter in (proc.cwd, proc.exe):
+            try:
+                paths.append(getter())
+            except Exception:
+                pass
+        try:
+            paths.extend(f.path for f in proc.open_files())
+        except Exception:
+            pass
+    except Exception:
+        pass
+    return pid, paths
+
+def _cleanup_run_groups(target, matched_pids, timeout):
+    """
+    Tue les groupes de processus laissés par des exécutions -r limitées (-timeout/-maxmem/-maxcpu)
+    lancées depuis `target` ou dont un membre utilise `target`.
+
+    Returns:
+        int: Nombre de groupes nettoyés.
+    """
+    import glob
+    import json
+    import signal
+
+    if os.name == "nt":
+        return 0
+    matched_groups = set()
+    for pid in matched_pids:
+        try:
+            matched_groups.add(os.getpgid(pid))
+        except OSError:
+            pass
+    cleaned = 0
+    for record_file in glob.glob(os.path.join(get_cache_dir("pgroups"), "*.json")):
+        try:
+            with open(record_file, encoding="utf-8") as f:
+                record = json.load(f)
+        except (OSError, ValueError):
+            continue
+        pgid = record["pgid"]
+        if not (pgid in matched_groups or _path_under(record["cwd"], target)
+                or any(_path_under(p, target) for p in record.get("paths", []))):
+            continue
+        try:
+            os.killpg(pgid, signal.SIGTERM)
+            deadline = time.time() + timeout
+            while _group_alive(pgid) and time.time() < deadline:
+                time.sleep(0.05)
+            if _group_alive(pgid):
+                print(f"{Fore.RED}[CloseAll] Kill forcé du groupe de processus {pgid}{Fore.RESET}")
+                os.killpg(pgid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        except PermissionError:
+            continue
+        print(f"{Fore.YELLOW}[CloseAll] Groupe de processus {pgid} ({' '.join(record['cmd'])}) nettoyé{Fore.RESET}")
+        os.remove(record_file)
+        cleaned += 1
+    return cleaned
+
+def closeall(target_path, timeout=3.0):
+    """
+    Termine les processus qui utilisent un dossier/fichier (cwd, exécutable ou fichier ouvert).
+
+    Sous Linux, /proc/<pid>/cwd, exe et fd/* sont lus en parallèle ; ailleurs psutil est utilisé.
+    Les processus reçoivent SIGTERM puis sont tués s'ils sont toujours vivants après `timeout`.
+    Les groupes de processus résiduels des exécutions -r limitées sont aussi nettoyés.
+
+    Args:
+        target_path (str): Chemin à libérer.
+        timeout (float): Délai accordé avant le kill forcé.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    target = os.path.normcase(os.path.abspath(target_path))
+    phases = {}
+    start = time.time()
+    own = {os.getpid(), os.getppid()}
+    if platform.system() == "Linux" and os.path.isdir("/proc"):
+        pids = [int(p) for p in os.listdir("/proc") if p.isdigit()]
+        scanner = _scan_pid_linux
+    else:
+        pids = psutil.pids()
+        scanner = _scan_pid_psutil
+    with ThreadPoolExecutor(max_workers=32) as pool:
+        matches = [pid for pid, paths in pool.map(scanner, [p for p in pids if p not in own])
+                   if any(_path_under(path, target) for path in paths)]
+    phases["scan"] = time.time() - start
+
+    procs = []
+    start = time.time()
+    for pid in matches:
+        try:
+            proc = psutil.Process(pid)
+            print(f"{Fore.YELLOW}[CloseAll] Arrêt du processus {proc.name()} (PID {pid}){Fore.RESET}")
+            proc.terminate()
+            procs.append(proc)
+        except Exception:
+            pass
+    _, alive = psutil.wait_procs(procs, timeout=timeout) if procs else ([], [])
+    phases["terminate"] = time.time() - start
+
+    start = time.time()
+    for proc in alive:
+        try:
+            print(f"{Fore.RED}[CloseAll] Kill forcé du processus PID {proc.pid}{Fore.RESET}")
+            proc.kill()
+        except Exception:
+            pass
+    if alive:
+        psutil.wait_procs(alive, timeout=timeout)
+    phases["kill"] = time.time() - start
+
+    start = time.time()
+    groups = _cleanup_run_groups(target, matches, timeout)
+    phases["groups"] = time.time() - start
+
+    if not procs and not groups:
+        print(f"{Fore.GREEN}[CloseAll] Aucun processus bloquant trouvé pour {target}{Fore.RESET}")
+    timings = " | ".join(f"{name} {duration:.3f}s" for name, duration in phases.items())
+    log(f"⏱️ [CloseAll] {len(pids)} processus analysés, {len(procs)} arrêté(s), {len(alive)} tué(s), {groups} groupe(s) nettoyé(s) — {timings}", "info", Fore.YELLOW)
+
+SPHINX_PHASES = [
+    (re.compile(r"^(Running Sphinx|loading |making output directory|building \[)"), "initialisation"),
+    (re.compile(r"^(updating environment|reading sources)"), "lecture des sources"),
+    (re.compile(r"^(looking for now-outdated|pickling environment|checking consistency)"), "environnement"),
+    (re.compile(r"^(preparing documents|copying assets)"), "ressources"),
+    (re.compile(r"^writing output\.\.\. \["), "écriture"),
+    (re.compile(r"^(generating indices|writing additional pages|dumping )"), "finalisation"),
+]
+
+def _sphinx_quickstart():
+    """
+    Initialise une doc Sphinx sans interaction (projet = dossier courant, auteur = git user.name).
+    """
+    import getpass
+
+    project = os.path.basename(os.getcwd()) or "projet"
+    author = ""
+    if find_tool("git"):
+        author = subprocess.run(["git", "config", "user.name"], capture_output=True, text=True).stdout.strip()
+    author = author or getpass.getuser()
+    cmd = ["sphinx-quickstart", "-q", "--no-sep", "-p", project, "-a", author, "-v", "0.1",
+           "--ext-autodoc", "--no-makefile", "--no-batchfile", "."]
+    log(f"🧱 Initialisation de la doc : {' '.join(cmd)}", "info", Fore.CYAN)
+    return subprocess.run(cmd, stdin=subprocess.DEVNULL).returncode == 0 and os.path.exists("conf.py")
+
+def gendoc(full=False, jobs="auto", builder="html"):
+    """
+    Génère la documentation Sphinx de façon incrémentale et parallèle.
+
+    L'environnement (doctrees) est conservé dans _build/.doctrees : seules les sources modifiées
+    sont relues. La sortie de sphinx-build est relayée en direct et le temps de chaque phase
+    (lecture, écriture, ...) est affiché à la fin.
+
+    Args:
+        full (bool): Reconstruit tout l'environnement (-E).
+        jobs (str): Nombre de processus Sphinx (-j), "auto" par défaut.
+        builder (str): Builder Sphinx (-b).
+
+    Returns:
+        int: Code de retour de sphinx-build.
+    """
+    if find_tool("sphinx-build") is None:
+        log("❌ sphinx-build introuvable. Installe Sphinx : pip install sphinx", "error", Fore.RED)
+        return 1
+    if os.path.exists("conf.py"):
+        log("🔎 conf.py trouvé, génération de la doc avec Sphinx...", "info", Fore.CYAN)
+    else:
+        log("⌛ Aucun conf.py Sphinx trouvé dans ce dossier : initialisation non interactive.", "info", Fore.CYAN)
+        if find_tool("sphinx-quickstart") is None or not _sphinx_quickstart():
+            log("❌ La génération de la doc a échoué ou a été annulée.", "error", Fore.RED)
+            return 1
+
+    cmd = ["sphinx-build", "-b", builder, "-j", str(jobs), "-d", os.path.join("_build", ".doctrees"), ".", "_build"]
+    if full:
+        cmd.insert(1, "-E")
+    flush_logs()
+    start = time.time()
+    phase, phase_start = "initialisation", start
+    timings = collections.OrderedDict()
+    summary = None
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1)
+    for line in proc.stdout:
+        sys.stdout.write(line)
+        text = line.strip()
+        if text.startswith("updating environment:"):
+            summary = text.split(":", 1)[1].strip()
+        for pattern, name in SPHINX_PHASES:
+            if name != phase and pattern.match(text):
+                now = time.time()
+                timings[phase] = timings.get(phase, 0.0) + now - phase_start
+                phase, phase_start = name, now
+                break
+    returncode = proc.wait()
+    end = time.time()
+    timings[phase] = timings.get(phase, 0.0) + end - phase_start
+
+    log("⏱️ Temps par phase :", "info", Fore.CYAN)
+    for name, seconds in timings.items():
+        log(f"   {name:<20} {seconds:7.2f}s", "info")
+    if summary:
+        log(f"   (environnement : {summary})", "info")
+    if returncode == 0:
+        log(f"✅ Documentation Sphinx générée dans ./_build en {end - start:.2f}s", "info", Fore.GREEN)
+    else:
+        log(f"❌ sphinx-build a échoué (code {returncode}).", "error", Fore.RED)
+    return returncode
+
+def update_dependencies():
+    if os.path.exists("requirements.txt"):
+        log("⬆️ Mise à jour des paquets pip...", "info", Fore.CYAN)
+        subprocess.run([sys.executable, "-m", "pip", "install", "--upgrade", "-r", "requirements.txt"])
+    elif os.path.exists("package.json"):
+        log("⬆️ Mise à jour des paquets npm...", "info", Fore.CYAN)
+        subprocess.run(["npm", "update"])
+    elif os.path.exists("composer.json"):
+        log("⬆️ Mise à jour des paquets composer...", "info", Fore.CYAN)
+        subprocess.run(["composer", "update"])
+    else:
+        log("❌ Aucun gestionnaire de dépendances détecté.", "error", Fore.RED)
+
+def fetch_url_cached(url, sha256=None, refresh=False):
+    """
+    Télécharge une URL dans le cache adressé par contenu de dkprun.
+
+    Les fichiers sont nommés d'après leur sha256 (aucune collision entre exécutions parallèles).
+    Les métadonnées par URL (ETag, Last-Modified) permettent une revalidation conditionnelle
+    (304 Not Modified) ; avec une empreinte épinglée déjà en cache, aucun accès réseau n'a lieu.
+
+    Args:
+        url (str): URL du fichier.
+        sha256 (str, optional): Empreinte attendue ; le téléchargement est refusé si elle diffère.
+        refresh (bool): Ignore la revalidation et retélécharge.
+
+    Returns:
+        str: Chemin du fichier en cache.
+    """
+    import hashlib
+    import json
+    import tempfile
+    import urllib.parse
+    import requests
+
+    cache_dir = get_cache_dir("urls")
+    ext = os.path.splitext(urllib.parse.urlparse(url).path)[1]
+    sha256 = sha256.lower() if sha256 else None
+    if sha256 and not refresh and os.path.exists(os.path.join(cache_dir, sha256 + ext)):
+        log(f"🗂️ Script épinglé déjà en cache ({sha256[:12]}…)", "info", Fore.CYAN)
+        return os.path.join(cache_dir, sha256 + ext)
+
+    meta_file = os.path.join(get_cache_dir("urls", "meta"), hashlib.sha256(url.encode()).hexdigest() + ".json")
+    meta = {}
+    if os.path.exists(meta_file):
+        try:
+            with open(meta_file, encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            meta = {}
+    cached_path = os.path.join(cache_dir, meta["sha256"] + ext) if meta.get("sha256") else None
+    if cached_path and not os.path.exists(cached_path):
+        cached_path = None
+
+    headers = {}
+    if cached_path and not refresh:
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+    try:
+        r = requests.get(url, headers=headers, stream=True, timeout=30)
+    except requests.RequestException as e:
+        if cached_path and (not sha256 or meta["sha256"] == sha256):
+            log(f"⚠️ Réseau indisponible ({e}), utilisation de la copie en cache.", "warning", Fore.YELLOW)
+            return cached_path
+        raise
+    with r:
+        if r.status_code == 304 and cached_path:
+            if sha256 and meta["sha256"] != sha256:
+                raise ValueError(f"empreinte sha256 inattendue : {meta['sha256']} (attendu {sha256})")
+            log(f"🗂️ Script inchangé (304), copie en cache utilisée : {cached_path}", "info", Fore.CYAN)
+            return cached_path
+        r.raise_for_status()
+        digest = hashlib.sha256()
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for chunk in r.iter_content(chunk_size=1 << 16):
+                    digest.update(chunk)
+                    f.write(chunk)
+            file_hash = digest.hexdigest()
+            if sha256 and file_hash != sha256:
+                raise ValueError(f"empreinte sha256 inattendue : {file_hash} (attendu {sha256})")
+            final_path = os.path.join(cache_dir, file_hash + ext)
+            os.replace(tmp_path, final_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        meta = {"url": url, "sha256": file_hash, "etag": r.headers.get("ETag"),
+                "last_modified": r.headers.get("Last-Modified"), "fetched": time.time()}
+    tmp_meta = f"{meta_file}.{os.getpid()}.tmp"
+    with open(tmp_meta, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    os.replace(tmp_meta, meta_file)
+    log(f"🌐 Script téléchargé depuis {url} ({file_hash[:12]}…)", "info", Fore.CYAN)
+    return final_path
+
+def run_url(url, sha256=None, refresh=False):
+    import urllib.parse
+
+    ext = os.path.splitext(urllib.parse.urlparse(url).path)[1]
+    try:
+        filename = fetch_url_cached(url, sha256, refresh)
+    except Exception as e:
+        log(f"❌ Erreur téléchargement/exécution : {e}", "error", Fore.RED)
+        return 1
+    return main(["-r", f"-{ext[1:]}", filename])
+
+# Noyaux persistants du mode interactif : une requête JSON {"code"} par ligne sur stdin,
+# une réponse JSON {"stdout", "stderr", "value", "error", "ms"} sur stdout, précédée du jeton
+# DKPRUN_KERNEL_TOKEN. Le reste de stdout (os.system, écritures directes sur le fd 1) est de la sortie.
+_PY_KERNEL = r'''
+import os, sys, io, json, time, traceback, contextlib
+proto_in, proto_out = sys.stdin, sys.stdout
+token = os.environ["DKPRUN_KERNEL_TOKEN"]
+sys.stdin = io.StringIO("")
+ns = {"__name__": "__main__", "__builtins__": __builtins__}
+for line in proto_in:
+    code = json.loads(line)["code"]
+    out, err = io.StringIO(), io.StringIO()
+    res = {"value": None, "error": None}
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+        try:
+            try:
+                compiled = compile(code, "<dkprun>", "eval")
+            except SyntaxError:
+                exec(compile(code, "<dkprun>", "exec"), ns)
+            else:
+                value = eval(compiled, ns)
+                if value is not None:
+                    ns["_"] = value
+                    res["value"] = repr(value)
+        except BaseException as e:
+            tb = e.__traceback__.tb_next if e.__traceback__ else None
+            res["error"] = "".join(traceback.format_exception(type(e), e, tb)).rstrip()
+    res.update(stdout=out.getvalue(), stderr=err.getvalue(), ms=(time.perf_counter() - start) * 1000)
+    proto_out.write(token + json.dumps(res) + "\n")
+    proto_out.flush()
+'''
+
+_JS_KERNEL = r'''
+const vm = require("vm"), readline = require("readline"), util = require("util"), fs = require("fs");
+const token = process.env.DKPRUN_KERNEL_TOKEN;
+// Ctrl+C relayé par dkprun : interrompt l'extrait en cours (breakOnSigint) sans tuer le noyau
+process.on("SIGINT", () => {});
+let buf = {stdout: "", stderr: ""};
+const capture = (stream) => (...args) => { buf[stream] += util.format(...args) + "\n"; };
+const fakeConsole = {log: capture("stdout"), info: capture("stdout"), debug: capture("stdout"),
+                     warn: capture("stderr"), error: capture("stderr")};
+const ctx = vm.createContext({require, process, Buffer, URL, console: fakeConsole, setTimeout, setInterval,
+                              clearTimeout, clearInterval, setImmediate, queueMicrotask});
+(async () => {
+  for await (const line of readline.createInterface({input: process.stdin})) {
+    const code = JSON.parse(line).code;
+    buf = {stdout: "", stderr: ""};
+    const res = {value: null, error: null};
+    const start = process.hrtime.bigint();
+    try {
+      let value = vm.runInContext(code, ctx, {filename: "<dkprun>", breakOnSigint: true});
+      if (value && typeof value.then === "function") value = await value;
+      if (value !== undefined) res.value = util.inspect(value);
+    } catch (e) {
+      res.error = String(e && e.stack ? e.stack.split("\n    at Script.runInContext")[0] : e);
+    }
+    res.stdout = buf.stdout;
+    res.stderr = buf.stderr;
+    res.ms = Number(process.hrtime.bigint() - start) / 1e6;
+    fs.writeSync(1, token + JSON.stringify(res) + "\n");
+  }
+})();
+'''
+
+_RB_KERNEL = r'''
+require "json"
+require "stringio"
+def self.__dkprun_binding; binding; end
+scope = __dkprun_binding
+token = ENV["DKPRUN_KERNEL_TOKEN"]
+$stdin = StringIO.new
+STDOUT.sync = true
+STDIN.each_line do |line|
+  code = JSON.parse(line)["code"]
+  out, err = StringIO.new, StringIO.new
+  res = {"value" => nil, "error" => nil}
+  start = Process.clock_gettime(Process::CLOCK_MONOTONIC)
+  $stdout, $stderr = out, err
+  begin
+    value = scope.eval(code, "<dkprun>")
+    res["value"] = value.inspect unless value.nil?
+  rescue Exception => e
+    res["error"] = "#{e.class}: #{e.message}"
+  ensure
+    $stdout, $stderr = STDOUT, STDERR
+  end
+  res["stdout"], res["stderr"] = out.string, err.string
+  res["ms"] = (Process.clock_gettime(Process::CLOCK_MONOTONIC) - start) * 1000
+  STDOUT.write(token + JSON.generate(res) + "\n")
+end
+'''
+
+# Langage -> (outil requis, commande de lancement du noyau)
+KERNELS = {
+    "py": ("python", lambda: [sys.executable, "-u", "-c", _PY_KERNEL]),
+    "js": ("node", lambda: ["node", "-e", _JS_KERNEL]),
+    "rb": ("ruby", lambda: ["ruby", "-e", _RB_KERNEL]),
+}
+
+class _Kernel:
+    # Processus interpréteur persistant : l'état (variables, imports) survit entre les extraits
+    def __init__(self, lang):
+        self.lang = lang
+        self.proc = None
+        self.token = None
+        self.pending = ""
+
+    def start(self):
+        import json
+        import secrets
+
+        tool, build_cmd = KERNELS[self.lang]
+        if self.lang != "py" and find_tool(tool) is None:
+            raise RuntimeError(f"{tool} n'est pas installé ou pas dans le PATH.")
+        start = time.perf_counter()
+        self.token = f"\x1edkprun-{secrets.token_hex(8)}\x1e"
+        # Session séparée : le Ctrl+C du terminal n'atteint pas le noyau, seul execute() le relaie
+        if os.name == "nt":
+            group = {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+        else:
+            group = {"start_new_session": True}
+        self.proc = subprocess.Popen(build_cmd(), stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                     text=True, encoding="utf-8", errors="replace", bufsize=1,
+                                     env=dict(os.environ, DKPRUN_KERNEL_TOKEN=self.token), **group)
+        # Un premier aller-retour attend que le noyau soit prêt avant de rendre la main
+        self.proc.stdin.write(json.dumps({"code": "1"}) + "\n")
+        self.proc.stdin.flush()
+        if self._read_reply()[1] is None:
+            raise RuntimeError(f"le noyau {self.lang} n'a pas démarré (code {self.proc.wait()}).")
+        log(f"🔥 Noyau {self.lang} démarré (pid {self.proc.pid}, {(time.perf_counter() - start) * 1000:.0f} ms)", "info", Fore.CYAN)
+
+    def execute(self, code):
+        import json
+        import signal
+
+        if self.proc is None or self.proc.poll() is not None:
+            self.start()
+        start = time.perf_counter()
+        self.proc.stdin.write(json.dumps({"code": code}) + "\n")
+        self.proc.stdin.flush()
+        while True:
+            try:
+                output, reply = self._read_reply()
+                break
+            except KeyboardInterrupt:
+                if os.name != "nt":
+                    self.proc.send_signal(signal.SIGINT)
+                else:
+                    self.proc.kill()
+        if reply is None:
+            returncode = self.proc.wait()
+            self.proc = None
+            return {"stdout": output, "stderr": "", "value": None, "ms": 0.0,
+                    "error": f"Noyau {self.lang} arrêté (code {returncode}) : l'état est perdu, il redémarrera au prochain extrait.",
+                    "roundtrip_ms": (time.perf_counter() - start) * 1000}
+        try:
+            result = json.loads(reply)
+        except ValueError:
+            result = {"stdout": "", "stderr": "", "value": None, "ms": 0.0, "error": f"Réponse illisible du noyau : {reply[:200]}"}
+        # Sortie écrite hors des flux capturés (sous-processus, fd 1) : affichée avant le reste
+        result["stdout"] = output + result.get("stdout", "")
+        result["roundtrip_ms"] = (time.perf_counter() - start) * 1000
+        return result
+
+    def _read_reply(self):
+        """
+        Lit stdout jusqu'à la réponse marquée par le jeton ; tout ce qui précède est de la sortie.
+
+        Returns:
+            tuple: (sortie accumulée, réponse JSON brute ou None si le noyau s'est arrêté)
+        """
+        while True:
+            line = self.proc.stdout.readline()
+            before, sep, reply = line.partition(self.token)
+            # Conservée dans self.pending : un Ctrl+C pendant la lecture ne perd rien
+            self.pending += before
+            if sep or not line:
+                output, self.pending = self.pending, ""
+                return output, reply if sep else None
+
+    def close(self):
+        if self.proc is not None and self.proc.poll() is None:
+            self.proc.stdin.close()
+            try:
+                self.proc.wait(timeout=2)
+            except subprocess.TimeoutExpired:
+                self.proc.kill()
+                self.proc.wait()
+        self.proc = None
+
+def _print_kernel_result(result):
+    flush_logs()
+    if result.get("stdout"):
+        print(result["stdout"], end="" if result["stdout"].endswith("\n") else "\n")
+    if result.get("stderr"):
+        log(result["stderr"].rstrip("\n"), "warning", Fore.YELLOW)
+    if result.get("value") is not None:
+        log(result["value"], "info", Fore.CYAN)
+    if result.get("error"):
+        log(result["error"], "error", Fore.RED)
+    log(f"⏱️ {result.get('ms', 0.0):.2f} ms (aller-retour {result['roundtrip_ms']:.2f} ms)", "info", Fore.MAGENTA)
+
+def interactive_mode():
+    """
+    Mode terminal interactif.
+
+    Une ligne normale est une commande dkprun. `:py`, `:js` ou `:rb` suivi d'un extrait l'exécute dans
+    un interpréteur persistant (variables conservées, démarrage unique) ; seul, le préfixe ouvre un bloc
+    multi-ligne terminé par une ligne vide. `:kernels` liste les noyaux, `:reset <lang>` en redémarre un.
+    """
+    log("Bienvenue en mode interactif ! (tape 'exit' pour quitter)", "info", Fore.CYAN)
+    log("Extraits : :py <code> | :js <code> | :rb <code> (seul = bloc multi-ligne), :kernels, :reset <lang>", "info", Fore.CYAN)
+    kernels = {}
+    try:
+        while True:
+            try:
+                flush_logs()
+                cmd = input("> ")
+                if cmd.strip().lower() == "exit":
+                    break
+                if not cmd.strip().startswith(":"):
+                    main(cmd.strip().split())
+                    continue
+                head, _, code = cmd.strip().partition(" ")
+                lang = head[1:]
+                if lang == "kernels":
+                    for name, kernel in kernels.items():
+                        state = f"pid {kernel.proc.pid}" if kernel.proc is not None and kernel.proc.poll() is None else "arrêté"
+                        log(f"  {name} : {state}", "info")
+                elif lang == "reset":
+                    if code.strip() in kernels:
+                        kernels.pop(code.strip()).close()
+                        log(f"♻️ Noyau {code.strip()} réinitialisé.", "info", Fore.YELLOW)
+                elif lang in KERNELS:
+                    if not code:
+                        lines = []
+                        while True:
+                            line = input("... ")
+                            if not line.strip():
+                                break
+                            lines.append(line)
+                        code = "\n".join(lines)
+                    try:
+                        result = kernels.setdefault(lang, _Kernel(lang)).execute(code)
+                    except RuntimeError as e:
+                        log(f"❌ {e}", "error", Fore.RED)
+                        continue
+                    _print_kernel_result(result)
+                else:
+                    log(f"❌ Préfixe inconnu : {head} (:py, :js, :rb, :kernels, :reset)", "error", Fore.RED)
+            except KeyboardInterrupt:
+                print()
+                break
+            except EOFError:
+                break
+    finally:
+        for kernel in kernels.values():
+            kernel.close()
+
+def profile_execution(cmd_fn, *args, **kwargs):
+    import tracemalloc
+    tracemalloc.start()
+    start = time.time()
+    result = cmd_fn(*args, **kwargs)
+    end = time.time()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    log(f"⏱️ Temps d’exécution : {end - start:.3f}s | Mémoire max : {peak / 1024:.1f} Ko", "info", Fore.YELLOW)
+    return result
+
+class _RingBuffer:
+    """
+    Conserve en mémoire les `limit` derniers octets d'un flux.
+    """
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.chunks = collections.deque()
+        self.size = 0
+
+    def append(self, chunk):
+        self.chunks.append(chunk)
+        self.size += len(chunk)
+        while self.size > self.limit and self.chunks:
+            excess = self.size - self.limit
+            if len(self.chunks[0]) <= excess:
+                self.size -= len(self.chunks.popleft())
+            else:
+                self.chunks[0] = self.chunks[0][excess:]
+                self.size -= excess
+
+    def getvalue(self):
+        return b"".join(self.chunks)
+
+# Taille maximale d'une ligne en attente de son \n : au-delà, elle est journalisée par segments
+PARTIAL_LINE_MAX = 64 * 1024
+
+def _capture_streams(proc, log_path, ring_bytes):
+    """
+    Relaie stdout/stderr du processus vers le terminal tout en les journalisant.
+
+    Les lectures sont non bloquantes (selectors) sous POSIX et passent par un thread par flux
+    sous Windows. Chaque ligne est horodatée dans le journal (une sortie sans saut de ligne l'est par
+    segments de PARTIAL_LINE_MAX octets) ; les `ring_bytes` derniers octets sont conservés en
+    mémoire pour les rapports d'erreur.
+
+    Returns:
+        bytes: Fin de la sortie (stdout et stderr entrelacés).
+    """
+    import threading
+
+    ring = _RingBuffer(ring_bytes)
+    partial = {"out": bytearray(), "err": bytearray()}
+    clock = {"second": None, "text": ""}
+    terminals = {"out": sys.stdout.buffer, "err": sys.stderr.buffer}
+    lock = threading.Lock()
+
+    with open(log_path, "wb", buffering=1 << 20) as log_file:
+        def handle(tag, chunk):
+            terminals[tag].write(chunk)
+            terminals[tag].flush()
+            now = time.time()
+            second = int(now)
+            if second != clock["second"]:
+                clock["second"], clock["text"] = second, time.strftime("%H:%M:%S", time.localtime(second))
+            prefix = f"{clock['text']}.{int((now - second) * 1000):03d} [{tag}] ".encode()
+            with lock:
+                ring.append(chunk)
+                pending = partial[tag]
+                end = chunk.rfind(b"\n")
+                if end >= 0:
+                    lines = bytes(pending) + chunk[:end]
+                    pending[:] = chunk[end + 1:]
+                    log_file.write(prefix + lines.replace(b"\n", b"\n" + prefix) + b"\n")
+                else:
+                    pending += chunk
+                if len(pending) >= PARTIAL_LINE_MAX:
+                    # Sortie sans fin de ligne : écrite telle quelle plutôt qu'accumulée sans limite
+                    log_file.write(prefix + pending + b"\n")
+                    pending.clear()
+
+        if os.name != "nt":
+            import selectors
+
+            sel = selectors.DefaultSelector()
+            for tag, pipe in (("out", proc.stdout), ("err", proc.stderr)):
+                os.set_blocking(pipe.fileno(), False)
+                sel.register(pipe, selectors.EVENT_READ, tag)
+            drain_deadline = None
+            while sel.get_map():
+                # Une fois le processus terminé, on vide les tubes (0.5s max) sans attendre
+                # d'éventuels petits-enfants qui les garderaient ouverts.
+                if drain_deadline is None and proc.poll() is not None:
+                    drain_deadline = time.time() + 0.5
+                events = sel.select(0 if drain_deadline else 0.2)
+                if drain_deadline and (not events or time.time() > drain_deadline):
+                    break
+                for key, _ in events:
+                    try:
+                        chunk = os.read(key.fileobj.fileno(), 1 << 16)
+                    except BlockingIOError:
+                        continue
+                    if chunk:
+                        handle(key.data, chunk)
+                    else:
+                        sel.unregister(key.fileobj)
+            sel.close()
+        else:
+            def pump(tag, pipe):
+                for chunk in iter(lambda: pipe.read1(1 << 16), b""):
+                    handle(tag, chunk)
+
+            threads = [threading.Thread(target=pump, args=(tag, pipe), daemon=True)
+                       for tag, pipe in (("out", proc.stdout), ("err", proc.stderr))]
+            for t in threads:
+                t.start()
+            proc.wait()
+            for t in threads:
+                t.join(timeout=1.0)
+        stamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]
+        for tag, rest in partial.items():
+            if rest:
+                log_file.write(f"{stamp} [{tag}] ".encode() + rest + b"\n")
+    return ring.getvalue()
+
+def _limits_preexec(limits):
+    """
+    Fonction exécutée dans l'enfant (POSIX) avant exec pour appliquer les limites de ressources.
+    """
+    def apply():
+        import resource
+
+        if limits.get("maxmem"):
+            nbytes = int(limits["maxmem"] * 1024 * 1024)
+            resource.setrlimit(resource.RLIMIT_AS, (nbytes, nbytes))
+        if limits.get("maxcpu"):
+            seconds = int(limits["maxcpu"])
+            # Limite douce : SIGXCPU ; limite dure une seconde plus tard : SIGKILL
+            resource.setrlimit(resource.RLIMIT_CPU, (seconds, seconds + 1))
+    return apply
+
+def _kill_process_group(proc, grace=3.0):
+    """
+    Termine tout le groupe de processus d'une exécution (SIGTERM puis SIGKILL après `grace`).
+    """
+    import signal
+
+    if os.name == "nt":
+        try:
+            for child in psutil.Process(proc.pid).children(recursive=True):
+                child.kill()
+        except Exception:
+            pass
+        proc.kill()
+        return
+    try:
+        os.killpg(proc.pid, signal.SIGTERM)
+    except ProcessLookupError:
+        return
+    try:
+        proc.wait(grace)
+    except subprocess.TimeoutExpired:
+        pass
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+
+def _run_group_file(pgid):
+    return os.path.join(get_cache_dir("pgroups"), f"{pgid}.json")
+
+def _record_run_group(proc, cmd, cwd):
+    """
+    Mémorise le groupe de processus d'une exécution limitée pour que -closeall puisse le nettoyer.
+    """
+    import json
+
+    with open(_run_group_file(proc.pid), "w", encoding="utf-8") as f:
+        json.dump({"pgid": proc.pid, "cmd": cmd, "cwd": os.path.abspath(cwd or os.getcwd()),
+                   "paths": [os.path.abspath(c) for c in cmd if os.path.exists(c)], "started": time.time()}, f)
+
+def _group_alive(pgid):
+    """
+    Vrai si le groupe de processus contient encore un processus vivant (zombies exclus sous Linux).
+    """
+    try:
+        os.killpg(pgid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    if not os.path.isdir("/proc"):
+        return True
+    for pid in os.listdir("/proc"):
+        if not pid.isdigit():
+            continue
+        try:
+            with open(f"/proc/{pid}/stat") as f:
+                fields = f.read().rpartition(")")[2].split()
+        except OSError:
+            continue
+        if int(fields[2]) == pgid and fields[0] != "Z":
+            return True
+    return False
+
+def _release_run_group(pgid):
+    """
+    Oublie le groupe s'il est vide ; sinon le signale comme résidu à nettoyer.
+    """
+    if not _group_alive(pgid):
+        try:
+            os.remove(_run_group_file(pgid))
+        except OSError:
+            pass
+        return
+    log(f"⚠️ Des processus du groupe {pgid} tournent encore (dkprun -closeall <dossier> pour les arrêter).", "warning", Fore.YELLOW)
+
+def run_command(cmd, capture_dir=None, ring_kb=64, name=None, cwd=None, limits=None, language=None):
+    """
+    Exécute une commande du moteur -r et retourne le résultat de l'exécution.
+
+    Sans `capture_dir`, le processus hérite simplement des E/S du terminal. Avec `capture_dir`,
+    la sortie est relayée en continu vers le terminal et un journal horodaté par exécution,
+    et les `ring_kb` derniers Ko sont gardés en mémoire pour le rapport d'erreur.
+
+    Avec `limits` ({"timeout", "maxmem", "maxcpu"}), l'enfant est lancé dans son propre groupe
+    de processus avec des rlimits (Linux/macOS) ; au-delà du timeout, tout le groupe est tué.
+
+    Args:
+        cmd (list): Commande à exécuter.
+        capture_dir (str, optional): Dossier des journaux d'exécution.
+        ring_kb (int): Taille du tampon mémoire de fin de sortie.
+        name (str, optional): Nom utilisé pour le journal (défaut: nom du fichier exécuté).
+        cwd (str, optional): Dossier de travail.
+        limits (dict, optional): timeout (s, temps réel), maxmem (Mo), maxcpu (s de CPU).
+        language (str, optional): Label des métriques dkprun_runs_total / dkprun_run_seconds
+            (défaut: nom de l'exécutable).
+
+    Returns:
+        dict: {"returncode", "duration", "log_file", "tail", "limits", "timed_out", "signal"}
+    """
+    import threading
+    import signal
+
+    limits = {k: v for k, v in (limits or {}).items() if v}
+    result = {"returncode": None, "duration": 0.0, "log_file": None, "tail": "",
+              "limits": limits, "timed_out": False, "signal": None}
+    popen_kwargs = {"cwd": cwd}
+    if limits and os.name != "nt":
+        popen_kwargs["start_new_session"] = True
+        if limits.get("maxmem") or limits.get("maxcpu"):
+            popen_kwargs["preexec_fn"] = _limits_preexec(limits)
+    elif limits.get("maxmem") or limits.get("maxcpu"):
+        log("⚠️ -maxmem/-maxcpu ne sont pas supportés sur ce système : seul -timeout est appliqué.", "warning", Fore.YELLOW)
+    if limits:
+        log("🔒 Limites : " + ", ".join(f"{k}={v}" for k, v in limits.items()), "info", Fore.CYAN)
+
+    flush_logs()
+    start = time.time()
+    proc = None
+    timer = None
+    try:
+        if capture_dir:
+            os.makedirs(capture_dir, exist_ok=True)
+            name = name or os.path.basename(next((c for c in cmd[1:] if os.path.exists(c)), cmd[0]))
+            safe_name = re.sub(r"[^\w.-]", "_", name)
+            log_path = os.path.join(capture_dir, f"{datetime.now():%Y%m%d_%H%M%S}_{safe_name}_{os.getpid()}.log")
+            # Sortie vers un tube : sans cela, un enfant Python bufferise par blocs et rien n'arrive en direct
+            env = dict(os.environ, PYTHONUNBUFFERED="1")
+            proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, env=env, **popen_kwargs)
+        else:
+            proc = subprocess.Popen(cmd, **popen_kwargs)
+        if popen_kwargs.get("start_new_session"):
+            _record_run_group(proc, cmd, cwd)
+        if limits.get("timeout"):
+            def expire():
+                result["timed_out"] = True
+                _kill_process_group(proc)
+            timer = threading.Timer(limits["timeout"], expire)
+            timer.daemon = True
+            timer.start()
+        if capture_dir:
+            tail = _capture_streams(proc, log_path, ring_kb * 1024)
+            result["log_file"] = log_path
+            result["tail"] = tail.decode(errors="replace")
+        result["returncode"] = proc.wait()
+    except FileNotFoundError as e:
+        log(f"❌ Exécutable introuvable : {e}", "error", Fore.RED)
+        result["returncode"] = 127
+    except KeyboardInterrupt:
+        if proc is not None and popen_kwargs.get("start_new_session"):
+            _kill_process_group(proc)
+        result["returncode"] = 130
+    finally:
+        if timer:
+            timer.cancel()
+            if timer.is_alive():
+                timer.join()
+        if proc is not None and popen_kwargs.get("start_new_session"):
+            _release_run_group(proc.pid)
+    result["duration"] = time.time() - start
+    if result["returncode"] is not None and result["returncode"] < 0:
+        result["signal"] = signal.Signals(-result["returncode"]).name
+    language = language or os.path.basename(cmd[0])
+    if result["timed_out"]:
+        status = "timeout"
+    elif result["signal"]:
+        status = "signal"
+    else:
+        status = "ok" if result["returncode"] == 0 else "error"
+    metric_inc("dkprun_runs_total", language=language, status=status)
+    metric_observe("dkprun_run_seconds", result["duration"], language=language)
+    if result["log_file"]:
+        log(f"📝 Journal d'exécution : {result['log_file']} ({result['duration']:.2f}s)", "info", Fore.CYAN)
+    if result["timed_out"]:
+        log(f"⛔ Timeout de {limits['timeout']}s dépassé : groupe de processus tué.", "error", Fore.RED)
+    elif result["signal"] and limits:
+        log(f"⛔ Processus arrêté par {result['signal']} (limite mémoire/CPU probablement atteinte).", "error", Fore.RED)
+    if result["returncode"] and result["tail"]:
+        log(f"❌ Code de sortie {result['returncode']} — fin de la sortie :\n{result['tail'][-2000:]}", "error", Fore.RED)
+    return result
+
+BENCH_EXTS = {
+    ".c": "-c",
+    ".cpp": "-cpp",
+    ".rs": "-rs",
+    ".go": "-go",
+    ".java": "-java",
+    ".js": "-js",
+    ".py": "-py",
+}
+
+BENCH_TOOLS = {
+    "-c": ["gcc"],
+    "-cpp": ["g++"],
+    "-rs": ["rustc"],
+    "-go": ["go"],
+    "-java": ["javac", "java"],
+    "-js": ["node"],
+    "-py": ["python"],
+}
+
+def prepare_run_command(filename, ext_flag, build_dir=None):
+    """
+    Prépare la compilation éventuelle et la commande d'exécution d'un fichier source.
+
+    Args:
+        filename (str): Fichier source.
+        ext_flag (str): Extension dkprun (-c, -cpp, -rs, -go, -java, ...).
+        build_dir (str, optional): Dossier des binaires produits (défaut: dossier du fichier).
+
+    Returns:
+        tuple: (commandes de compilation, commande d'exécution, artefact exécuté)
+    """
+    filename = os.path.abspath(filename)
+    build_dir = build_dir or os.path.dirname(filename)
+    base = os.path.splitext(os.path.basename(filename))[0]
+    exe = os.path.join(build_dir, base + (".exe" if os.name == "nt" else ""))
+    if ext_flag in ("-c", "-cpp"):
+        return [[EXT_TO_COMMAND[ext_flag], "-O2", filename, "-o", exe]], [exe], exe
+    if ext_flag == "-rs":
+        return [["rustc", "-O", filename, "-o", exe]], [exe], exe
+    if ext_flag == "-go":
+        return [["go", "build", "-o", exe, filename]], [exe], exe
+    if ext_flag == "-java":
+        return [["javac", "-d", build_dir, filename]], ["java", "-cp", build_dir, base], os.path.join(build_dir, base + ".class")
+    return [], [EXT_TO_COMMAND[ext_flag], filename], filename
+
+C_SOURCE_EXTS = {
+    "-c": (".c",),
+    "-cpp": (".cpp", ".cc", ".cxx", ".c"),
+}
+
+def _read_depfile(dep_path):
+    """
+    Lit un fichier de dépendances -MMD (syntaxe Make) et retourne les prérequis de la cible.
+    """
+    try:
+        with open(dep_path, encoding="utf-8", errors="replace") as f:
+            text = f.read().replace("\\\n", " ")
+    except OSError:
+        return None
+    # Seule la première règle compte (les suivantes viennent de -MP : en-têtes sans prérequis)
+    rule = text.split("\n", 1)[0]
+    _, sep, prereqs = rule.partition(": ")
+    if not sep:
+        return None
+    return [p.replace("\0", " ") for p in prereqs.replace("\\ ", "\0").split()]
+
+def _object_is_fresh(obj, dep_path):
+    if not os.path.exists(obj):
+        return False
+    deps = _read_depfile(dep_path)
+    if deps is None:
+        return False
+    obj_mtime = os.path.getmtime(obj)
+    for dep in deps:
+        try:
+            if os.path.getmtime(dep) > obj_mtime:
+                return False
+        except OSError:
+            return False
+    return True
+
+def build_c_project(root, ext_flag, jobs=None, output=None):
+    """
+    Compile un projet C/C++ multi-fichiers de façon incrémentale et parallèle.
+
+    Chaque source est compilée en objet dans .dkprun/build/<ext> avec -MMD : les fichiers .d
+    listent les en-têtes inclus, donc seule une source dont un prérequis a changé est recompilée.
+    L'édition des liens n'est refaite que si un objet a changé. Un changement de compilateur
+    (tool_fingerprint) ou de CFLAGS/CXXFLAGS/LDFLAGS invalide toute la construction.
+
+    Args:
+        root (str): Dossier du projet (ou un fichier source : son dossier est utilisé).
+        ext_flag (str): -c ou -cpp.
+        jobs (int, optional): Compilations simultanées (défaut: nombre de CPU).
+        output (str, optional): Exécutable produit (défaut: <root>/<nom du dossier>).
+
+    Returns:
+        str | None: Chemin absolu de l'exécutable, ou None en cas d'échec.
+    """
+    import json
+    import shlex
+    from concurrent.futures import ThreadPoolExecutor
+
+    root = os.path.abspath(root if os.path.isdir(root) else os.path.dirname(os.path.abspath(root)))
+    is_cpp = ext_flag == "-cpp"
+    linker = "g++" if is_cpp else "gcc"
+    sources = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d not in TEST_SKIP_DIRS and not d.startswith("."))
+        sources += [os.path.join(dirpath, f) for f in sorted(filenames) if f.endswith(C_SOURCE_EXTS[ext_flag])]
+    if not sources:
+        log(f"❌ Aucune source {'/'.join(C_SOURCE_EXTS[ext_flag])} trouvée dans {root}", "error", Fore.RED)
+        return None
+    for tool in {linker, "gcc"} if any(src.endswith(".c") for src in sources) else {linker}:
+        if find_tool(tool) is None:
+            log(f"❌ {tool} n'est pas installé ou pas dans le PATH.", "error", Fore.RED)
+            return None
+
+    build_dir = os.path.join(root, ".dkprun", "build", ext_flag[1:])
+    exe = os.path.abspath(output) if output else os.path.join(root, os.path.basename(root) + (".exe" if os.name == "nt" else ""))
+    includes = ["-I", root] + (["-I", os.path.join(root, "include")] if os.path.isdir(os.path.join(root, "include")) else [])
+    cflags = shlex.split(os.environ.get("CFLAGS", ""))
+    cxxflags = shlex.split(os.environ.get("CXXFLAGS", ""))
+    ldflags = shlex.split(os.environ.get("LDFLAGS", ""))
+
+    stamp_path = os.path.join(build_dir, "stamp.json")
+    stamp = {"compilers": {t: tool_fingerprint(t) for t in sorted({linker, "gcc"})},
+             "cflags": cflags, "cxxflags": cxxflags, "ldflags": ldflags, "includes": includes}
+    try:
+        with open(stamp_path) as f:
+            previous = json.load(f)
+    except (OSError, ValueError):
+        previous = {}
+    full_rebuild = {k: previous.get(k) for k in stamp} != stamp
+    if full_rebuild and previous:
+        log("♻️ Compilateur ou options modifiés : reconstruction complète.", "info", Fore.YELLOW)
+
+    objects, todo = [], []
+    for src in sources:
+        obj = os.path.join(build_dir, os.path.relpath(src, root) + ".o")
+        objects.append(obj)
+        if full_rebuild or not _object_is_fresh(obj, obj[:-2] + ".d"):
+            compiler, flags = ("gcc", cflags) if src.endswith(".c") else ("g++", cxxflags)
+            todo.append((src, [compiler, *flags, *includes, "-MMD", "-MP", "-c", src, "-o", obj]))
+
+    def compile_one(job):
+        src, cmd = job
+        os.makedirs(os.path.dirname(cmd[-1]), exist_ok=True)
+        start = time.time()
+        proc = subprocess.run(cmd, capture_output=True, text=True)
+        return src, proc, time.time() - start
+
+    start = time.time()
+    failed = False
+    if todo:
+        log(f"🔨 Compilation de {len(todo)}/{len(sources)} fichier(s) ({jobs or os.cpu_count()} en parallèle)...", "info", Fore.CYAN)
+        with ThreadPoolExecutor(max_workers=jobs or os.cpu_count() or 1) as pool:
+            for src, proc, duration in pool.map(compile_one, todo):
+                rel = os.path.relpath(src, root)
+                if proc.returncode != 0:
+                    failed = True
+                    log(f"❌ {rel}\n{proc.stderr.strip()}", "error", Fore.RED)
+                else:
+                    if proc.stderr.strip():
+                        log(f"⚠️ {rel}\n{proc.stderr.strip()}", "warning", Fore.YELLOW)
+                    log(f"   ✔ {rel} ({duration:.2f}s)", "debug")
+    if failed:
+        log("❌ Compilation échouée.", "error", Fore.RED)
+        return None
+
+    relink = bool(todo) or previous.get("objects") != objects or not os.path.exists(exe) \
+        or os.path.getmtime(exe) < max(os.path.getmtime(o) for o in objects)
+    if relink:
+        log(f"🔗 Édition des liens : {os.path.relpath(exe, root)}", "info", Fore.CYAN)
+        link = subprocess.run([linker, *objects, "-o", exe, *ldflags], capture_output=True, text=True)
+        if link.returncode != 0:
+            log(f"❌ Édition des liens échouée :\n{link.stderr.strip()}", "error", Fore.RED)
+            return None
+    stamp["objects"] = objects
+    os.makedirs(build_dir, exist_ok=True)
+    with open(stamp_path, "w") as f:
+        json.dump(stamp, f, indent=1)
+    if todo or relink:
+        log(f"✅ Build terminé en {time.time() - start:.2f}s ({len(todo)} recompilé(s), liens {'refaits' if relink else 'inchangés'}).",
+            "info", Fore.GREEN)
+    else:
+        log("✅ Tout est à jour.", "info", Fore.GREEN)
+    return exe
+
+def java_major_version():
+    """
+    Retourne la version majeure du JDK détecté (8, 11, 17, 21...) ou None.
+    """
+    info = discover_toolchains().get("java")
+    match = re.search(r'version "?(\d+)(?:\.(\d+))?', (info or {}).get("version") or "")
+    if not match:
+        return None
+    major = int(match.group(1))
+    return int(match.group(2) or 0) if major == 1 else major
+
+def run_java(filename, script_args=None, source_launch=False, run_opts=None):
+    """
+    Exécute un programme Java avec classes en cache et archive AppCDS (Class Data Sharing).
+
+    Le cache (java/<empreinte>) dépend du contenu des sources et des versions de javac/java :
+    - les classes compilées sont réutilisées tant qu'aucun source de l'arborescence du fichier
+      (sa racine de paquet, passée en -sourcepath à javac) n'a changé (javac sauté) ;
+    - la première exécution, sans option CDS, sert de référence à froid ; la deuxième crée une
+      archive CDS dynamique (-XX:ArchiveClassesAtExit, JDK 13+), les suivantes la chargent
+      (-XX:SharedArchiveFile) pour éviter le chargement des classes.
+    Avec `source_launch`, le fichier est lancé directement (`java Fichier.java`, JDK 11+) sans javac ;
+    l'archive couvre alors les classes du JDK et du compilateur intégré.
+    Les temps à froid et à chaud sont conservés et comparés après chaque exécution.
+
+    Args:
+        filename (str): Fichier .java.
+        script_args (list, optional): Arguments du programme.
+        source_launch (bool): Lancement direct du source.
+        run_opts (dict, optional): Options transmises à run_command (capture, limites...).
+
+    Returns:
+        int: Code de sortie.
+    """
+    import hashlib
+    import json
+
+    script_args = script_args or []
+    run_opts = run_opts or {}
+    major = java_major_version()
+    if source_launch and major is not None and major < 11:
+        log(f"❌ Le lancement direct d'un source nécessite Java 11+ (détecté : {major}).", "error", Fore.RED)
+        return 1
+    with open(filename, "rb") as f:
+        source = f.read()
+    package = re.search(rb"^\s*package\s+([\w.]+)\s*;", source, re.MULTILINE)
+    # javac compile aussi les sources voisins qu'il trouve dans le sourcepath : tous entrent dans l'empreinte
+    source_root = os.path.dirname(os.path.abspath(filename))
+    for _ in package.group(1).split(b".") if package else []:
+        source_root = os.path.dirname(source_root)
+    digest = hashlib.sha256(source)
+    if not source_launch:
+        for dirpath, dirnames, filenames in os.walk(source_root):
+            dirnames[:] = sorted(d for d in dirnames if d not in TEST_SKIP_DIRS and not d.startswith("."))
+            for name in sorted(n for n in filenames if n.endswith(".java")):
+                path = os.path.join(dirpath, name)
+                digest.update(os.path.relpath(path, source_root).encode() + b"\0")
+                with open(path, "rb") as f:
+                    digest.update(hashlib.sha256(f.read()).digest())
+    digest.update(f"{tool_fingerprint('javac')}|{tool_fingerprint('java')}|{source_launch}".encode())
+    cache_dir = get_cache_dir("java", digest.hexdigest()[:20])
+    classes_dir = os.path.join(cache_dir, "classes")
+    archive = os.path.join(cache_dir, "app.jsa")
+    stats_file = os.path.join(cache_dir, "stats.json")
+
+    if source_launch:
+        target = [os.path.abspath(filename)]
+    else:
+        stamp = os.path.join(classes_dir, ".compiled")
+        if os.path.exists(stamp):
+            log("💾 Classes en cache : compilation sautée.", "info", Fore.CYAN)
+        else:
+            log(f"🔨 Compilation : javac -d {classes_dir} -sourcepath {source_root} {filename}", "info", Fore.CYAN)
+            if subprocess.run(["javac", "-d", classes_dir, "-sourcepath", source_root, filename]).returncode != 0:
+                log("❌ Erreur lors de la compilation Java.", "error", Fore.RED)
+                return 1
+            open(stamp, "w").close()
+        classname = os.path.splitext(os.path.basename(filename))[0]
+        target = ["-cp", classes_dir, (package.group(1).decode() + "." if package else "") + classname]
+
+    try:
+        with open(stats_file) as f:
+            stats = json.load(f)
+    except (OSError, ValueError):
+        stats = {"cold": [], "warm": []}
+    cds_flags, phase = [], "sans CDS"
+    if major is None or major >= 13:
+        if os.path.exists(archive):
+            cds_flags, phase = [f"-XX:SharedArchiveFile={archive}"], "warm"
+        elif not stats["cold"]:
+            # Référence à froid sans option CDS : l'exécution qui écrit l'archive paie aussi son vidage
+            phase = "cold"
+            log("🧊 Première exécution : mesure de référence sans archive CDS.", "info", Fore.CYAN)
+        else:
+            cds_flags, phase = [f"-XX:ArchiveClassesAtExit={archive}"], "dump"
+            log("🧊 Création de l'archive CDS (non comptée dans les mesures).", "info", Fore.CYAN)
+    else:
+        log(f"⚠️ Archive CDS dynamique indisponible avant Java 13 (détecté : {major}).", "warning", Fore.YELLOW)
+
+    result = run_command(["java"] + cds_flags + target + script_args, **run_opts)
+    if phase == "dump" and result["returncode"] == 0 and not os.path.exists(archive):
+        log("⚠️ La JVM n'a pas produit d'archive CDS.", "warning", Fore.YELLOW)
+    if phase in ("cold", "warm") and result["returncode"] == 0:
+        stats[phase] = (stats[phase] + [round(result["duration"], 4)])[-20:]
+        with open(stats_file, "w") as f:
+            json.dump(stats, f)
+        if stats["cold"] and stats["warm"]:
+            cold = sum(stats["cold"]) / len(stats["cold"])
+            warm = sum(stats["warm"]) / len(stats["warm"])
+            log(f"⏱️ À froid : {cold:.3f}s | à chaud (CDS) : {warm:.3f}s sur {len(stats['warm'])} exécution(s) → "
+                f"gain x{cold / warm:.2f}", "info", Fore.MAGENTA)
+        elif stats["cold"]:
+            log(f"⏱️ À froid : {stats['cold'][-1]:.3f}s (relancer pour mesurer le démarrage à chaud)", "info", Fore.MAGENTA)
+    return result["returncode"]
+
+_PY_VERSION_PROBE = "import sys; print('%d.%d.%d' % sys.version_info[:3]); print(sys.executable)"
+
+def resolve_python(spec):
+    """
+    Trouve l'interpréteur correspondant à `spec` ("py3.11", "3.11", "pypy3" ou un chemin).
+
+    Returns:
+        tuple | None: (chemin, version complète) ou None si introuvable.
+    """
+    if os.path.sep in spec or os.path.exists(spec):
+        candidates = [[spec]]
+    else:
+        version = spec[2:] if spec.startswith("py") and spec[2:3].isdigit() else spec
+        name = "python" + version if version[:1].isdigit() else version
+        candidates = [[find_tool(name)]] if find_tool(name) else []
+        if os.name == "nt" and version[:1].isdigit() and find_tool("py"):
+            candidates.append(["py", f"-{version}"])
+    for cmd in candidates:
+        try:
+            probe = subprocess.run(cmd + ["-c", _PY_VERSION_PROBE], capture_output=True, text=True, timeout=30)
+        except (OSError, subprocess.TimeoutExpired):
+            continue
+        # Le chemin peut contenir des espaces (C:\Program Files\...) : une valeur par ligne
+        lines = probe.stdout.splitlines()
+        if probe.returncode == 0 and len(lines) >= 2:
+            return lines[1], lines[0]
+    return None
+
+def _matrix_venv(spec, python, version, requirements=None):
+    """
+    Crée (ou réutilise) le venv en cache d'un interpréteur et y installe `requirements` si besoin.
+
+    Returns:
+        str: Python du venv.
+    """
+    import hashlib
+
+    key = hashlib.sha256(f"{os.path.realpath(python)}|{version}".encode()).hexdigest()[:12]
+    safe_spec = re.sub(r"[^\w.-]", "_", spec)
+    venv_dir = os.path.join(get_cache_dir("venvs"), f"{safe_spec}-{key}")
+    venv_python = os.path.join(venv_dir, "Scripts", "python.exe") if os.name == "nt" else os.path.join(venv_dir, "bin", "python")
+    if not os.path.exists(venv_python):
+        created = subprocess.run([python, "-m", "venv", venv_dir], capture_output=True, text=True)
+        if created.returncode != 0:
+            raise RuntimeError(f"création du venv impossible : {(created.stderr or created.stdout).strip()[-300:]}")
+    if requirements:
+        with open(requirements, "rb") as f:
+            req_hash = hashlib.sha256(f.read()).hexdigest()
+        marker = os.path.join(venv_dir, ".dkprun-requirements")
+        if not os.path.exists(marker) or open(marker).read() != req_hash:
+            installed = subprocess.run([venv_python, "-m", "pip", "install", "-q", "-r", requirements], capture_output=True, text=True)
+            if installed.returncode != 0:
+                raise RuntimeError(f"pip install -r {requirements} a échoué : {installed.stderr.strip()[-300:]}")
+            with open(marker, "w") as f:
+                f.write(req_hash)
+    return venv_python
+
+def run_python_matrix(filename, specs, script_args=None, requirements=None, limits=None):
+    """
+    Exécute un script Python sous plusieurs interpréteurs en parallèle, chacun dans un venv en cache.
+
+    Le premier interpréteur sert de référence : les sorties (stdout/stderr) des autres sont
+    comparées à la sienne et les différences affichées en diff unifié.
+
+    Args:
+        filename (str): Script Python.
+        specs (list): Interpréteurs ("py3.9", "py3.12", ...).
+        script_args (list, optional): Arguments du script.
+        requirements (str, optional): Fichier requirements installé dans chaque venv
+            (défaut: requirements.txt à côté du script s'il existe).
+        limits (dict, optional): {"timeout", "maxmem", "maxcpu"} appliquées à chaque variante.
+
+    Returns:
+        int: 0 si toutes les variantes réussissent avec la même sortie, 1 sinon.
+    """
+    import difflib
+    from concurrent.futures import ThreadPoolExecutor
+
+    limits = {k: v for k, v in (limits or {}).items() if v}
+    timeout = limits.get("timeout")
+    run_kwargs = {}
+    if limits.get("maxmem") or limits.get("maxcpu"):
+        if os.name == "nt":
+            log("⚠️ -maxmem/-maxcpu ne sont pas supportés sur ce système : seul -timeout est appliqué.", "warning", Fore.YELLOW)
+        else:
+            run_kwargs["preexec_fn"] = _limits_preexec(limits)
+    if limits:
+        log("🔒 Limites : " + ", ".join(f"{k}={v}" for k, v in limits.items()), "info", Fore.CYAN)
+
+    script = os.path.abspath(filename)
+    if requirements is None and os.path.exists(os.path.join(os.path.dirname(script), "requirements.txt")):
+        requirements = os.path.join(os.path.dirname(script), "requirements.txt")
+
+    def run_variant(spec):
+        variant = {"spec": spec, "version": "?", "returncode": None, "duration": 0.0, "stdout": "", "stderr": "", "error": None}
+        found = resolve_python(spec)
+        if found is None:
+            variant["error"] = "interpréteur introuvable"
+            return variant
+        python, variant["version"] = found
+        try:
+            venv_python = _matrix_venv(spec, python, variant["version"], requirements)
+        except RuntimeError as e:
+            variant["error"] = str(e)
+            return variant
+        start = time.time()
+        try:
+            proc = subprocess.run([venv_python, script] + (script_args or []), capture_output=True, text=True,
+                                  errors="replace", stdin=subprocess.DEVNULL, cwd=os.getcwd(), timeout=timeout, **run_kwargs)
+            variant.update(returncode=proc.returncode, stdout=proc.stdout, stderr=proc.stderr)
+        except subprocess.TimeoutExpired:
+            variant["error"] = f"timeout de {timeout}s dépassé"
+        variant["duration"] = time.time() - start
+        return variant
+
+    log(f"🧪 Matrice {', '.join(specs)} : {filename}", "info", Fore.CYAN)
+    with ThreadPoolExecutor(max_workers=len(specs)) as pool:
+        variants = list(pool.map(run_variant, specs))
+
+    log(f"\n{'Variante':<12} {'Version':<10} {'Code':>5} {'Durée':>9}", "info", Fore.CYAN)
+    for v in variants:
+        if v["error"]:
+            log(f"{v['spec']:<12} {v['version']:<10} {'-':>5} {'-':>9}  ❌ {v['error']}", "error", Fore.RED)
+        else:
+            log(f"{v['spec']:<12} {v['version']:<10} {v['returncode']:>5} {v['duration']:>8.2f}s", "info",
+                Fore.GREEN if v["returncode"] == 0 else Fore.RED)
+
+    ran = [v for v in variants if not v["error"]]
+    differs = False
+    if ran:
+        reference = ran[0]
+        for v in ran[1:]:
+            for stream in ("stdout", "stderr"):
+                if v[stream] == reference[stream]:
+                    continue
+                differs = True
+                diff = difflib.unified_diff(reference[stream].splitlines(), v[stream].splitlines(),
+                                            f"{reference['spec']} ({stream})", f"{v['spec']} ({stream})", lineterm="")
+                log("\n".join(diff), "warning", Fore.YELLOW)
+        if not differs and len(ran) > 1:
+            log(f"✅ Sortie identique sur {len(ran)} interpréteur(s).", "info", Fore.GREEN)
+        if reference["stdout"] and not differs:
+            log(reference["stdout"].rstrip("\n"), "info")
+    failed = any(v["error"] or v["returncode"] != 0 for v in variants)
+    return 1 if failed or differs else 0
+
+def _measure_process(cmd, stdin_data=None, cwd=None):
+    """
+    Exécute une commande et mesure son temps réel et son pic de mémoire (RSS).
+
+    Le pic vient de ru_maxrss (os.wait4) une fois le processus terminé. Sous Linux, ru_maxrss
+    hérite du pic du parent au moment de l'exec : s'il ne le dépasse pas, on garde le VmHWM
+    échantillonné pendant l'exécution, ou à défaut le pic du parent comme borne supérieure.
+
+    Returns:
+        tuple: (code retour, stdout en bytes, stderr en bytes, durée en s, RSS max en octets ou 0,
+                True si le RSS n'est qu'une borne supérieure)
+    """
+    import threading
+
+    start = time.perf_counter()
+    proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE, cwd=cwd)
+    out, err = [], []
+    done = threading.Event()
+
+    def feed_and_read():
+        if stdin_data:
+            try:
+                proc.stdin.write(stdin_data)
+            except BrokenPipeError:
+                pass
+        proc.stdin.close()
+        out.append(proc.stdout.read())
+
+    def sample_peak():
+        # Repli quand ru_maxrss n'est pas exploitable : VmHWM (Linux) ou psutil, échantillonnés
+        status_file = f"/proc/{proc.pid}/status"
+        use_proc = os.path.exists(status_file)
+        ps = None
+        while not done.is_set():
+            try:
+                if use_proc:
+                    with open(status_file) as f:
+                        for line in f:
+                            if line.startswith("VmHWM:"):
+                                sampled[0] = max(sampled[0], int(line.split()[1]) * 1024)
+                                break
+                else:
+                    ps = ps or psutil.Process(proc.pid)
+                    sampled[0] = max(sampled[0], ps.memory_info().rss)
+            except Exception:
+                pass
+            done.wait(0.002)
+
+    sampled = [0]
+    threads = [threading.Thread(target=feed_and_read, daemon=True),
+               threading.Thread(target=lambda: err.append(proc.stderr.read()), daemon=True),
+               threading.Thread(target=sample_peak, daemon=True)]
+    for thread in threads:
+        thread.start()
+    peak, bound = 0, False
+    if hasattr(os, "wait4"):
+        import resource
+
+        _, status, usage = os.wait4(proc.pid, 0)
+        duration = time.perf_counter() - start
+        proc.returncode = os.waitstatus_to_exitcode(status)
+        # ru_maxrss : Ko sous Linux, octets sous macOS
+        unit = 1 if sys.platform == "darwin" else 1024
+        peak = usage.ru_maxrss * unit
+        parent_peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * unit
+        if sys.platform.startswith("linux") and peak <= parent_peak:
+            peak, bound = (sampled[0], False) if sampled[0] else (peak, True)
+    else:
+        proc.wait()
+        duration = time.perf_counter() - start
+    done.set()
+    for thread in threads:
+        thread.join()
+    peak = peak or sampled[0]
+    return proc.returncode, out[0] if out else b"", err[0] if err else b"", duration, peak, bound
+
+def _format_size(nbytes):
+    for unit in ("o", "Ko", "Mo", "Go"):
+        if nbytes < 1024 or unit == "Go":
+            return f"{nbytes:.0f} {unit}" if unit == "o" else f"{nbytes:.1f} {unit}"
+        nbytes /= 1024
+
+def benchmark_matrix(directory, stdin_file=None, run_args=None, runs=3):
+    """
+    Compare les implémentations d'une même tâche écrites dans plusieurs langages.
+
+    Les fichiers du dossier sont regroupés par nom (ex: fib.c, fib.go, fib.py) ; chaque
+    implémentation est compilée si besoin puis exécutée `runs` fois avec la même entrée
+    standard et les mêmes arguments. Seules les chaînes d'outils installées sont utilisées.
+
+    Args:
+        directory (str): Dossier contenant les implémentations.
+        stdin_file (str, optional): Fichier envoyé sur l'entrée standard de chaque programme.
+        run_args (list, optional): Arguments passés à chaque programme.
+        runs (int): Nombre d'exécutions mesurées par implémentation.
+    """
+    import tempfile
+    import statistics
+
+    if not os.path.isdir(directory):
+        log(f"❌ Dossier introuvable : {directory}", "error", Fore.RED)
+        return
+    run_args = run_args or []
+    stdin_data = None
+    if stdin_file:
+        with open(stdin_file, "rb") as f:
+            stdin_data = f.read()
+
+    tasks = {}
+    for name in sorted(os.listdir(directory)):
+        stem, ext = os.path.splitext(name)
+        if ext.lower() in BENCH_EXTS and os.path.isfile(os.path.join(directory, name)):
+            tasks.setdefault(stem.lower(), []).append(os.path.join(directory, name))
+    if not tasks:
+        log("❌ Aucune implémentation trouvée dans ce dossier.", "error", Fore.RED)
+        return
+
+    available = check_and_install_interpreters(verbose=False)
+    for task, files in tasks.items():
+        log(f"🏁 Benchmark de la tâche '{task}' ({len(files)} implémentation(s), {runs} exécution(s))", "info", Fore.CYAN)
+        rows = []
+        reference = None
+        for path in files:
+            ext_flag = BENCH_EXTS[os.path.splitext(path)[1].lower()]
+            lang = ext_flag[1:]
+            missing = [tool for tool in BENCH_TOOLS[ext_flag] if tool not in available]
+            if missing:
+                log(f"⏭️ {lang} ignoré : {', '.join(missing)} non installé", "warning", Fore.YELLOW)
+                continue
+            build_dir = tempfile.mkdtemp(prefix=f"dkprun_bench_{lang}_")
+            try:
+                build_cmds, run_cmd, artifact = prepare_run_command(path, ext_flag, build_dir)
+                build_ok = True
+                for build_cmd in build_cmds:
+                    if subprocess.run(build_cmd).returncode != 0:
+                        build_ok = False
+                        break
+                if not build_ok:
+                    log(f"❌ Compilation échouée : {path}", "error", Fore.RED)
+                    rows.append((lang, os.path.basename(path), None, None, None, "compilation"))
+                    continue
+                timings, peaks = [], []
+                output, errors, code, bound = b"", b"", 0, False
+                for _ in range(max(1, runs)):
+                    code, output, errors, duration, peak, bound = _measure_process(run_cmd + run_args, stdin_data, cwd=directory)
+                    timings.append(duration)
+                    peaks.append(peak)
+                normalized = "\n".join(line.rstrip() for line in output.decode(errors="replace").strip().splitlines())
+                if code != 0:
+                    status = f"code {code}"
+                    tail = errors.decode(errors="replace").strip().splitlines()[-5:]
+                    log(f"❌ {os.path.basename(path)} a échoué (code {code})" + "".join(f"\n    {line}" for line in tail),
+                        "error", Fore.RED)
+                elif reference is None:
+                    reference = normalized
+                    status = "référence"
+                else:
+                    status = "identique" if normalized == reference else "DIFFÉRENTE"
+                rss = (f"≤{_format_size(max(peaks))}" if bound else _format_size(max(peaks))) if max(peaks) else "-"
+                rows.append((lang, os.path.basename(path), statistics.median(timings), rss, os.path.getsize(artifact), status))
+            finally:
+                shutil.rmtree(build_dir, ignore_errors=True)
+
+        header = f"{'Langage':<8} {'Fichier':<20} {'Temps (méd.)':>12} {'RSS max':>10} {'Taille':>10}  Sortie"
+        print(header)
+        print("─" * len(header))
+        for lang, name, duration, rss, size, status in sorted(rows, key=lambda r: (r[2] is None, r[2] or 0)):
+            if duration is None:
+                print(f"{lang:<8} {name:<20} {'-':>12} {'-':>10} {'-':>10}  {status}")
+            else:
+                print(f"{lang:<8} {name:<20} {duration * 1000:>10.1f}ms {rss:>10} {_format_size(size):>10}  {status}")
+        if any(r[5] == "DIFFÉRENTE" for r in rows):
+            log("⚠️ Certaines implémentations ne produisent pas la même sortie.", "warning", Fore.YELLOW)
+
+# Amorce exécutée dans l'interpréteur enfant : échantillonne la pile du thread principal
+# à intervalle fixe et écrit les piles au format "collapsed" (flamegraph.pl, speedscope).
+_PY_SAMPLER_BOOTSTRAP = r'''
+import collections, os, runpy, sys, threading
+out_file, interval, script = sys.argv[1], float(sys.argv[2]), sys.argv[3]
+sys.argv = sys.argv[3:]
+sys.path[0] = os.path.dirname(os.path.abspath(script))
+main_id = threading.get_ident()
+script_paths = (script, os.path.abspath(script))
+stacks = collections.Counter()
+done = threading.Event()
+
+def sample():
+    while not done.wait(interval):
+        frame = sys._current_frames().get(main_id)
+        frames = []
+        while frame is not None:
+            frames.append(frame.f_code)
+            frame = frame.f_back
+        frames.reverse()
+        # On ignore l'amorce (runpy, pkgutil...) située sous le module du script
+        root = next((i for i, code in enumerate(frames) if code.co_filename in script_paths), None)
+        if root is None:
+            continue
+        stacks[";".join(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})" for code in frames[root:])] += 1
+
+sampler = threading.Thread(target=sample, daemon=True)
+sampler.start()
+try:
+    runpy.run_path(script, run_name="__main__")
+finally:
+    done.set()
+    sampler.join()
+    with open(out_file, "w", encoding="utf-8") as f:
+        for stack, count in stacks.items():
+            f.write(f"{stack} {count}\n")
+'''
+
+def _print_hot_functions(rows, top, headers):
+    """
+    Affiche un tableau des fonctions les plus coûteuses.
+
+    Args:
+        rows (list): Tuples (valeur de tri, colonnes..., nom de fonction).
+        top (int): Nombre de lignes affichées.
+        headers (tuple): Titres des colonnes numériques.
+    """
+    header = " ".join(f"{h:>10}" for h in headers) + "  Fonction"
+    print(header)
+    print("─" * len(header))
+    for row in sorted(rows, key=lambda r: r[0], reverse=True)[:top]:
+        print(" ".join(f"{v:>10}" for v in row[1:-1]) + f"  {row[-1]}")
+
+def profile_python_script(filename, mode="sample", top=20, interval_ms=5.0, script_args=None, run_opts=None):
+    """
+    Exécute un script Python sous profileur sans le modifier.
+
+    Le mode "sample" échantillonne la pile du thread principal (faible surcoût) et écrit un
+    fichier de piles agrégées `<script>.folded` utilisable par flamegraph.pl ou speedscope.
+    Le mode "cprofile" utilise cProfile, écrit `<script>.prof` et un `.folded` appelant;appelé.
+
+    Args:
+        filename (str): Script Python à profiler.
+        mode (str): "sample" ou "cprofile".
+        top (int): Nombre de fonctions affichées dans le tableau.
+        interval_ms (float): Période d'échantillonnage en millisecondes.
+        script_args (list, optional): Arguments passés au script (sys.argv[1:]).
+        run_opts (dict, optional): Options transmises à run_command (capture, limites...).
+    """
+    import pstats
+    from collections import Counter
+
+    script_args = script_args or []
+    run_opts = run_opts or {}
+    base = os.path.splitext(os.path.basename(filename))[0]
+    folded_file = f"{base}.folded"
+    start = time.time()
+    if mode == "cprofile":
+        prof_file = f"{base}.prof"
+        log(f"🔬 Profilage cProfile de {filename}", "info", Fore.CYAN)
+        result = run_command([sys.executable, "-m", "cProfile", "-o", prof_file, filename] + script_args, **run_opts)
+        elapsed = time.time() - start
+        if not os.path.exists(prof_file):
+            log("❌ Aucun profil produit.", "error", Fore.RED)
+            return result["returncode"]
+        stats = pstats.Stats(prof_file)
+        rows = []
+        with open(folded_file, "w", encoding="utf-8") as f:
+            for (path, line, func), (cc, nc, tt, ct, callers) in stats.stats.items():
+                name = f"{func} ({os.path.basename(path)}:{line})"
+                rows.append(((tt, ct), nc, f"{tt:.4f}", f"{ct:.4f}", name))
+                for (c_path, c_line, c_func), caller_stats in callers.items():
+                    weight = int(caller_stats[2] * 1_000_000)
+                    if weight:
+                        f.write(f"{c_func} ({os.path.basename(c_path)}:{c_line});{name} {weight}\n")
+        log(f"⏱️ Durée : {elapsed:.3f}s | Profil : {prof_file} | Piles : {folded_file}", "info", Fore.YELLOW)
+        _print_hot_functions(rows, top, ("Appels", "Propre(s)", "Cumulé(s)"))
+        return result["returncode"]
+
+    log(f"🔬 Profilage par échantillonnage ({interval_ms:g} ms) de {filename}", "info", Fore.CYAN)
+    result = run_command([sys.executable, "-c", _PY_SAMPLER_BOOTSTRAP, folded_file, str(interval_ms / 1000), filename]
+                         + script_args, **run_opts)
+    elapsed = time.time() - start
+    if not os.path.exists(folded_file):
+        log("❌ Aucun échantillon produit.", "error", Fore.RED)
+        return result["returncode"]
+    self_counts, total_counts = Counter(), Counter()
+    samples = 0
+    with open(folded_file, encoding="utf-8") as f:
+        for line in f:
+            stack, _, count = line.rstrip("\n").rpartition(" ")
+            count = int(count)
+            frames = stack.split(";")
+            samples += count
+            self_counts[frames[-1]] += count
+            for frame in set(frames):
+                total_counts[frame] += count
+    log(f"⏱️ Durée : {elapsed:.3f}s | {samples} échantillons | Piles : {folded_file}", "info", Fore.YELLOW)
+    if samples:
+        rows = [((self_counts[name], total), f"{100 * self_counts[name] / samples:.1f}%", f"{100 * total / samples:.1f}%", name)
+                for name, total in total_counts.items()]
+        _print_hot_functions(rows, top, ("Propre", "Total"))
+    return result["returncode"]
+
+def _prefork_socket_path(modules):
+    import hashlib
+
+    key = hashlib.sha256(f"{sys.executable}|{','.join(sorted(modules))}".encode()).hexdigest()[:12]
+    return os.path.join(get_cache_dir(), f"prefork-{key}.sock")
+
+def _prefork_child(header, fds, listener_fds):
+    """
+    Exécuté dans le processus forké : branche les E/S du client et lance le script via runpy.
+    """
+    import runpy
+    import signal
+    import traceback
+
+    signal.set_wakeup_fd(-1)
+    signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.default_int_handler)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    for fd in listener_fds:
+        os.close(fd)
+    for target, fd in enumerate(fds):
+        os.dup2(fd, target)
+        os.close(fd)
+    # Flux neufs sur les fd du client (ligne par ligne vers un terminal, comme un python lancé directement)
+    sys.stdin = open(0, "r", closefd=False)
+    sys.stdout = open(1, "w", buffering=1 if os.isatty(1) else -1, closefd=False)
+    sys.stderr = open(2, "w", buffering=1, errors="backslashreplace", closefd=False)
+    code = 0
+    try:
+        os.chdir(header["cwd"])
+        os.environ.clear()
+        os.environ.update(header["env"])
+        sys.argv = [header["script"]] + header["argv"]
+        sys.path[0] = os.path.dirname(os.path.abspath(header["script"]))
+        runpy.run_path(header["script"], run_name="__main__")
+    except SystemExit as e:
+        code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+        if e.code is not None and not isinstance(e.code, int):
+            print(e.code, file=sys.stderr)
+    except KeyboardInterrupt:
+        code = 130
+    except BaseException:
+        traceback.print_exc()
+        code = 1
+    finally:
+        try:
+            sys.stdout.flush()
+            sys.stderr.flush()
+        finally:
+            os._exit(code)
+
+def start_prefork_server(modules, sock_path=None):
+    """
+    Serveur résident : pré-importe `modules` puis forke un enfant par script Python à exécuter.
+
+    Le client transmet ses descripteurs stdin/stdout/stderr (SCM_RIGHTS) avec un en-tête JSON
+    (script, argv, cwd, env) ; le code de sortie de l'enfant lui est renvoyé. Un "INT" envoyé par
+    le client est relayé à l'enfant sous forme de SIGINT.
+    """
+    import importlib
+    import json
+    import selectors
+    import signal
+
+    sock_path = sock_path or _prefork_socket_path(modules)
+    set_async_console(True)
+    start = time.time()
+    for mod in modules:
+        try:
+            importlib.import_module(mod)
+        except Exception as e:
+            log(f"⚠️ Préchargement impossible de {mod} : {e}", "warning", Fore.YELLOW)
+    log(f"🔥 Prefork : {len(modules)} module(s) préchargé(s) en {time.time() - start:.2f}s, écoute sur {sock_path}", "info", Fore.CYAN)
+
+    if os.path.exists(sock_path):
+        os.remove(sock_path)
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(sock_path)
+    listener.listen(16)
+    wake_r, wake_w = socket.socketpair()
+    wake_w.setblocking(False)
+    signal.set_wakeup_fd(wake_w.fileno())
+    signal.signal(signal.SIGCHLD, lambda *_: None)
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    sel = selectors.DefaultSelector()
+    sel.register(listener, selectors.EVENT_READ, "accept")
+    sel.register(wake_r, selectors.EVENT_READ, "wakeup")
+    running = {}
+    try:
+        while True:
+            for key, _ in sel.select():
+                if key.data == "accept":
+                    conn, _ = listener.accept()
+                    msg, fds, _, _ = socket.recv_fds(conn, 1 << 20, 3)
+                    header = json.loads(msg.decode())
+                    if header.get("stop"):
+                        conn.close()
+                        log("🛑 Arrêt du serveur prefork.", "info", Fore.CYAN)
+                        return
+                    # Pas de fork avec le thread d'écriture des logs actif : l'enfant pourrait hériter
+                    # d'un verrou pris. Et sans flush, il viderait le tampon du serveur chez le client.
+                    if _LOG_LISTENER is not None:
+                        _LOG_LISTENER.stop()
+                    sys.stdout.flush()
+                    sys.stderr.flush()
+                    pid = os.fork()
+                    if pid == 0:
+                        _prefork_child(header, fds, [listener.fileno(), wake_r.fileno(), wake_w.fileno(), conn.fileno()])
+                    if _LOG_LISTENER is not None:
+                        _LOG_LISTENER.start()
+                    for fd in fds:
+                        os.close(fd)
+                    running[pid] = conn
+                    sel.register(conn, selectors.EVENT_READ, pid)
+                elif key.data == "wakeup":
+                    wake_r.recv(4096)
+                    while True:
+                        try:
+                            pid, status = os.waitpid(-1, os.WNOHANG)
+                        except ChildProcessError:
+                            break
+                        if pid == 0:
+                            break
+                        conn = running.pop(pid, None)
+                        if conn:
+                            sel.unregister(conn)
+                            try:
+                                conn.sendall(f"{os.waitstatus_to_exitcode(status)}\n".encode())
+                            except OSError:
+                                pass
+                            conn.close()
+                else:
+                    try:
+                        data = key.fileobj.recv(64)
+                    except OSError:
+                        data = b""
+                    if b"INT" in data:
+                        os.kill(key.data, signal.SIGINT)
+                    elif not data:
+                        # Client parti : on arrête le script orphelin (il sera récolté sans réponse)
+                        os.kill(key.data, signal.SIGTERM)
+                        sel.unregister(key.fileobj)
+                        running.pop(key.data).close()
+    finally:
+        listener.close()
+        if os.path.exists(sock_path):
+            os.remove(sock_path)
+
+def _connect_prefork(sock_path):
+    s = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        s.connect(sock_path)
+        return s
+    except OSError:
+        s.close()
+        return None
+
+def run_prefork(filename, script_args=None, modules=None, startup_timeout=60):
+    """
+    Exécute un script Python via le serveur prefork (démarré à la demande).
+
+    Args:
+        filename (str): Script Python.
+        script_args (list, optional): Arguments transmis au script.
+        modules (list, optional): Modules préchargés par le serveur.
+        startup_timeout (int): Délai maximal de démarrage du serveur en secondes.
+
+    Returns:
+        int: Code de sortie du script.
+    """
+    import json
+
+    if not hasattr(os, "fork") or not hasattr(socket, "send_fds"):
+        log("⚠️ -prefork nécessite fork() et les sockets Unix : exécution classique.", "warning", Fore.YELLOW)
+        return subprocess.run([sys.executable, filename] + (script_args or [])).returncode
+    modules = modules or []
+    sock_path = _prefork_socket_path(modules)
+    conn = _connect_prefork(sock_path)
+    if conn is None:
+        log(f"🔥 Démarrage du serveur prefork ({', '.join(modules) or 'aucun module'})...", "info", Fore.CYAN)
+        with open(os.path.join(get_cache_dir(), "prefork.log"), "ab") as server_log:
+            subprocess.Popen([sys.executable, os.path.abspath(__file__), "-preforkserver", "-preload", ",".join(modules)],
+                             stdin=subprocess.DEVNULL, stdout=server_log, stderr=server_log, start_new_session=True)
+        deadline = time.time() + startup_timeout
+        while conn is None and time.time() < deadline:
+            time.sleep(0.05)
+            conn = _connect_prefork(sock_path)
+        if conn is None:
+            log("❌ Le serveur prefork n'a pas démarré (voir prefork.log).", "error", Fore.RED)
+            return 1
+    header = {"script": os.path.abspath(filename), "argv": script_args or [], "cwd": os.getcwd(), "env": dict(os.environ)}
+    start = time.time()
+    with conn:
+        socket.send_fds(conn, [json.dumps(header).encode()], [0, 1, 2])
+        data = b""
+        while not data.endswith(b"\n"):
+            try:
+                chunk = conn.recv(64)
+            except KeyboardInterrupt:
+                conn.sendall(b"INT\n")
+                continue
+            if not chunk:
+                log("❌ Connexion au serveur prefork perdue.", "error", Fore.RED)
+                return 1
+            data += chunk
+    returncode = int(data.strip())
+    metric_inc("dkprun_runs_total", language="py", status="ok" if returncode == 0 else "error")
+    metric_observe("dkprun_run_seconds", time.time() - start, language="py")
+    return returncode
 
+def stop_prefork_server(modules=None):
+    import json
 
-def get_wifi_ips():
+    conn = _connect_prefork(_prefork_socket_path(modules or []))
+    if conn is None:
+        log("ℹ️ Aucun serveur prefork actif.", "info", Fore.CYAN)
+        return
+    with conn:
+        socket.send_fds(conn, [json.dumps({"stop": True}).encode()], [])
+    log("✅ Serveur prefork arrêté.", "info", Fore.GREEN)
+
+LIVE_RELOAD_PATH = "/__dkprun/reload"
+LIVE_RELOAD_SCRIPT = (
+    '<script>(function(){var es=new EventSource("%s");'
+    'es.addEventListener("reload",function(){location.reload();});})();</script>' % LIVE_RELOAD_PATH
+).encode()
+GZIP_TYPES = ("text/", "application/javascript", "application/json", "application/xml", "image/svg+xml")
+
+def _watch_tree(root, notify, interval=0.5):
     """
-    Affiche toutes les IPs de machines connectées au même réseau local (table ARP).
-    Fonctionne sur Windows, Linux, Mac.
+    Appelle notify(chemin) à chaque modification sous `root` (watchdog si installé, sinon scrutation).
     """
-    import subprocess
-    import platform
-    import re
-
-    log("🔎 IPs détectées sur le réseau local :", "info", Fore.CYAN)
     try:
-        if platform.system() == "Windows":
-            output = subprocess.check_output("arp -a", shell=True, encoding="latin1")
-            # Les lignes contenant une IP (xxx.xxx.xxx.xxx)
-            pattern = re.compile(r"(\d+\.\d+\.\d+\.\d+)")
-            ips = set()
-            for line in output.splitlines():
-                match = pattern.search(line)
-                if match:
-                    ips.add(match.group(1))
-        else:
-            output = subprocess.check_output(["arp", "-a"], encoding="utf-8")
-            pattern = re.compile(r"\((\d+\.\d+\.\d+\.\d+)\)")
-            ips = set(pattern.findall(output))
-        # Affichage
-        for ip in sorted(ips):
-            print(f" - {ip}")
-    except Exception as e:
-        log(f"❌ Impossible de récupérer la liste des IPs : {e}", "error", Fore.RED)
+        from watchdog.observers import Observer
+        from watchdog.events import FileSystemEventHandler
+    except ImportError:
+        Observer = None
 
-def unzip_project(zip_path, extract_to=None):
+    def ignored(path):
+        return any(part in TEST_SKIP_DIRS for part in os.path.relpath(path, root).split(os.sep))
+
+    if Observer is not None:
+        class Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                if not event.is_directory and event.event_type != "opened" and not ignored(event.src_path):
+                    notify(event.src_path)
+
+        observer = Observer()
+        observer.schedule(Handler(), root, recursive=True)
+        observer.daemon = True
+        observer.start()
+        return "watchdog"
+
+    def snapshot():
+        mtimes = {}
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = [d for d in dirnames if d not in TEST_SKIP_DIRS]
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                try:
+                    mtimes[path] = os.stat(path).st_mtime_ns
+                except OSError:
+                    pass
+        return mtimes
+
+    def poll():
+        previous = snapshot()
+        while True:
+            time.sleep(interval)
+            current = snapshot()
+            changed = [p for p in current.keys() | previous.keys() if current.get(p) != previous.get(p)]
+            previous = current
+            if changed:
+                notify(changed[0])
+
+    threading.Thread(target=poll, daemon=True).start()
+    return "scrutation"
+
+def serve_html(filename, port=8000, open_browser=True):
     """
-    Décompresse un fichier zip dans le dossier courant ou un dossier donné.
+    Sert le dossier d'un fichier HTML en local avec cache HTTP, gzip et rechargement automatique.
+
+    Chaque fichier porte un ETag (mtime + taille) : le navigateur revalide et reçoit 304 s'il est
+    inchangé. Les contenus texte sont compressés en gzip (mis en cache par ETag). Un script est injecté
+    dans les pages HTML : il écoute LIVE_RELOAD_PATH (Server-Sent Events) et recharge la page à
+    chaque modification d'un fichier du dossier (watchdog si installé, sinon scrutation).
 
     Args:
-        zip_path (str): Chemin du fichier zip à décompresser.
-        extract_to (str, optional): Dossier cible. Si None, extrait dans le dossier courant.
-    """
-    if not os.path.exists(zip_path):
-        log(f"❌ Fichier zip introuvable : {zip_path}", "error", Fore.RED)
-        return
-    if extract_to is None:
-        extract_to = os.getcwd()
-    try:
-        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-            zip_ref.extractall(extract_to)
-        log(f"✅ Fichier décompressé dans : {extract_to}", "info", Fore.GREEN)
-    except Exception as e:
-        log(f"❌ Erreur lors de la décompression : {e}", "error", Fore.RED)
+        filename (str): Page HTML ouverte au démarrage.
+        port (int): Port HTTP (un port libre est choisi s'il est occupé).
+        open_browser (bool): Ouvre la page dans le navigateur.
 
-def run_tests():
-    if os.path.exists("pytest.ini") or any(f.endswith("_test.py") for f in os.listdir(".")):
-        log("🧪 Lancement des tests pytest...", "info", Fore.MAGENTA)
-        subprocess.run(["pytest"])
-    elif os.path.exists("package.json"):
-        log("🧪 Lancement des tests npm...", "info", Fore.MAGENTA)
-        subprocess.run(["npm", "test"])
-    elif os.path.exists("Gemfile"):
-        log("🧪 Lancement des tests Ruby...", "info", Fore.MAGENTA)
-        subprocess.run(["bundle", "exec", "rake", "test"])
-    else:
-        log("❌ Aucun système de test détecté.", "error", Fore.RED)
+    Returns:
+        int: 0 à l'arrêt du serveur.
+    """
+    import gzip
+    import urllib.parse
+    from http import HTTPStatus
+    from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
 
-def git_status():
-    if shutil.which("git") is None:
-        log("❌ Git n'est pas installé.", "error", Fore.RED)
-        return
-    subprocess.run(["git", "status"])
+    root = os.path.dirname(os.path.abspath(filename))
+    reload_state = {"version": 0, "path": ""}
+    reload_cond = threading.Condition()
+    body_cache = collections.OrderedDict()
+    cache_lock = threading.Lock()
 
-def git_commit(msg):
-    if shutil.which("git") is None:
-        log("❌ Git n'est pas installé.", "error", Fore.RED)
-        return
-    subprocess.run(["git", "add", "."])
-    subprocess.run(["git", "commit", "-m", msg])
-    log("✅ Git commit effectué.", "info", Fore.GREEN)
+    def notify(path):
+        with reload_cond:
+            reload_state["version"] += 1
+            reload_state["path"] = os.path.relpath(path, root)
+            reload_cond.notify_all()
 
-def list_dependencies(filename):
-    ext_flag = None
-    for k in EXT_TO_COMMAND:
-        if filename.endswith(k.replace("-", ".")):
-            ext_flag = k
-            break
-    deps = set()
-    if ext_flag == "-py":
-        with open(filename, "r", encoding="utf-8") as f:
-            code = f.read()
-        imports = set(re.findall(r'^\s*import (\w+)|^\s*from (\w+)', code, re.MULTILINE))
-        for imp in imports:
-            deps.update([x for x in imp if x])
-    elif ext_flag == "-js":
-        with open(filename, "r", encoding="utf-8") as f:
-            code = f.read()
-        imports = set(re.findall(r'require\([\'"]([\w\-]+)[\'"]\)|import .* from [\'"]([\w\-]+)[\'"]', code))
-        for imp in imports:
-            deps.update([x for x in imp if x])
-    log(f"📦 Dépendances détectées : {', '.join(sorted(deps))}", "info", Fore.MAGENTA)
+    class DevHandler(SimpleHTTPRequestHandler):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, directory=root, **kwargs)
 
-def closeall(target_path):
-    target_path = os.path.abspath(target_path).lower()
-    found = False
-    for proc in psutil.process_iter(['pid', 'name', 'exe', 'open_files', 'cwd']):
-        try:
-            is_relevant = False
-            cwd = proc.info.get('cwd')
-            if cwd and target_path in cwd.lower():
-                is_relevant = True
-            for f in proc.info.get('open_files') or []:
-                if target_path in f.path.lower():
-                    is_relevant = True
-            if is_relevant:
-                found = True
-                print(f"{Fore.YELLOW}[CloseAll] Arrêt du processus {proc.info['name']} (PID {proc.info['pid']}){Fore.RESET}")
-                proc.terminate()
-        except Exception:
+        def log_message(self, format, *args):
             pass
-    if not found:
-        print(f"{Fore.GREEN}[CloseAll] Aucun processus bloquant trouvé pour {target_path}{Fore.RESET}")
 
-def gendoc():
-    if os.path.exists("conf.py"):
-        log("🔎 conf.py trouvé, génération de la doc avec Sphinx...", "info", Fore.CYAN)
-        subprocess.run(["sphinx-build", ".", "_build"])
-        log("✅ Documentation Sphinx générée dans ./_build", "info", Fore.GREEN)
-    else:
-        log("⌛ Aucun conf.py Sphinx trouvé dans ce dossier. Lancement 'sphinx-quickstart' pour initialiser la doc.", "info", Fore.CYAN)
-        result = subprocess.run(["sphinx-quickstart"])
-        if result.returncode == 0 and os.path.exists("conf.py"):
-            subprocess.run(["sphinx-build", ".", "_build"])
-            log("✅ Documentation Sphinx générée dans ./_build", "info", Fore.GREEN)
-        else:
-            log("❌ La génération de la doc a échoué ou a été annulée.", "error", Fore.RED)
+        def do_GET(self):
+            self._serve(head=False)
 
-def update_dependencies():
-    if os.path.exists("requirements.txt"):
-        log("⬆️ Mise à jour des paquets pip...", "info", Fore.CYAN)
-        subprocess.run([sys.executable, "-m", "pip", "install", "--upgrade", "-r", "requirements.txt"])
-    elif os.path.exists("package.json"):
-        log("⬆️ Mise à jour des paquets npm...", "info", Fore.CYAN)
-        subprocess.run(["npm", "update"])
-    elif os.path.exists("composer.json"):
-        log("⬆️ Mise à jour des paquets composer...", "info", Fore.CYAN)
-        subprocess.run(["composer", "update"])
-    else:
-        log("❌ Aucun gestionnaire de dépendances détecté.", "error", Fore.RED)
+        def do_HEAD(self):
+            self._serve(head=True)
 
-def run_url(url):
-    ext = os.path.splitext(url)[1]
-    filename = f"temp_script{ext}"
-    try:
-        import requests
-        r = requests.get(url)
-        with open(filename, "wb") as f:
-            f.write(r.content)
-        log(f"🌐 Script téléchargé depuis {url}", "info", Fore.CYAN)
-        main(["-r", f"-{ext[1:]}", filename])
-    except Exception as e:
-        log(f"❌ Erreur téléchargement/exécution : {e}", "error", Fore.RED)
-    finally:
-        if os.path.exists(filename):
-            os.remove(filename)
+        def _serve(self, head):
+            start = time.time()
+            url_path = urllib.parse.urlsplit(self.path).path
+            if url_path == LIVE_RELOAD_PATH:
+                return self._events()
+            fs_path = self.translate_path(self.path)
+            if os.path.isdir(fs_path):
+                index = os.path.join(fs_path, "index.html")
+                if not url_path.endswith("/") or not os.path.isfile(index):
+                    # Redirection et listing du dossier : comportement standard
+                    return super().do_HEAD() if head else super().do_GET()
+                fs_path = index
+            try:
+                st = os.stat(fs_path)
+            except OSError:
+                self.send_error(HTTPStatus.NOT_FOUND)
+                return
+            ctype = self.guess_type(fs_path)
+            inject = ctype.startswith("text/html")
+            use_gzip = "gzip" in self.headers.get("Accept-Encoding", "") and ctype.startswith(GZIP_TYPES)
+            etag = f'"{st.st_mtime_ns:x}-{st.st_size:x}{"-lr" if inject else ""}{"-gz" if use_gzip else ""}"'
+            if etag in [t.strip() for t in self.headers.get("If-None-Match", "").split(",")]:
+                self.send_response(HTTPStatus.NOT_MODIFIED)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                log("   %s %s 304 (%.1f ms)", "info", None, self.command, url_path, (time.time() - start) * 1000)
+                return
+            with cache_lock:
+                body = body_cache.get(etag + fs_path)
+            if body is None:
+                with open(fs_path, "rb") as f:
+                    body = f.read()
+                if inject:
+                    idx = body.lower().rfind(b"</body>")
+                    body = body[:idx] + LIVE_RELOAD_SCRIPT + body[idx:] if idx >= 0 else body + LIVE_RELOAD_SCRIPT
+                if use_gzip:
+                    body = gzip.compress(body, compresslevel=6)
+                if inject or use_gzip:
+                    with cache_lock:
+                        body_cache[etag + fs_path] = body
+                        while len(body_cache) > 256:
+                            body_cache.popitem(last=False)
+            self.send_response(HTTPStatus.OK)
+            self.send_header("Content-Type", ctype)
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")
+            self.send_header("Vary", "Accept-Encoding")
+            if use_gzip:
+                self.send_header("Content-Encoding", "gzip")
+            self.end_headers()
+            if not head:
+                self.wfile.write(body)
+            log("   %s %s 200 %s%s (%.1f ms)", "info", None, self.command, url_path, _format_size(len(body)),
+                " gzip" if use_gzip else "", (time.time() - start) * 1000)
 
-def interactive_mode():
-    log("Bienvenue en mode interactif ! (tape 'exit' pour quitter)", "info", Fore.CYAN)
-    while True:
-        try:
-            cmd = input("> ")
-            if cmd.strip().lower() == "exit":
-                break
-            main(cmd.strip().split())
-        except KeyboardInterrupt:
-            print()
-            break
+        def _events(self):
+            self.send_response(HTTPStatus.OK)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Cache-Control", "no-cache")
+            self.end_headers()
+            with reload_cond:
+                seen = reload_state["version"]
+            try:
+                while True:
+                    with reload_cond:
+                        reload_cond.wait_for(lambda: reload_state["version"] != seen, timeout=15)
+                        changed = reload_state["version"] != seen
+                    if changed:
+                        # Regroupe les événements d'une même sauvegarde (éditeurs, renommages)
+                        time.sleep(0.1)
+                        with reload_cond:
+                            seen, path = reload_state["version"], reload_state["path"]
+                        self.wfile.write(f"event: reload\ndata: {path}\n\n".encode())
+                    else:
+                        self.wfile.write(b": ping\n\n")
+                    self.wfile.flush()
+            except (BrokenPipeError, ConnectionResetError):
+                pass
 
-def profile_execution(cmd_fn, *args, **kwargs):
-    import tracemalloc
-    tracemalloc.start()
-    start = time.time()
-    result = cmd_fn(*args, **kwargs)
-    end = time.time()
-    current, peak = tracemalloc.get_traced_memory()
-    tracemalloc.stop()
-    log(f"⏱️ Temps d’exécution : {end - start:.3f}s | Mémoire max : {peak / 1024:.1f} Ko", "info", Fore.YELLOW)
-    return result
+    try:
+        server = ThreadingHTTPServer(("127.0.0.1", port), DevHandler)
+    except OSError:
+        server = ThreadingHTTPServer(("127.0.0.1", 0), DevHandler)
+    server.daemon_threads = True
+    set_async_console(True)
+    mode = _watch_tree(root, notify)
+    url = f"http://127.0.0.1:{server.server_address[1]}/{urllib.parse.quote(os.path.basename(filename))}"
+    log(f"🌐 Serveur de développement : {url} (racine {root}, rechargement : {mode}) — Ctrl+C pour arrêter", "info", Fore.CYAN)
+    if open_browser:
+        webbrowser.open(url)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        log("\nArrêt du serveur.")
+    finally:
+        server.server_close()
+    return 0
 
 def zip_project(target):
+    if not os.path.exists(target):
+        log(f"❌ Introuvable : {target}", "error", Fore.RED)
+        return 1
     zipname = f"{os.path.basename(target).rstrip(os.sep)}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip"
     with zipfile.ZipFile(zipname, 'w', zipfile.ZIP_DEFLATED) as zf:
         if os.path.isdir(target):
@@ -664,6 +4454,7 @@ def zip_project(target):
         else:
             zf.write(target)
     log(f"✅ Projet zippé : {zipname}", "info", Fore.GREEN)
+    return 0
 
 def automakelib_py(file_path):
     basename = os.path.splitext(os.path.basename(file_path))[0]
@@ -748,14 +4539,249 @@ def get_ip():
     except Exception as e:
         print(f"IP publique : Erreur ({e})")
 
+# Linters de -lint : extensions couvertes, commande (fichiers ajoutés à la fin), fichiers de config
+LINTERS = {
+    "flake8": {
+        "exts": (".py",),
+        "cmd": ["flake8", "--exit-zero", "--format=%(path)s\t%(row)d\t%(col)d\t%(code)s\t%(text)s"],
+        "configs": [".flake8", "setup.cfg", "tox.ini"],
+    },
+    "pylint": {
+        "exts": (".py",),
+        "cmd": ["pylint", "--exit-zero", "--output-format=json", "--score=n"],
+        "configs": [".pylintrc", "pylintrc", "pyproject.toml", "setup.cfg"],
+        # Constats inter-fichiers (import-error, no-member, cyclic-import, duplicate-code) : un seul
+        # passage sur tout le projet, parallélisé par pylint (--jobs), mis en cache pour l'ensemble
+        "project": True,
+    },
+    "eslint": {
+        "exts": (".js", ".jsx", ".mjs", ".cjs"),
+        "cmd": ["eslint", "--format", "json", "--no-error-on-unmatched-pattern"],
+        "configs": [".eslintrc", ".eslintrc.js", ".eslintrc.cjs", ".eslintrc.json", ".eslintrc.yml", ".eslintrc.yaml",
+                    "eslint.config.js", "eslint.config.mjs", "eslint.config.cjs", "package.json"],
+    },
+}
+
+def _lint_files(root, exts):
+    # git ls-files respecte .gitignore et évite de parcourir node_modules ; sinon parcours du disque
+    listed = subprocess.run(["git", "-C", root, "ls-files", "-z", "-co", "--exclude-standard"], capture_output=True) \
+        if find_tool("git") else None
+    if listed is not None and listed.returncode == 0:
+        files = [f for f in listed.stdout.decode(errors="surrogateescape").split("\0") if f]
+    else:
+        files = []
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = [d for d in dirnames if d not in TEST_SKIP_DIRS and not d.startswith(".")]
+            files += [os.path.relpath(os.path.join(dirpath, f), root) for f in filenames]
+    return sorted(f for f in files if f.endswith(exts) and os.path.isfile(os.path.join(root, f))
+                  and not TEST_SKIP_DIRS.intersection(f.split("/")[:-1]))
+
+def _parse_lint_output(linter, output, root):
+    """
+    Convertit la sortie d'un linter en constats {"file", "line", "col", "code", "message", "severity"}.
+    """
+    import json
+
+    findings = []
+    if linter == "flake8":
+        for line in output.splitlines():
+            parts = line.split("\t", 4)
+            if len(parts) == 5:
+                path, row, col, code, text = parts
+                findings.append({"file": path, "line": int(row), "col": int(col), "code": code, "message": text,
+                                 "severity": "error" if code[:1] in ("E", "F") else "warning"})
+    elif linter == "pylint":
+        for msg in json.loads(output or "[]"):
+            findings.append({"file": msg["path"], "line": msg["line"], "col": msg["column"] + 1,
+                             "code": f"{msg['message-id']}({msg['symbol']})", "message": msg["message"],
+                             "severity": "error" if msg["type"] in ("error", "fatal") else "warning"})
+    elif linter == "eslint":
+        for result in json.loads(output or "[]"):
+            for msg in result["messages"]:
+                findings.append({"file": result["filePath"], "line": msg.get("line", 0), "col": msg.get("column", 0),
+                                 "code": msg.get("ruleId") or "fatal", "message": msg["message"],
+                                 "severity": "error" if msg.get("severity") == 2 else "warning"})
+    for finding in findings:
+        path = finding["file"]
+        finding["file"] = os.path.relpath(path, root).replace(os.sep, "/") if os.path.isabs(path) else path.replace(os.sep, "/")
+        finding["linter"] = linter
+    return findings
+
+def _run_lint_chunk(job):
+    linter, files, root, extra = job
+    proc = subprocess.run(LINTERS[linter]["cmd"] + extra + files, cwd=root, capture_output=True, text=True, errors="replace",
+                          stdin=subprocess.DEVNULL)
+    # eslint : 0 = propre, 1 = constats, 2+ = erreur d'exécution ; flake8/pylint tournent avec --exit-zero
+    if proc.returncode not in ((0, 1) if linter == "eslint" else (0,)):
+        return job, None, (proc.stderr or proc.stdout).strip()[-500:]
+    try:
+        return job, _parse_lint_output(linter, proc.stdout, root), None
+    except (ValueError, KeyError) as e:
+        return job, None, f"sortie illisible ({e}) : {proc.stdout[:200]}"
+
+def run_lint(root=".", linters=None, jobs=None, report="dkprun-lint.json"):
+    """
+    Lance flake8 / pylint / eslint en parallèle par lots, avec un cache par fichier.
+
+    Le cache (.dkprun/lint-cache.json) garde les constats de chaque fichier, indexés par l'empreinte
+    de son contenu ; il est invalidé pour un linter quand sa version ou sa configuration change.
+    Un fichier dont la date et la taille n'ont pas bougé n'est même pas relu. pylint, dont les
+    constats dépendent des autres fichiers, est relancé sur tout le projet dès qu'un fichier change.
+    Les constats de tous les linters sont fusionnés dans un rapport JSON unique.
+
+    Args:
+        root (str): Racine du projet.
+        linters (list, optional): Linters à utiliser (défaut: tous ceux installés).
+        jobs (int, optional): Lots simultanés (défaut: nombre de CPU).
+        report (str): Fichier du rapport JSON fusionné.
+
+    Returns:
+        int: 0 si aucun constat ni erreur, 1 sinon.
+    """
+    import hashlib
+    import json
+    from concurrent.futures import ThreadPoolExecutor
+
+    root = os.path.abspath(root)
+    start = time.time()
+    selected = [l for l in (linters or LINTERS) if l in LINTERS and find_tool(l)]
+    for name in linters or []:
+        if name not in selected:
+            log(f"⚠️ Linter indisponible : {name}", "warning", Fore.YELLOW)
+    if not selected:
+        log("❌ Aucun linter installé (pip install flake8 pylint / npm install -g eslint).", "error", Fore.RED)
+        return 1
+
+    cache_file = os.path.join(root, ".dkprun", "lint-cache.json")
+    try:
+        with open(cache_file) as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        cache = {}
+    stats, file_hashes = cache.get("stats", {}), {}
+
+    def file_hash(rel):
+        if rel not in file_hashes:
+            st = os.stat(os.path.join(root, rel))
+            cached = stats.get(rel)
+            if cached and cached["mtime"] == st.st_mtime_ns and cached["size"] == st.st_size:
+                file_hashes[rel] = cached["hash"]
+            else:
+                with open(os.path.join(root, rel), "rb") as f:
+                    file_hashes[rel] = hashlib.sha256(f.read()).hexdigest()
+                stats[rel] = {"mtime": st.st_mtime_ns, "size": st.st_size, "hash": file_hashes[rel]}
+        return file_hashes[rel]
+
+    findings, errors, todo, tool_versions, pending_sets = [], [], [], {}, {}
+    counts = {"files": 0, "cached": 0, "linted": 0}
+    for linter in selected:
+        spec = LINTERS[linter]
+        config = hashlib.sha256(f"{tool_fingerprint(linter)}|{spec['cmd']}".encode())
+        for name in spec["configs"]:
+            path = os.path.join(root, name)
+            if os.path.isfile(path):
+                with open(path, "rb") as f:
+                    config.update(name.encode() + b"\0" + f.read())
+        entry = cache.get(linter, {})
+        if entry.get("config") != config.hexdigest():
+            entry = {"config": config.hexdigest(), "files": {}}
+        cache[linter] = entry
+        tool_versions[linter] = (discover_toolchains().get(linter) or {}).get("version")
+        files = _lint_files(root, spec["exts"])
+        counts["files"] += len(files)
+        workers = jobs or os.cpu_count() or 1
+        if spec.get("project"):
+            file_set = hashlib.sha256("\0".join(f"{rel}\0{file_hash(rel)}" for rel in files).encode()).hexdigest()
+            if entry.get("set") == file_set:
+                findings += entry["findings"]
+                counts["cached"] += len(files)
+            elif files:
+                pending_sets[linter] = file_set
+                todo.append((linter, files, root, [f"--jobs={workers}"]))
+            continue
+        stale = []
+        for rel in files:
+            known = entry["files"].get(rel)
+            if known and known["hash"] == file_hash(rel):
+                findings += known["findings"]
+                counts["cached"] += 1
+            else:
+                stale.append(rel)
+        # Oublie les fichiers supprimés
+        live = set(files)
+        entry["files"] = {rel: v for rel, v in entry["files"].items() if rel in live}
+        if stale:
+            size = max(1, min(100, -(-len(stale) // (workers * 2))))
+            todo += [(linter, stale[i:i + size], root, []) for i in range(0, len(stale), size)]
+
+    if todo:
+        log(f"🔎 Analyse de {sum(len(j[1]) for j in todo)} fichier(s) en {len(todo)} lot(s) "
+            f"({', '.join(selected)}, {counts['cached']} en cache)...", "info", Fore.CYAN)
+        with ThreadPoolExecutor(max_workers=jobs or os.cpu_count() or 1) as pool:
+            for (linter, files, _, _), chunk_findings, error in pool.map(_run_lint_chunk, todo):
+                if error is not None:
+                    errors.append({"linter": linter, "files": files, "error": error})
+                    log(f"❌ {linter} a échoué sur un lot de {len(files)} fichier(s) : {error}", "error", Fore.RED)
+                    continue
+                counts["linted"] += len(files)
+                findings += chunk_findings
+                if LINTERS[linter].get("project"):
+                    cache[linter].update(set=pending_sets[linter], findings=chunk_findings)
+                    continue
+                by_file = {rel: [] for rel in files}
+                for finding in chunk_findings:
+                    by_file.setdefault(finding["file"], []).append(finding)
+                for rel in files:
+                    cache[linter]["files"][rel] = {"hash": file_hash(rel), "findings": by_file[rel]}
+
+    cache["stats"] = {rel: v for rel, v in stats.items() if os.path.exists(os.path.join(root, rel))}
+    os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+    tmp = f"{cache_file}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(cache, f)
+    os.replace(tmp, cache_file)
+
+    findings.sort(key=lambda f: (f["file"], f["line"], f["col"], f["linter"], f["code"]))
+    duration = time.time() - start
+    with open(report, "w", encoding="utf-8") as f:
+        json.dump({"root": root, "tools": tool_versions, "duration": round(duration, 3), **counts,
+                   "errors": errors, "findings": findings}, f, indent=1, ensure_ascii=False)
+    for finding in findings:
+        log(f"{finding['file']}:{finding['line']}:{finding['col']}: {finding['code']} {finding['message']} [{finding['linter']}]",
+            "info", Fore.RED if finding["severity"] == "error" else Fore.YELLOW)
+    n_errors = sum(1 for f in findings if f["severity"] == "error")
+    log(f"📋 {len(findings)} constat(s) dont {n_errors} erreur(s) — {counts['linted']} fichier(s) analysé(s), "
+        f"{counts['cached']} en cache, {duration:.2f}s — rapport : {report}", "info",
+        Fore.GREEN if not findings and not errors else Fore.YELLOW)
+    return 1 if findings or errors else 0
+
+SYNTAX_TOOLS = {
+    "-js": "node",
+    "-sh": "bash",
+    "-rb": "ruby",
+    "-php": "php",
+    "-java": "javac",
+    "-c": "gcc",
+    "-cpp": "g++",
+}
+
 def analyse_syntax(filename, ext_flag):
+    """
+    Vérifie la syntaxe d'un fichier ; retourne 0 si elle est correcte, 1 sinon.
+    """
+    tool = SYNTAX_TOOLS.get(ext_flag)
+    if tool and find_tool(tool) is None:
+        log(f"❌ {tool} n'est pas installé ou pas dans le PATH.", "error", Fore.RED)
+        return 1
     if ext_flag == "-py":
         try:
             with open(filename, "r", encoding="utf-8") as f:
                 ast.parse(f.read())
             log("✅ Syntaxe Python OK", "info", Fore.GREEN)
+            return 0
         except Exception as e:
             log(f"❌ Erreur de syntaxe Python : {e}", "error", Fore.RED)
+            return 1
     elif ext_flag == "-js":
         result = subprocess.run(["node", "--check", filename])
         log("✅ Syntaxe JavaScript OK" if result.returncode == 0 else "❌ Erreur JS", "info" if result.returncode == 0 else "error", Fore.GREEN if result.returncode == 0 else Fore.RED)
@@ -779,6 +4805,8 @@ def analyse_syntax(filename, ext_flag):
         log("✅ Syntaxe C++ OK" if result.returncode == 0 else "❌ Erreur C++", "info" if result.returncode == 0 else "error", Fore.GREEN if result.returncode == 0 else Fore.RED)
     else:
         log("❌ Analyse syntaxique non supportée pour ce type de fichier.", "error", Fore.RED)
+        return 1
+    return 0 if result.returncode == 0 else 1
 
 def install_dependencies(filename):
     ext = None
@@ -854,48 +4882,150 @@ def install_python_repo(repo_name, git_url):
         log("Pour activer le venv : source venv/bin/activate", "info", Fore.CYAN)
     os.chdir(cwd)
 
-def install_package(target):
-    log(f"🚀 Installation de : {target}", "info", Fore.CYAN)
-    system = platform.system().lower()
-    if system == "linux":
-        if shutil.which("apt"):
-            log("→ Installation via APT", "info", Fore.CYAN)
-            subprocess.run(["sudo", "apt", "install", "-y", target])
-        elif shutil.which("dnf"):
-            log("→ Installation via DNF", "info", Fore.CYAN)
-            subprocess.run(["sudo", "dnf", "install", "-y", target])
-        elif shutil.which("yum"):
-            log("→ Installation via YUM", "info", Fore.CYAN)
-            subprocess.run(["sudo", "yum", "install", "-y", target])
-        else:
-            log("❌ Aucun gestionnaire de paquets Linux trouvé (apt, dnf, yum).", "error", Fore.RED)
-    elif system == "darwin":
-        if shutil.which("brew"):
-            log("→ Installation via Homebrew", "info", Fore.CYAN)
-            subprocess.run(["brew", "install", target])
-        else:
-            log("❌ Homebrew (brew) n'est pas installé sur ce Mac.", "error", Fore.RED)
-    elif system == "windows":
-        if shutil.which("choco"):
-            log("→ Installation via Chocolatey", "info", Fore.CYAN)
-            subprocess.run(["choco", "install", target, "-y"])
-        else:
-            log("❌ Chocolatey (choco) n'est pas installé sur ce Windows.", "error", Fore.RED)
+# Gestionnaires de paquets système, par ordre de préférence
+PACKAGE_MANAGERS = {
+    "linux": ["apt-get", "dnf", "yum"],
+    "darwin": ["brew"],
+    "windows": ["choco"],
+}
+
+# Cache des paquets pour les gestionnaires lancés en root
+SYSTEM_PACKAGE_CACHE = "/var/cache/dkprun"
+
+def detect_package_manager():
+    """
+    Retourne le gestionnaire de paquets système disponible (apt-get, dnf, yum, brew, choco) ou None.
+    """
+    for name in PACKAGE_MANAGERS.get(platform.system().lower(), []):
+        if find_tool(name):
+            return name
+    return None
+
+def _as_root(cmd):
+    if os.name != "nt" and os.geteuid() != 0 and find_tool("sudo"):
+        return ["sudo"] + cmd
+    return cmd
+
+def installed_packages(manager, packages):
+    """
+    Interroge la base du gestionnaire en une seule requête et retourne les paquets déjà installés.
+
+    Args:
+        manager (str): Gestionnaire (voir detect_package_manager).
+        packages (list): Paquets à vérifier.
+
+    Returns:
+        set: Noms (en minuscules) des paquets de `packages` déjà installés.
+    """
+    if manager == "apt-get":
+        cmd = ["dpkg-query", "-W", "-f=${Package}\t${Status}\n"] + packages
+    elif manager in ("dnf", "yum"):
+        cmd = ["rpm", "-q", "--qf", "%{NAME}\n"] + packages
+    elif manager == "brew":
+        cmd = ["brew", "list", "-1"]
+    elif manager == "choco":
+        cmd = ["choco", "list", "--limit-output"]
     else:
-        log("→ Téléchargement direct via wget/curl", "info", Fore.CYAN)
-        url = f"https://example.com/{target}.sh"
-        if shutil.which("wget"):
-            subprocess.run(["wget", url])
-        elif shutil.which("curl"):
-            subprocess.run(["curl", "-O", url])
+        return set()
+    if find_tool(cmd[0]) is None:
+        return set()
+    # Code de retour non nul si un paquet est absent : seule la sortie compte
+    out = subprocess.run(cmd, capture_output=True, text=True).stdout
+    found = set()
+    for line in out.splitlines():
+        if manager == "apt-get":
+            name, _, status = line.partition("\t")
+            if status.endswith(" installed"):
+                found.add(name.lower())
+        elif manager == "choco":
+            found.add(line.split("|")[0].strip().lower())
         else:
-            log("❌ wget ou curl non trouvé.", "error", Fore.RED)
-    log("✅ Installation terminée.", "info", Fore.GREEN)
+            found.add(line.strip().lower())
+    return {p.lower() for p in packages} & found
+
+def _install_command(manager, packages, cache_dir, offline):
+    env = None
+    if manager == "apt-get":
+        cmd = _as_root(["apt-get", "install", "-y", "-o", f"Dir::Cache::archives={cache_dir}"]
+                       + (["--no-download"] if offline else []) + packages)
+    elif manager in ("dnf", "yum"):
+        cmd = _as_root([manager, "install", "-y", f"--setopt=cachedir={cache_dir}", "--setopt=keepcache=1"]
+                       + (["-C"] if offline else []) + packages)
+    elif manager == "brew":
+        env = dict(os.environ, HOMEBREW_CACHE=cache_dir, HOMEBREW_NO_AUTO_UPDATE="1")
+        cmd = ["brew", "install"] + packages
+    else:
+        cmd = ["choco", "install"] + packages + ["-y", f"--cache-location={cache_dir}"]
+    return cmd, env
+
+def install_package(targets, offline=False):
+    """
+    Installe un ou plusieurs paquets système en une seule transaction.
+
+    Les paquets déjà présents sont écartés après une unique requête à la base du gestionnaire.
+    Les archives téléchargées sont conservées dans un cache dkprun : /var/cache/dkprun/<gestionnaire>
+    pour apt-get/dnf/yum (lancés en root), le cache utilisateur (packages/<gestionnaire>) sinon.
+    Avec `offline`, l'installation n'utilise que ce cache (apt --no-download, dnf/yum -C).
+
+    Args:
+        targets (str | list): Paquet(s) à installer.
+        offline (bool): N'utilise aucun accès réseau.
+
+    Returns:
+        int: 0 si tout est installé, 1 sinon.
+    """
+    if isinstance(targets, str):
+        targets = [targets]
+    targets = list(dict.fromkeys(targets))
+    log(f"🚀 Installation de : {', '.join(targets)}", "info", Fore.CYAN)
+    manager = detect_package_manager()
+    if manager is None:
+        known = ", ".join(PACKAGE_MANAGERS.get(platform.system().lower(), [])) or "aucun connu pour ce système"
+        log(f"❌ Aucun gestionnaire de paquets trouvé ({known}).", "error", Fore.RED)
+        return 1
+    if offline and manager == "choco":
+        log("❌ -offline n'est pas supporté avec Chocolatey.", "error", Fore.RED)
+        return 1
+
+    already = installed_packages(manager, targets)
+    missing = [t for t in targets if t.lower() not in already]
+    if already:
+        log(f"⏭️ Déjà installé(s) : {', '.join(t for t in targets if t.lower() in already)}", "info", Fore.YELLOW)
+    if not missing:
+        log("✅ Rien à installer.", "info", Fore.GREEN)
+        return 0
+
+    if manager in ("apt-get", "dnf", "yum"):
+        # Écrit par root (et par le bac à sable _apt) : hors du cache utilisateur, qui resterait plein de fichiers root
+        cache_dir = os.path.join(SYSTEM_PACKAGE_CACHE, manager)
+        subprocess.run(_as_root(["mkdir", "-p", os.path.join(cache_dir, "partial") if manager == "apt-get" else cache_dir]))
+    else:
+        cache_dir = get_cache_dir("packages", manager)
+    cmd, env = _install_command(manager, missing, cache_dir, offline)
+    log(f"→ Installation via {manager} de {len(missing)} paquet(s) en une transaction{' (hors ligne)' if offline else ''}",
+        "info", Fore.CYAN)
+    log(f"   Cache des téléchargements : {cache_dir}", "debug")
+    flush_logs()
+    start = time.time()
+    returncode = subprocess.run(cmd, env=env).returncode
+    now_installed = installed_packages(manager, missing)
+    failed = [t for t in missing if t.lower() not in now_installed]
+    if returncode != 0 or failed:
+        log(f"❌ Échec de l'installation (code {returncode}) : {', '.join(failed or missing)}", "error", Fore.RED)
+        return 1
+    log(f"✅ Installation terminée en {time.time() - start:.1f}s.", "info", Fore.GREEN)
+    return 0
 
 def main(args=None):
     if args is None:
         args = sys.argv[1:]
 
+    # Les arguments après "--" sont transmis tels quels au script exécuté
+    script_args = []
+    if "--" in args:
+        idx = args.index("--")
+        args, script_args = args[:idx], args[idx+1:]
+
     logfile = None
     verbose = False
     use_color = False
@@ -911,6 +5041,11 @@ def main(args=None):
         use_color = True
         args.remove("-color")
     setup_logging(logfile, verbose)
+    if "-metrics" in args:
+        idx = args.index("-metrics")
+        if idx+1 < len(args):
+            start_metrics_server(int(args[idx+1]))
+            del args[idx:idx+2]
     global COLOR_SUPPORT
     COLOR_SUPPORT = use_color or COLOR_SUPPORT
 
@@ -919,8 +5054,7 @@ def main(args=None):
         return
 
     if "-clean" in args:
-        clean_project()
-        return
+        return clean_project()
 
     if "-docker" in args:
         idx = args.index("-docker")
@@ -929,17 +5063,85 @@ def main(args=None):
             return
 
     if "-test" in args:
-        run_tests()
-        return
+        jobs = None
+        shards = 1
+        junit_file = None
+        if "-jobs" in args:
+            j_idx = args.index("-jobs")
+            if j_idx+1 < len(args):
+                jobs = int(args[j_idx+1])
+        if "-shards" in args:
+            s_idx = args.index("-shards")
+            if s_idx+1 < len(args):
+                shards = int(args[s_idx+1])
+        if "-junit" in args:
+            x_idx = args.index("-junit")
+            if x_idx+1 < len(args):
+                junit_file = args[x_idx+1]
+        pytest_files = suite_names = None
+        if "-changed" in args:
+            c_idx = args.index("-changed")
+            base = "HEAD"
+            if c_idx+1 < len(args) and not args[c_idx+1].startswith("-"):
+                base = args[c_idx+1]
+            pytest_files, suite_names = select_impacted_tests(base, ignore=(junit_file,) if junit_file else ())
+        return run_tests(jobs, shards, junit_file, pytest_files=pytest_files, suite_names=suite_names)
 
-    if "-gitstatus" in args:
-        git_status()
-        return
-    if "-gitcommit" in args:
+    if "-lint" in args:
+        root = "."
+        linters = None
+        jobs = None
+        report = "dkprun-lint.json"
+        idx = args.index("-lint")
+        if idx+1 < len(args) and not args[idx+1].startswith("-"):
+            root = args[idx+1]
+        if "-linters" in args:
+            l_idx = args.index("-linters")
+            if l_idx+1 < len(args):
+                linters = [l for l in args[l_idx+1].split(",") if l]
+        if "-jobs" in args:
+            j_idx = args.index("-jobs")
+            if j_idx+1 < len(args):
+                jobs = int(args[j_idx+1])
+        if "-report" in args:
+            r_idx = args.index("-report")
+            if r_idx+1 < len(args):
+                report = args[r_idx+1]
+        return run_lint(root, linters, jobs, report)
+
+    if "-pipeline" in args:
+        idx = args.index("-pipeline")
+        target = None
+        if idx+1 < len(args) and not args[idx+1].startswith("-"):
+            target = args[idx+1]
+        pipeline_file = "dkprun.toml"
+        jobs = None
+        if "-file" in args:
+            f_idx = args.index("-file")
+            if f_idx+1 < len(args):
+                pipeline_file = args[f_idx+1]
+        if "-jobs" in args:
+            j_idx = args.index("-jobs")
+            if j_idx+1 < len(args):
+                jobs = int(args[j_idx+1])
+        return run_pipeline(target, pipeline_file, jobs, force="-force" in args)
+
+    if "-gitstatus" in args or "-gitcommit" in args:
+        root = "."
+        jobs = None
+        if "-root" in args:
+            r_idx = args.index("-root")
+            if r_idx+1 < len(args):
+                root = args[r_idx+1]
+        if "-jobs" in args:
+            j_idx = args.index("-jobs")
+            if j_idx+1 < len(args):
+                jobs = int(args[j_idx+1])
+        if "-gitstatus" in args:
+            return git_status(root, jobs)
         idx = args.index("-gitcommit")
         if idx+1 < len(args):
-            git_commit(args[idx+1])
-            return
+            return git_commit(args[idx+1], root, jobs)
 
     if "-listdependencies" in args:
         idx = args.index("-listdependencies")
@@ -948,8 +5150,7 @@ def main(args=None):
             return
 
     if "-gendoc" in args:
-        gendoc()
-        return
+        return gendoc(full="-full" in args)
     
     if "-unzip" in args:
         idx = args.index("-unzip")
@@ -978,7 +5179,7 @@ def main(args=None):
             idx = args.index("-dir")
             if idx+1 < len(args):
                 dest_dir = args[idx+1]
-        start_file_server(port, dest_dir)
+        start_file_server(port, dest_dir, allow_run="-allowrun" in args)
         return
     
     if "-osinfo" in args:
@@ -992,6 +5193,11 @@ def main(args=None):
             ip = None
             port = 5001
             save_as = None
+            compression = None
+            if "-comp" in args:
+                c_idx = args.index("-comp")
+                if c_idx+1 < len(args):
+                    compression = args[c_idx+1]
             if "-ip" in args:
                 ip_idx = args.index("-ip")
                 if ip_idx+1 < len(args):
@@ -1005,7 +5211,7 @@ def main(args=None):
                 if saveas_idx+1 < len(args):
                     save_as = args[saveas_idx+1]
             if ip:
-                take_file_from_server(file_name, ip, port, save_as)
+                take_file_from_server(file_name, ip, port, save_as, compression)
             else:
                 log("❌ Usage : dkprun -takeserver <fichier> -ip <adresse_ip> [-port <port>] [-saveas <nouveau_nom>]", "error", Fore.RED)
         else:
@@ -1018,6 +5224,11 @@ def main(args=None):
             file_path = args[idx+1]
             ip = None
             port = 5001
+            compression = None
+            if "-comp" in args:
+                c_idx = args.index("-comp")
+                if c_idx+1 < len(args):
+                    compression = args[c_idx+1]
             if "-ip" in args:
                 ip_idx = args.index("-ip")
                 if ip_idx+1 < len(args):
@@ -1027,21 +5238,56 @@ def main(args=None):
                 if port_idx+1 < len(args):
                     port = int(args[port_idx+1])
             if ip:
-                send_file_to_server(file_path, ip, port)
-            else:
-                log("❌ Usage : dkprun -sendserver <fichier> -ip <adresse_ip> [-port <port>]", "error", Fore.RED)
+                return send_file_to_server(file_path, ip, port, compression)
+            log("❌ Usage : dkprun -sendserver <fichier> -ip <adresse_ip> [-port <port>]", "error", Fore.RED)
         else:
             log("❌ Usage : dkprun -sendserver <fichier> -ip <adresse_ip> [-port <port>]", "error", Fore.RED)
-        return
+        return 1
+
+    if "-runbatch" in args:
+        idx = args.index("-runbatch")
+        files = []
+        for arg in args[idx+1:]:
+            if arg.startswith("-"):
+                break
+            files.append(arg)
+        nodes = []
+        if "-nodes" in args:
+            n_idx = args.index("-nodes")
+            if n_idx+1 < len(args):
+                nodes = [n for n in args[n_idx+1].split(",") if n]
+        if not files or not nodes:
+            log("❌ Usage : dkprun -runbatch <f1> [f2 ...] -nodes ip1[:port],ip2[:port] [-- args]", "error", Fore.RED)
+            return 1
+        return run_batch(files, nodes, script_args)
 
     if "-runurl" in args:
         idx = args.index("-runurl")
         if idx+1 < len(args):
-            run_url(args[idx+1])
-            return
+            sha256 = None
+            if "-sha256" in args:
+                h_idx = args.index("-sha256")
+                if h_idx+1 < len(args):
+                    sha256 = args[h_idx+1]
+            return run_url(args[idx+1], sha256, "-refresh" in args)
 
     if "-wifiips" in args:
-        get_wifi_ips()
+        subnet = None
+        port = 5001
+        ttl = 300
+        if "-subnet" in args:
+            s_idx = args.index("-subnet")
+            if s_idx+1 < len(args):
+                subnet = args[s_idx+1]
+        if "-port" in args:
+            p_idx = args.index("-port")
+            if p_idx+1 < len(args):
+                port = int(args[p_idx+1])
+        if "-ttl" in args:
+            t_idx = args.index("-ttl")
+            if t_idx+1 < len(args):
+                ttl = int(args[t_idx+1])
+        get_wifi_ips("-scan" in args, subnet, port, ttl, "-refresh" in args)
         return
 
     if "-interactive" in args:
@@ -1052,6 +5298,30 @@ def main(args=None):
         get_ip()
         return
 
+    if "-benchmatrix" in args:
+        idx = args.index("-benchmatrix")
+        if idx+1 < len(args):
+            import shlex
+            stdin_file = None
+            run_args = []
+            runs = 3
+            if "-stdin" in args:
+                s_idx = args.index("-stdin")
+                if s_idx+1 < len(args):
+                    stdin_file = args[s_idx+1]
+            if "-args" in args:
+                a_idx = args.index("-args")
+                if a_idx+1 < len(args):
+                    run_args = shlex.split(args[a_idx+1])
+            if "-runs" in args:
+                r_idx = args.index("-runs")
+                if r_idx+1 < len(args):
+                    runs = int(args[r_idx+1])
+            benchmark_matrix(args[idx+1], stdin_file, run_args, runs)
+        else:
+            log("❌ Usage : dkprun -benchmatrix <dossier> [-stdin <fichier>] [-args \"<args>\"] [-runs N]", "error", Fore.RED)
+        return
+
     if "-profile" in args:
         args.remove("-profile")
         profile_execution(main, args)
@@ -1060,28 +5330,39 @@ def main(args=None):
     if "-zip" in args:
         idx = args.index("-zip")
         if idx+1 < len(args):
-            zip_project(args[idx+1])
-            return
+            return zip_project(args[idx+1])
 
     if "-anasyntax" in args:
         ext_flag = next((arg for arg in args if arg in EXT_TO_COMMAND), None)
         if not ext_flag:
             log("❌ Extension non reconnue pour analyse syntaxique.", "error", Fore.RED)
-            return
+            return 1
         try:
             file_index = args.index(ext_flag) + 1
             filename = args[file_index]
         except Exception:
             log("❌ Fichier non trouvé après extension !", "error", Fore.RED)
-            return
+            return 1
         if not os.path.exists(filename):
             log(f"❌ Fichier introuvable : {filename}", "error", Fore.RED)
-            return
-        analyse_syntax(filename, ext_flag)
+            return 1
+        return analyse_syntax(filename, ext_flag)
+
+    if "-preforkserver" in args or "-preforkstop" in args:
+        modules = os.environ.get("DKPRUN_PRELOAD", "")
+        if "-preload" in args:
+            p_idx = args.index("-preload")
+            if p_idx+1 < len(args):
+                modules = args[p_idx+1]
+        modules = [m for m in modules.split(",") if m]
+        if "-preforkstop" in args:
+            stop_prefork_server(modules)
+        else:
+            start_prefork_server(modules)
         return
 
     if "-checkinterpreters" in args:
-        check_and_install_interpreters()
+        check_and_install_interpreters(refresh="-refresh" in args)
         return
 
     if "-automakelib" in args:
@@ -1141,7 +5422,7 @@ def main(args=None):
     if "-install" in args:
         preconfigure = False
         repo_name = None
-        target = None
+        targets = []
         i = args.index("-install")
         j = i+1
         while j < len(args):
@@ -1153,11 +5434,10 @@ def main(args=None):
                     j += 2
                     continue
             elif not arg.startswith("-"):
-                target = arg
+                targets.append(arg)
             j += 1
-        if not preconfigure and target:
-            install_package(target)
-            return
+        if not preconfigure and targets:
+            return install_package(targets, offline="-offline" in args)
         if preconfigure and repo_name:
             key = repo_name.lower()
             if key in REPO_PRESETS:
@@ -1191,24 +5471,103 @@ def main(args=None):
         log(f"❌ Fichier introuvable : {filename}", "error", Fore.RED)
         return
 
+    run_opts = {}
+    if "-capture" in args:
+        c_idx = args.index("-capture")
+        run_opts["capture_dir"] = get_cache_dir("runs")
+        if c_idx+1 < len(args) and not args[c_idx+1].startswith("-"):
+            run_opts["capture_dir"] = args[c_idx+1]
+    if "-ringkb" in args:
+        k_idx = args.index("-ringkb")
+        if k_idx+1 < len(args):
+            run_opts["ring_kb"] = int(args[k_idx+1])
+    limits = {}
+    for flag in ("-timeout", "-maxmem", "-maxcpu"):
+        if flag in args:
+            l_idx = args.index(flag)
+            if l_idx+1 < len(args):
+                limits[flag[1:]] = float(args[l_idx+1])
+    if limits:
+        run_opts["limits"] = limits
+    run_opts["language"] = ext_flag[1:]
+
+    if "-remoterun" in args:
+        idx = args.index("-remoterun")
+        if idx+1 < len(args):
+            ip, port = _parse_node(args[idx+1])
+            return remote_run(filename, ext_flag, ip, port, script_args)
+        log("❌ Usage : dkprun -r -<ext> <fichier> -remoterun <ip[:port]> [-- args]", "error", Fore.RED)
+        return 1
+
+    if ext_flag == "-py" and "-matrix" in args:
+        idx = args.index("-matrix")
+        if idx+1 < len(args):
+            requirements = None
+            if "-requirements" in args:
+                r_idx = args.index("-requirements")
+                if r_idx+1 < len(args):
+                    requirements = args[r_idx+1]
+            specs = [spec for spec in args[idx+1].split(",") if spec]
+            return run_python_matrix(filename, specs, script_args, requirements, limits)
+
+    if ext_flag == "-py" and "-prefork" in args:
+        if limits:
+            # Le script tourne dans un enfant du serveur résident : ses limites ne s'appliqueraient pas
+            log("❌ -timeout/-maxmem/-maxcpu ne sont pas compatibles avec -prefork.", "error", Fore.RED)
+            return 1
+        modules = os.environ.get("DKPRUN_PRELOAD", "")
+        if "-preload" in args:
+            p_idx = args.index("-preload")
+            if p_idx+1 < len(args):
+                modules = args[p_idx+1]
+        return run_prefork(filename, script_args, [m for m in modules.split(",") if m])
+
+    if ext_flag == "-py" and "-pyprofile" in args:
+        idx = args.index("-pyprofile")
+        mode = "sample"
+        top = 20
+        interval_ms = 5.0
+        if idx+1 < len(args) and args[idx+1] in ("sample", "cprofile"):
+            mode = args[idx+1]
+        if "-top" in args:
+            t_idx = args.index("-top")
+            if t_idx+1 < len(args):
+                top = int(args[t_idx+1])
+        if "-interval" in args:
+            i_idx = args.index("-interval")
+            if i_idx+1 < len(args):
+                interval_ms = float(args[i_idx+1])
+        return profile_python_script(filename, mode, top, interval_ms, script_args, run_opts)
+
     if ext_flag == "-java":
         log(f"🚀 Compilation et exécution d'un fichier Java : {filename}", "info", Fore.CYAN)
-        if shutil.which("javac") is None or shutil.which("java") is None:
+        if "-javasource" in args and find_tool("java"):
+            return run_java(filename, script_args, source_launch=True, run_opts=run_opts)
+        if find_tool("javac") is None or find_tool("java") is None:
             log("❌ javac ou java n'est pas installé ou pas dans le PATH. Installe le JDK Java.", "error", Fore.RED)
             return
+        if "-cds" in args:
+            return run_java(filename, script_args, run_opts=run_opts)
         compile_result = subprocess.run(["javac", filename])
         if compile_result.returncode != 0:
             log("❌ Erreur lors de la compilation Java.", "error", Fore.RED)
             return
         classname = os.path.splitext(os.path.basename(filename))[0]
-        subprocess.run(["java", classname])
-        return
+        return run_command(["java", classname] + script_args, **run_opts)["returncode"]
+
+    if ext_flag == "-html" and "-serve" in args:
+        port = 8000
+        if "-port" in args:
+            p_idx = args.index("-port")
+            if p_idx+1 < len(args):
+                port = int(args[p_idx+1])
+        return serve_html(filename, port, open_browser="-nobrowser" not in args)
 
     if ext_flag == "-html":
         log(f"🌐 Ouverture du fichier HTML dans le navigateur : {filename}", "info", Fore.CYAN)
         abs_path = os.path.abspath(filename)
         system = platform.system().lower()
-        if system == "linux" and shutil.which("xdg-open"):
+        if system == "linux" and find_tool("xdg-open"):
             subprocess.run(["xdg-open", abs_path])
         elif system == "windows":
             subprocess.run(["start", abs_path], shell=True)
@@ -1221,61 +5580,94 @@ def main(args=None):
 
     if ext_flag == "-c#":
         log(f"🚀 Compilation et exécution d'un script C# : {filename}", "info", Fore.CYAN)
-        if shutil.which("csc"):
+        if find_tool("csc"):
             exe_file = os.path.splitext(filename)[0] + ".exe"
             subprocess.run(["csc", filename])
-            subprocess.run([exe_file])
-        elif shutil.which("dotnet"):
-            subprocess.run(["dotnet", "run", filename])
+            return run_command([exe_file] + script_args, **run_opts)["returncode"]
+        elif find_tool("dotnet"):
+            return run_command(["dotnet", "run", filename] + script_args, **run_opts)["returncode"]
         else:
             log("❌ Aucun compilateur C# trouvé (csc ou dotnet). Installe .NET SDK.", "error", Fore.RED)
         return
 
+    if ext_flag in ("-c", "-cpp") and ("-project" in args or os.path.isdir(filename)):
+        jobs = output = None
+        if "-j" in args:
+            j_idx = args.index("-j")
+            if j_idx+1 < len(args):
+                jobs = int(args[j_idx+1])
+        if "-o" in args:
+            o_idx = args.index("-o")
+            if o_idx+1 < len(args):
+                output = args[o_idx+1]
+        exe_file = build_c_project(filename, ext_flag, jobs, output)
+        if exe_file is None:
+            return 1
+        return run_command([exe_file] + script_args, **run_opts)["returncode"]
+
     if ext_flag == "-c":
         log(f"🚀 Compilation et exécution d'un script C : {filename}", "info", Fore.CYAN)
-        if shutil.which("gcc") is None:
+        if find_tool("gcc") is None:
             log("❌ gcc n'est pas installé ou pas dans le PATH. Installe MinGW-w64 sur Windows.", "error", Fore.RED)
             return
         exe_file = os.path.splitext(filename)[0] + ".exe" if os.name == "nt" else os.path.splitext(filename)[0]
         subprocess.run(["gcc", filename, "-o", exe_file])
-        subprocess.run([exe_file])
-        return
+        return run_command([os.path.abspath(exe_file)] + script_args, **run_opts)["returncode"]
 
     if ext_flag == "-cpp":
         log(f"🚀 Compilation et exécution d'un script C++ : {filename}", "info", Fore.CYAN)
-        if shutil.which("g++") is None:
+        if find_tool("g++") is None:
             log("❌ g++ (C++) n'est pas installé ou pas dans le PATH. Installe MinGW-w64 sur Windows ou g++ sur Linux/Mac.", "error", Fore.RED)
             return
         exe_file = os.path.splitext(filename)[0] + ".exe" if os.name == "nt" else os.path.splitext(filename)[0]
         subprocess.run(["g++", filename, "-o", exe_file])
-        subprocess.run([exe_file])
-        return
+        return run_command([os.path.abspath(exe_file)] + script_args, **run_opts)["returncode"]
 
     if ext_flag == "-bat":
         log(f"🚀 Exécution d'un script Batch (cmd) : {filename}", "info", Fore.CYAN)
-        if shutil.which("cmd") is None:
+        if find_tool("cmd") is None:
             log("❌ cmd n'est pas disponible sur ce système.", "error", Fore.RED)
             return
-        subprocess.run(["cmd", "/c", filename])
-        return
+        return run_command(["cmd", "/c", filename] + script_args, **run_opts)["returncode"]
 
     if ext_flag == "-ps1":
         log(f"🚀 Exécution d'un script PowerShell : {filename}", "info", Fore.CYAN)
-        if shutil.which("powershell") is None:
+        if find_tool("powershell") is None:
             log("❌ powershell n'est pas disponible sur ce système.", "error", Fore.RED)
             return
-        subprocess.run(["powershell", "-File", filename])
-        return
+        return run_command(["powershell", "-File", filename] + script_args, **run_opts)["returncode"]
 
     if ext_flag in ["-go", "-rs", "-swift", "-kt"]:
         log(f"🚀 Compilation et exécution d'un script {ext_flag[1:].upper()} : {filename}", "info", Fore.CYAN)
         command = EXT_TO_COMMAND[ext_flag]
-        subprocess.run([command, filename])
-        return
+        if find_tool(command) is None:
+            log(f"❌ {command} n'est pas installé ou pas dans le PATH.", "error", Fore.RED)
+            return
+        # Les arguments du script vont au programme, jamais au compilateur
+        if ext_flag == "-go":
+            return run_command(["go", "run", filename] + script_args, **run_opts)["returncode"]
+        if ext_flag == "-swift":
+            return run_command(["swift", filename] + script_args, **run_opts)["returncode"]
+        base = os.path.abspath(os.path.splitext(filename)[0])
+        if ext_flag == "-rs":
+            exe_file = base + ".exe" if os.name == "nt" else base
+            build_cmd, run_cmd = ["rustc", filename, "-o", exe_file], [exe_file]
+        else:
+            if find_tool("java") is None:
+                log("❌ java n'est pas installé ou pas dans le PATH.", "error", Fore.RED)
+                return
+            build_cmd, run_cmd = ["kotlinc", filename, "-include-runtime", "-d", base + ".jar"], ["java", "-jar", base + ".jar"]
+        if subprocess.run(build_cmd).returncode != 0:
+            log(f"❌ Compilation échouée : {filename}", "error", Fore.RED)
+            return 1
+        return run_command(run_cmd + script_args, **run_opts)["returncode"]
 
     command = EXT_TO_COMMAND[ext_flag]
+    if find_tool(command) is None:
+        log(f"❌ {command} n'est pas installé ou pas dans le PATH.", "error", Fore.RED)
+        return
     log(f"🚀 Exécution de : {command} {filename}\n", "info", Fore.CYAN)
-    subprocess.run([command, filename])
+    return run_command([command, filename] + script_args, **run_opts)["returncode"]
 
 if __name__ == "__main__":
-  main()
\ No newline at end of file
+  sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,33 @@
+import re
+import subprocess
+import sys
+import time
+
+import dkprun
+
+
+def test_capture_streams_newline_free_output(tmp_path):
+    # 8 Mo sans aucun saut de ligne : doit rester linéaire et borné en mémoire
+    size = 8 * 1024 * 1024
+    proc = subprocess.Popen(
+        [sys.executable, "-c", f"import sys; sys.stdout.buffer.write(b'x' * {size})"],
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+    )
+    log_path = tmp_path / "run.log"
+    start = time.time()
+    tail = dkprun._capture_streams(proc, str(log_path), 4096)
+    proc.wait()
+
+    assert time.time() - start < 10
+    assert tail == b"x" * 4096
+    prefix = re.compile(rb"^\d\d:\d\d:\d\d\.\d{3} \[out\] ")
+    lines = log_path.read_bytes().splitlines()
+    assert len(lines) > 1
+    payload = b""
+    for line in lines:
+        match = prefix.match(line)
+        assert match
+        segment = line[match.end():]
+        assert len(segment) <= dkprun.PARTIAL_LINE_MAX + (1 << 16)
+        payload += segment
+    assert payload == b"x" * size
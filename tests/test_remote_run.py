@@ -0,0 +1,32 @@
+import io
+import json
+import socket
+import threading
+
+import dkprun
+
+
+def _serve_once(listener, dest_dir):
+    conn, _ = listener.accept()
+    dkprun.handle_file_server_request(conn, dest_dir, allow_run=True)
+
+
+def test_remote_run_args_round_trip(tmp_path):
+    script = tmp_path / "echo_args.py"
+    script.write_text("import json, sys\nprint(json.dumps(sys.argv[1:]))\n")
+    args = ["a\tb", "espace ici", "", "--flag=1", "ligne\nsuivante", "é"]
+
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as listener:
+        listener.bind(("127.0.0.1", 0))
+        listener.listen(1)
+        port = listener.getsockname()[1]
+        server = threading.Thread(target=_serve_once, args=(listener, str(tmp_path)), daemon=True)
+        server.start()
+
+        output = io.BytesIO()
+        returncode = dkprun.remote_run(str(script), "-py", "127.0.0.1", port, args, output=output)
+        server.join(timeout=30)
+
+    assert returncode == 0
+    lines = [line for line in output.getvalue().decode().splitlines() if line.startswith("[")]
+    assert json.loads(lines[-1]) == args